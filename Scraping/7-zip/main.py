@@ -1,9 +1,17 @@
-import requests
-from bs4 import BeautifulSoup
-import json
+import logging
 import re
 import urllib3
-import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.http import get_client
+from common.parsing import parse_html
+from common.probe import get_pointers, newest
+from common.url_probe import UrlTemplate, known_version, probe_successors
+
+logger = logging.getLogger(__name__)
 
 # Suppress SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -18,6 +26,13 @@ HEADERS = {
     )
 }
 
+# Installers are named after the version (24.09 -> 7z2409-x64.exe), so the next release can be found with HEADs
+INSTALLER = UrlTemplate("https://www.7-zip.org/a/7z{major:02d}{minor:02d}-x64.exe", parts=2)
+
+def probe():
+    """Current 7-Zip version, probed from the last known one; inconclusive probes fall back to the full scrape."""
+    return probe_successors(INSTALLER, known_version("7-zip"), headers=HEADERS, verify=False).version
+
 # Detect OS based on filename
 def detect_os(filename):
     filename = filename.lower()
@@ -43,53 +58,50 @@ def extract_version(filename):
 
 # Fetch and parse the HTML
 def fetch_html(url):
-    response = requests.get(url, headers=HEADERS, timeout=10, verify=False)
+    response = get_client().get(url, headers=HEADERS, timeout=10, verify=False)
     response.raise_for_status()
-    return BeautifulSoup(response.text, 'html.parser')
+    return parse_html(response, only='a')
 
-# Main scraping function
-def scrape_7zip():
-    print("🔍 Fetching HTML from 7-Zip...")
-    soup = fetch_html(BASE_URL)
-    links = soup.find_all('a')
+class SevenZipScraper(BaseScraper):
+    """7-Zip installers and sources linked from the download page."""
+    product = "7-zip"
 
-    all_links = []
+    def scrape(self, ctx):
+        logger.info("Fetching HTML from 7-Zip...")
+        soup = fetch_html(BASE_URL)
+        links = soup.find_all('a')
 
-    for link in links:
-        href = link.get('href')
-        text = link.text.strip()
+        all_links = []
 
-        if href and href.startswith('a/'):
-            filename = href.split('/')[-1]
-            download_url = f"https://www.7-zip.org/{href}"
-            os_type = detect_os(filename)
-            version = extract_version(filename)
+        for link in links:
+            href = link.get('href')
+            text = link.text.strip()
 
-            all_links.append({
-                "product": "7-zip",
-                "file_name": filename,
-                "version": version,
-                "text": text,
-                "url": download_url,
-                "platform": os_type
-            })
+            if href and href.startswith('a/'):
+                filename = href.split('/')[-1]
+                download_url = f"https://www.7-zip.org/{href}"
+                os_type = detect_os(filename)
+                version = extract_version(filename)
 
-    if not all_links:
-        print("❌ No download links found. Site may have changed.")
-        return
+                all_links.append({
+                    "product": "7-zip",
+                    "file_name": filename,
+                    "version": version,
+                    "text": text,
+                    "url": download_url,
+                    "platform": os_type
+                })
 
-    # Save to JSON
-    output_path = "/home/yash-gaudani/R%D/Vlc/7-zip/7zip_all_links.json"
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)  # Ensure folder exists
+        if not all_links:
+            logger.error("No download links found. Site may have changed.")
+            return
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(all_links, f, indent=2, ensure_ascii=False)
+        # The newest version on the page is where the next probe starts from
+        latest = newest(link["version"] for link in all_links if link["version"] != "unknown")
+        if latest:
+            get_pointers().set("7-zip", latest)
 
-    print(f"✅ Saved {len(all_links)} links to:\n{output_path}")
+        yield from all_links
 
-# Run the script
 if __name__ == "__main__":
-    try:
-        scrape_7zip()
-    except Exception as e:
-        print(f"❌ Error: {e}")
+    SevenZipScraper.main()
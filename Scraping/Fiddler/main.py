@@ -1,57 +1,60 @@
-import requests
 import json
+import logging
 from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.github import get_github
+from common.probe import get_pointers
+from common.url_probe import Inconclusive, UrlTemplate, known_version, probe_successors
+
+logger = logging.getLogger(__name__)
+
+# Installers are published at predictable URLs, so new releases can be found with a few HEADs
+WINDOWS_INSTALLER = UrlTemplate("https://downloads.getfiddler.com/win/Fiddler%20Everywhere%20{version}.exe")
+FALLBACK_VERSION = "5.0.0"  # only used if the version can't be resolved and none is cached
 
 def get_latest_fiddler_version():
     """Fetch latest Fiddler Everywhere version from GitHub release-notes.json."""
-    url = "https://api.github.com/repos/telerik/fiddler-everywhere-docs/contents/release-notes/release-notes.json"
-    headers = {"Accept": "application/vnd.github.v3.raw"}  # Required to get raw content
-
-    response = requests.get(url, headers=headers, timeout=10)
-    if response.status_code == 200:
-        data = response.json()
-        versions = [entry["version"] for entry in data if "version" in entry]
-        if versions:
-            return versions[0]  # Latest version is the first item
+    raw = get_github().contents("telerik/fiddler-everywhere-docs", "release-notes/release-notes.json")
+    data = json.loads(raw)
+    versions = [entry["version"] for entry in data if "version" in entry]
+    if versions:
+        return versions[0]  # Latest version is the first item
     raise Exception("❌ No versions found. Check URL or format.")
 
-def scrape_fiddler():
-    """Scrape Fiddler Everywhere download links."""
-    print("🔍 Fetching Fiddler Everywhere download information...")
-
+def probe():
+    """Current Fiddler Everywhere version: the newest installer after the known one, else the release notes."""
     try:
-        latest_version = get_latest_fiddler_version()
-    except Exception as e:
-        print(f"⚠️ Failed to fetch version. Using fallback. Error: {e}")
-        latest_version = "5.0.0"
-
-    print(f"📦 Using Fiddler Everywhere version: {latest_version}")
-    
-    formatted_data = {
-        "product": "fiddler",
-        "version": latest_version,
-        "text": "Fiddler Everywhere",
-        "platforms": {
-            "windows": f"https://downloads.getfiddler.com/win/Fiddler%20Everywhere%20{latest_version}.exe",
-            "mac_intel": f"https://downloads.getfiddler.com/mac/Fiddler%20Everywhere%20{latest_version}.dmg",
-            "mac_arm64": f"https://downloads.getfiddler.com/mac-arm64/Fiddler%20Everywhere%20{latest_version}.dmg",
-            "linux": f"https://downloads.getfiddler.com/linux/fiddler-everywhere-{latest_version}.AppImage"
-        }
-    }
+        return probe_successors(WINDOWS_INSTALLER, known_version("Fiddler")).version
+    except Inconclusive:
+        return get_latest_fiddler_version()
 
-    output_path = Path("/home/yash-gaudani/R%D/patch/Scraping/Fiddler/fiddler_info.json")
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(formatted_data, f, indent=2, ensure_ascii=False)
+class FiddlerScraper(BaseScraper):
+    """Fiddler Everywhere installers, one record per platform."""
+    product = "fiddler"
 
-    print(f"✅ Fiddler Everywhere data saved to: {output_path}")
-    return formatted_data
+    def scrape(self, ctx):
+        logger.info("Fetching Fiddler Everywhere download information...")
 
-def main():
-    try:
-        scrape_fiddler()
-    except Exception as e:
-        print(f"❌ Error: {e}")
+        latest_version = get_pointers().resolve("Fiddler", probe, FALLBACK_VERSION)
+
+        logger.info(f"Using Fiddler Everywhere version: {latest_version}")
+
+        platforms = {
+            "Windows": f"https://downloads.getfiddler.com/win/Fiddler%20Everywhere%20{latest_version}.exe",
+            "macOS Intel": f"https://downloads.getfiddler.com/mac/Fiddler%20Everywhere%20{latest_version}.dmg",
+            "macOS ARM64": f"https://downloads.getfiddler.com/mac-arm64/Fiddler%20Everywhere%20{latest_version}.dmg",
+            "Linux": f"https://downloads.getfiddler.com/linux/fiddler-everywhere-{latest_version}.AppImage"
+        }
+        for platform, url in platforms.items():
+            yield {
+                "version": latest_version,
+                "text": "Fiddler Everywhere",
+                "url": url,
+                "platform": platform
+            }
 
 if __name__ == "__main__":
-    main()
+    FiddlerScraper.main()
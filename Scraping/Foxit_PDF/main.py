@@ -1,29 +1,53 @@
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+import logging
+import sys
+from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.autoindex import listing
+from common.base import BaseScraper
+from common.http import get_client
+from common.probe import get_pointers, redirect_version
+from common.url_probe import UrlTemplate, known_version, probe_successors
 
+logger = logging.getLogger(__name__)
 
-# Define the URL to scrape
-url = 'https://cdn01.foxitsoftware.com/product/phantomPDF/desktop/win/2025.1.0/tools/'
+BASE_URL = 'https://cdn01.foxitsoftware.com/product/phantomPDF/desktop/win/'
+LATEST_URL = ('https://www.foxit.com/downloads/latest.html'
+              '?product=Foxit-PDF-Editor&platform=Windows&version=&package_type=exe&language=English')
+FALLBACK_VERSION = '2025.1.0'  # only used if the version can't be resolved and none is cached
+TOOLS_DIR = UrlTemplate(BASE_URL + '{version}/tools/')
 
-# Send a GET request to fetch the page content
-response = requests.get(url)
-response.raise_for_status()  # Ensure we got a successful response
 
-# Parse the page content with BeautifulSoup
-soup = BeautifulSoup(response.content, 'html.parser')
+def probe():
+    """Current Foxit PDF Editor version, read from where the "latest" download redirect lands.
 
-# Initialize a list to store the links and their text
-links = []
+    If the redirect doesn't name a version, the tools directories after the
+    known version are probed instead.
+    """
+    try:
+        return redirect_version(LATEST_URL, r'/desktop/win/(\d+(?:\.\d+)+)/')
+    except Exception:
+        return probe_successors(TOOLS_DIR, known_version('Foxit_PDF')).version
 
-# Iterate over all anchor tags to extract href and text
-for link in soup.find_all('a', href=True):
-    href = link['href']
-    link_text = link.get_text(strip=True)
-    full_url = urljoin(url, href)  # Handle relative URLs
-    links.append((link_text, full_url))
 
-# Output the collected links
-for text, link in links:
-    print(f"Text: {text}\nLink: {link}\n")
+class FoxitPdfScraper(BaseScraper):
+    """Foxit PDF Editor tools for the current version, from the CDN's directory listing."""
+    product = "Foxit PDF Editor"
+
+    def scrape(self, ctx):
+        # Define the URL to scrape
+        version = get_pointers().resolve('Foxit_PDF', probe, FALLBACK_VERSION)
+        url = f'{BASE_URL}{version}/tools/'
+
+        # Send a GET request to fetch the page content
+        response = get_client().get(url)
+        response.raise_for_status()  # Ensure we got a successful response
+
+        # One record per entry of the directory listing
+        for entry in listing(response, url):
+            logger.debug(f"Found {entry.name}: {entry.url(url)}")
+            yield {"product": "Foxit PDF Editor", "version": version, "text": entry.name, "url": entry.url(url)}
+
+
+if __name__ == "__main__":
+    FoxitPdfScraper.main()
@@ -1,66 +1,45 @@
-import requests
-from bs4 import BeautifulSoup
+import logging
 import re
-import json
 import urllib.parse
 from pathlib import Path
+import sys
 
-def scrape_mobaxterm():
-    """Scrape MobaXterm download information."""
-    print("🔍 Fetching MobaXterm download information...")
-    
-    # Step 1: Access Base Page
-    BASE_URL = "https://mobaxterm.mobatek.net/download-home-edition.html"
-    
-    try:
-        # Step 2: Fetch Page Content
-        response = requests.get(BASE_URL, timeout=10)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.http import get_client
+from common.parsing import parse_html
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://mobaxterm.mobatek.net/download-home-edition.html"
+
+class MobaXtermScraper(BaseScraper):
+    """Portable MobaXterm builds from the home edition download page."""
+    product = "MobaXterm"
+    platform = "Windows"
+
+    def scrape(self, ctx):
+        logger.info("Fetching MobaXterm download information...")
+
+        # Fetch Page Content
+        response = get_client().get(BASE_URL, timeout=10)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # Step 3: Scan for Links Ending with .zip, .exe, .msi
-        links = soup.find_all("a", href=True)
-        results = []
-        
-        for link in links:
+        soup = parse_html(response, only="a")
+
+        # Scan for Links Ending with .zip, .exe, .msi
+        for link in soup.find_all("a", href=True):
             href = link["href"]
             if href.endswith((".zip", ".exe", ".msi")) and "MobaXterm_Portable_v" in href:
-                # Step 4: Parse version from filename
+                # Parse version from filename
                 file_name = href.split("/")[-1]
                 match = re.search(r"MobaXterm_Portable_v(\d+(?:\.\d+)*)\.zip", file_name)
                 if match:
-                    version = match.group(1)
-                    download_url = urllib.parse.urljoin(BASE_URL, href)
-        
-                    results.append({
-                        "product": "MobaXterm",
-                        "file_name": file_name,
-                        "version": version,
+                    yield {
+                        "version": match.group(1),
                         "text": file_name,
-                        "url": download_url,
-                        "platform": "Windows"
-                    })
-        
-        # Save to the expected location for the orchestrator
-        output_path = Path(__file__).parent.parent / "mobaxterm_info.json"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        
-        print(f"✅ {len(results)} MobaXterm entries saved to: {output_path}")
-        return results
-        
-    except Exception as e:
-        print(f"❌ Error fetching MobaXterm data: {e}")
-        return []
-
-def main():
-    """Main function for standalone execution."""
-    try:
-        scrape_mobaxterm()
-    except Exception as e:
-        print(f"❌ Error: {e}")
+                        "url": urllib.parse.urljoin(BASE_URL, href),
+                        "file_name": file_name
+                    }
 
 if __name__ == "__main__":
-    main()
+    MobaXtermScraper.main()
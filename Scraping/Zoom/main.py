@@ -1,7 +1,16 @@
-import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 import json
+import logging
 from urllib.parse import urljoin, urlparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.http import get_client
+from common.parsing import parse_html
+
+logger = logging.getLogger(__name__)
 
 # Source article
 url = "https://support.zoom.com/hc/en/article?id=zm_kb&sysparm_article=KB0060407"
@@ -42,16 +51,19 @@ linux_texts = [
     "Zoom Workplace desktop app (64-bit)"
 ]
 
-# Request and parse the page
-response = requests.get(url)
-response.raise_for_status()
-soup = BeautifulSoup(response.text, "html.parser")
+# Define base URL formats for the download API
+cdn_base = "https://cdn.zoom.us/prod/{version}/{filename}"
+latest_base = "https://zoom.us/client/latest/{filename}"
+
+# Platforms to query, with the name each one is recorded under
+platforms = {"win": "Windows", "mac": "macOS", "linux": "Linux"}
 
-# Extract embedded JSON content
-script_tag = soup.find("script", {"type": "application/ld+json"})
-json_data = json.loads(script_tag.string)
-article_html = json_data.get("articleBody", "")
-article_soup = BeautifulSoup(article_html, "html.parser")
+# Keys to extract from downloadVO
+product_keys = [
+    "zoom", "zoomX64", "zoomArm64", "zoomRC",
+    "outlookPlugin", "lyncPlugin", "notesPlugin",
+    "zoomRooms", "zoomRoomsX64"
+]
 
 # Helper to get version from URL
 def extract_version(link):
@@ -68,109 +80,81 @@ def build_entry(text, link, platform):
         "version": extract_version(link),
         "text": text,
         "url": link,
-        "platform": "None"
+        "platform": platform
     }
 
-# Extract download links
-seen = set()
-result = []
-
-for a in article_soup.find_all("a", href=True):
-    text = a.get_text(strip=True)
-    href = urljoin(url, a["href"])
-
-    key = (text, href)
-    if key in seen:
-        continue
-    seen.add(key)
-
-    if text in windows_texts:
-        result.append(build_entry(text, href, "Windows"))
-    elif text in mac_texts:
-        result.append(build_entry(text, href, "macOS"))
-    elif text in linux_texts:
-        result.append(build_entry(text, href, "Linux"))
-
-# Save to JSON
-with open("/home/yash-gaudani/R%D/Vlc/Zoom/zoom_all_articials.json", "w", encoding="utf-8") as f:
-    json.dump(result, f, indent=2, ensure_ascii=False)
-
-print("✅ All Zoom installers (Windows, macOS, Linux) saved to 'zoom_all_installers.json'")
-
-
-
-
-
-
-###################################################################### json #############33#######################33
-
-import requests
-import json
-
-# Define base URL formats
-cdn_base = "https://cdn.zoom.us/prod/{version}/{filename}"
-latest_base = "https://zoom.us/client/latest/{filename}"
-
-# Platforms to query
-platforms = ["win", "mac", "linux"]
-
-# Keys to extract from downloadVO
-product_keys = [
-    "zoom", "zoomX64", "zoomArm64", "zoomRC",
-    "outlookPlugin", "lyncPlugin", "notesPlugin",
-    "zoomRooms", "zoomRoomsX64"
-]
-
-# Final results
-download_links = []
-
-for platform in platforms:
-    url = f"https://zoom.us/rest/download?os={platform}"
-    try:
-        response = requests.get(url)
-        data = response.json()
-    except Exception as e:
-        print(f"[ERROR] Failed to fetch {platform}: {e}")
-        continue
-
-    if data.get("status") and "downloadVO" in data.get("result", {}):
-        downloadVO = data["result"]["downloadVO"]
-
-        for key in product_keys:
-            product = downloadVO.get(key)
-            if product:
+def article_links():
+    """Installers linked from the support article, by their link text."""
+    # Request and parse the page
+    response = get_client().get(url)
+    response.raise_for_status()
+    soup = parse_html(response, only=SoupStrainer("script", type="application/ld+json"))
+
+    # Extract embedded JSON content
+    script_tag = soup.find("script", {"type": "application/ld+json"})
+    json_data = json.loads(script_tag.string)
+    article_html = json_data.get("articleBody", "")
+    article_soup = parse_html(article_html, only="a")
+
+    # Extract download links
+    seen = set()
+    for a in article_soup.find_all("a", href=True):
+        text = a.get_text(strip=True)
+        href = urljoin(url, a["href"])
+
+        key = (text, href)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        if text in windows_texts:
+            yield build_entry(text, href, "Windows")
+        elif text in mac_texts:
+            yield build_entry(text, href, "macOS")
+        elif text in linux_texts:
+            yield build_entry(text, href, "Linux")
+
+def api_links():
+    """Packages listed by the download API, regular and IT builds, for every platform."""
+    for platform, platform_name in platforms.items():
+        api_url = f"https://zoom.us/rest/download?os={platform}"
+        try:
+            response = get_client().get(api_url)
+            data = response.json()
+        except Exception as e:
+            logger.error(f"Failed to fetch {platform}: {e}")
+            continue
+
+        if data.get("status") and "downloadVO" in data.get("result", {}):
+            downloadVO = data["result"]["downloadVO"]
+
+            for key in product_keys:
+                product = downloadVO.get(key)
+                if not product:
+                    continue
                 version = product.get("version")
-
-                # Regular package
-                filename = product.get("packageName")
-                if version and filename:
-                    url_format = latest_base if version == "latest" else cdn_base
-                    download_links.append({
-                        "platform": platform,
-                        "product": key,
-                        "version": version,
-                        "filename": filename,
-                        "url": url_format.format(version=version, filename=filename)
-                    })
-
-                # IT version
-                filename_it = product.get("packageNameForIT")
-                if version and filename_it:
-                    url_format = latest_base if version == "latest" else cdn_base
-                    download_links.append({
-                        "platform": platform,
-                        "product": key + "_IT",
-                        "version": version,
-                        "filename": filename_it,
-                        "url": url_format.format(version=version, filename=filename_it)
-                    })
-
-# Save result to JSON file
-output_path = "/home/yash-gaudani/R%D/Vlc/Zoom/zoom_download_links.json"
-with open(output_path, "w") as f:
-    json.dump(download_links, f, indent=2)
-
-# Print results
-for entry in download_links:
-    print(json.dumps(entry, indent=2))
-
+                if not version:
+                    continue
+                url_format = latest_base if version == "latest" else cdn_base
+
+                # Regular package, then the IT version
+                for name, filename in ((key, product.get("packageName")), (key + "_IT", product.get("packageNameForIT"))):
+                    if filename:
+                        yield {
+                            "product": name,
+                            "version": version,
+                            "platform": platform_name,
+                            "url": url_format.format(version=version, filename=filename),
+                            "filename": filename
+                        }
+
+class ZoomScraper(BaseScraper):
+    """Zoom installers from the support article and from the download API."""
+    product = "zoom"
+
+    def scrape(self, ctx):
+        yield from article_links()
+        yield from api_links()
+
+if __name__ == "__main__":
+    ZoomScraper.main()
@@ -1,42 +1,44 @@
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-import json
-import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.autoindex import listing
+from common.base import BaseScraper
+from common.http import get_client
+from common.introspect import fill_versions
 
 # Target URL
 url = "https://download.anydesk.com/linux/"
 
-# Local output path
-output_path = "/home/yash-gaudani/R%D/Vlc/anydesk/anydesk_linux_downloads.json"
-
-# Create directory if it doesn't exist
-os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-# Send GET request
-response = requests.get(url)
-response.raise_for_status()
-
-# Parse HTML
-soup = BeautifulSoup(response.text, "html.parser")
-
-# Extract links
-results = []
-
-for link in soup.find_all("a", href=True):
-    href = urljoin(url, link['href'])
-    text = link.get_text(strip=True)
-    if href.endswith(('.deb', '.rpm', '.tar.gz', '.xz')):
-        results.append({
-            "product": "anydesk",
-            "version": "",  # You can add logic to extract version from filename
-            "text": text,
-            "url": href,
-            "platform": "linux"
-        })
-
-# Write JSON to specified file
-with open(output_path, "w") as f:
-    json.dump(results, f, indent=2)
-
-print(f"✅ JSON saved to: {output_path}")
+class AnyDeskScraper(BaseScraper):
+    """AnyDesk Linux packages from the download directory listing."""
+    product = "anydesk"
+    platform = "linux"
+
+    def scrape(self, ctx):
+        # Send GET request
+        response = get_client().get(url)
+        response.raise_for_status()
+
+        # Extract links from the directory listing
+        results = []
+
+        for entry in listing(response, url):
+            href = entry.url(url)
+            text = entry.name
+            if href.endswith(('.deb', '.rpm', '.tar.gz', '.xz')):
+                results.append({
+                    "product": "anydesk",
+                    "version": "",  # read from the package itself below
+                    "text": text,
+                    "url": href,
+                    "platform": "linux"
+                })
+
+        # The file names carry no version; read it from each package's header
+        fill_versions(results)
+
+        yield from results
+
+if __name__ == "__main__":
+    AnyDeskScraper.main()
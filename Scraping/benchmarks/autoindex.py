@@ -0,0 +1,112 @@
+"""Directory-listing parser benchmark.
+
+Builds synthetic Apache (table and <pre>), nginx and lighttpd autoindex
+pages and times common.autoindex.parse_listing against the BeautifulSoup
+walk the mirror scrapers used (``fetch_files`` / ``get_links``). Both must
+find the same entries.
+
+    python benchmarks/autoindex.py --entries 10000 100000 --runs 3
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+SCRAPING_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCRAPING_DIR))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from common.autoindex import parse_listing  # noqa: E402
+
+STAMP = "2025-05-20 19:41"
+
+
+def _names(count: int):
+    for i in range(count):
+        if i % 20 == 0:
+            yield f"release-{i}/", None
+        else:
+            yield f"package-{i}.{i % 7}.{i % 13}-x86_64.tar.gz", 1000 + i * 37
+
+
+def apache_table(count: int) -> bytes:
+    rows = ['<table><tr><th><a href="?C=N;O=D">Name</a></th><th><a href="?C=M;O=A">Last modified</a></th></tr>',
+            '<tr><td><img src="/icons/back.gif" alt="[PARENTDIR]"></td><td><a href="/pub/">Parent Directory</a></td></tr>']
+    for name, size in _names(count):
+        icon = "folder" if size is None else "unknown"
+        rows.append(f'<tr><td valign="top"><img src="/icons/{icon}.gif" alt="[   ]"></td><td><a href="{name}">{name}</a>'
+                    f'</td><td align="right">{STAMP}  </td><td align="right">{size or "-"}</td><td>&nbsp;</td></tr>')
+    return "\n".join(rows + ["</table>"]).encode()
+
+
+def apache_pre(count: int) -> bytes:
+    lines = ['<pre><img src="/icons/blank.gif" alt="Icon "> <a href="?C=N;O=D">Name</a>',
+             '<img src="/icons/back.gif" alt="[PARENTDIR]"> <a href="/pub/">Parent Directory</a>       -']
+    for name, size in _names(count):
+        lines.append(f'<img src="/icons/unknown.gif" alt="[   ]"> <a href="{name}">{name}</a>   {STAMP}  {size or "-"}')
+    return "\n".join(lines + ["</pre>"]).encode()
+
+
+def nginx(count: int) -> bytes:
+    lines = ['<html><body><h1>Index of /dist/</h1><hr><pre><a href="../">../</a>']
+    for name, size in _names(count):
+        lines.append(f'<a href="{name}">{name}</a>{" " * 20}20-May-2025 19:41{" " * 10}{size or "-"}')
+    return "\n".join(lines + ["</pre><hr></body></html>"]).encode()
+
+
+def lighttpd(count: int) -> bytes:
+    rows = ['<table><tbody><tr class="d"><td class="n"><a href="../">..</a>/</td><td class="m">&nbsp;</td></tr>']
+    for name, size in _names(count):
+        rows.append(f'<tr><td class="n"><a href="{name}">{name.rstrip("/")}</a></td><td class="m">2025-May-20 19:41:07'
+                    f'</td><td class="s">{size or "- &nbsp;"}</td><td class="t">application/octet-stream</td></tr>')
+    return "\n".join(rows + ["</tbody></table>"]).encode()
+
+
+FORMATS = {"apache-table": apache_table, "apache-pre": apache_pre, "nginx": nginx, "lighttpd": lighttpd}
+
+
+def soup_walk(body: bytes):
+    """What fetch_files()/get_links() did: parse the whole page, then look at every anchor."""
+    soup = BeautifulSoup(body.decode("utf-8"), "html.parser")
+    names = []
+    for link in soup.find_all("a"):
+        href = link.get("href")
+        if href and href != "../" and not href.startswith(("?", "/")):
+            names.append(href.strip("/"))
+    return names
+
+
+def best_of(func, body: bytes, runs: int):
+    samples, result = [], None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func(body)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'format':<14}{'entries':>9}{'size':>9}{'soup':>10}{'autoindex':>11}{'speedup':>9}")
+    ok = True
+    for count in args.entries:
+        for label, build in FORMATS.items():
+            body = build(count)
+            soup_time, soup_names = best_of(soup_walk, body, args.runs)
+            fast_time, entries = best_of(parse_listing, body, args.runs)
+            if [entry.name for entry in entries] != soup_names or not all(e.mtime for e in entries):
+                print(f"{label}: autoindex and soup disagree on {count} entries")
+                ok = False
+            print(f"{label:<14}{count:>9}{len(body) / 2 ** 20:>8.1f}M{soup_time * 1000:>8.0f}ms"
+                  f"{fast_time * 1000:>9.0f}ms{soup_time / fast_time:>8.1f}x")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Artifact download benchmark.
+
+Serves generated installers from a local HTTP server that caps each
+connection's throughput (as mirrors and CDNs do) and honours Range and
+If-Range, then downloads them the way the downstream job did (one file at
+a time, one stream each) and through common.downloader (parallel files,
+Range segments, content-addressed store). Digests must match the served
+files, duplicates must be stored once, and a download cut off mid-file
+must resume from its part file.
+
+    python benchmarks/downloader.py --files 4 --size 24 --rate 16
+"""
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SCRAPING_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCRAPING_DIR))
+
+from common.downloader import (DEDUPLICATED, DOWNLOADED, FAILED, MAX_ATTEMPTS, Artifact, ArtifactStore,  # noqa: E402
+                               Downloader)
+from common.http import HttpClient  # noqa: E402
+
+CHUNK = 64 * 1024
+
+
+def make_handler(root: Path, rate: float, cut: dict):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_HEAD(self):
+            self.serve(body=False)
+
+        def do_GET(self):
+            self.serve(body=True)
+
+        def serve(self, body: bool):
+            path = root / self.path.lstrip("/")
+            if not path.is_file():
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            size = path.stat().st_size
+            etag = f'"{size:x}-{path.stat().st_mtime_ns:x}"'
+            start, end, status = 0, size - 1, 200
+            match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+            if match and self.headers.get("If-Range", etag) == etag:
+                start, status = int(match.group(1)), 206
+                end = int(match.group(2)) if match.group(2) else size - 1
+            self.send_response(status)
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", etag)
+            if status == 206:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.end_headers()
+            if not body:
+                return
+            limit = None
+            if cut.get(self.path):  # drop the next connections to this file after that many bytes
+                limit, cut[self.path] = cut[self.path][0], (cut[self.path][0], cut[self.path][1] - 1)
+                if not cut[self.path][1]:
+                    del cut[self.path]
+            with path.open("rb") as f:
+                f.seek(start)
+                sent, began = 0, time.monotonic()
+                while sent < end - start + 1:
+                    data = f.read(min(CHUNK, end - start + 1 - sent))
+                    if limit is not None and sent + len(data) > limit:
+                        self.wfile.write(data[:limit - sent])
+                        self.connection.shutdown(socket.SHUT_RDWR)
+                        return
+                    self.wfile.write(data)
+                    sent += len(data)
+                    ahead = sent / rate - (time.monotonic() - began)
+                    if ahead > 0:
+                        time.sleep(ahead)
+
+    return Handler
+
+
+def serial(base: str, names, dest: Path) -> float:
+    """One file after another, one stream each, hashing afterwards (the wget job)."""
+    client = HttpClient()
+    start = time.perf_counter()
+    for name in names:
+        response = client.request("GET", base + name, stream=True)
+        with (dest / name).open("wb") as f:
+            for chunk in response.iter_content(CHUNK):
+                f.write(chunk)
+        hashlib.sha256((dest / name).read_bytes()).hexdigest()
+    client.close()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=4, help="distinct files served")
+    parser.add_argument("--size", type=int, default=24, help="MB per file")
+    parser.add_argument("--rate", type=float, default=16, help="MB/s per connection")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="downloader-bench-"))
+    served = workdir / "served"
+    served.mkdir()
+    digests = {}
+    for i in range(args.files):
+        data = os.urandom(args.size * 2 ** 20)
+        name = f"app-{i}.exe"
+        (served / name).write_bytes(data)
+        digests[name] = hashlib.sha256(data).hexdigest()
+    # The same build under another name, like per-locale copies
+    shutil.copy(served / "app-0.exe", served / "app-0-de.exe")
+    digests["app-0-de.exe"] = digests["app-0.exe"]
+    names = sorted(digests)
+
+    cut = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(served, args.rate * 2 ** 20, cut))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/"
+    total = sum((served / name).stat().st_size for name in names) / 2 ** 20
+
+    ok = True
+    try:
+        (workdir / "serial").mkdir()
+        before = serial(base, names, workdir / "serial")
+
+        store = ArtifactStore(workdir / "store")
+        client = HttpClient()
+        start = time.perf_counter()
+        results = Downloader(store, client).download_all(Artifact(base + name, name) for name in names)
+        after = time.perf_counter() - start
+        for result in results:
+            if result.status not in (DOWNLOADED, DEDUPLICATED) or result.sha256 != digests[result.artifact.name]:
+                print(f"{result.artifact.name}: {result.status} {result.sha256} {result.error or ''}")
+                ok = False
+        objects = list((workdir / "store" / "objects").glob("*/*"))
+        if len(objects) != args.files:
+            print(f"expected {args.files} stored objects, found {len(objects)}")
+            ok = False
+        reread = sum(result.reread_bytes for result in results) / 2 ** 20
+
+        # Resume: every attempt of the first run is cut off, so it gives up; the next run picks up its part file
+        resumed_store = ArtifactStore(workdir / "resumed")
+        cut["/app-1.exe"] = (args.size * 2 ** 20 // 4, MAX_ATTEMPTS)
+        artifact = Artifact(base + "app-1.exe", "app-1.exe")
+        first = Downloader(resumed_store, client, segments=1).download_all([artifact])
+        second = Downloader(resumed_store, client, segments=1).download_all([artifact])
+        resumed = second[0].resumed_bytes
+        if first[0].status != FAILED or not resumed or second[0].sha256 != digests["app-1.exe"]:
+            print(f"resume failed: {first[0].status}, then {second[0].status} {second[0].error or ''}")
+            ok = False
+        client.close()
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{len(names)} files, {total:.0f} MB at {args.rate:g} MB/s per connection")
+    print(f"{'serial':<12}{before:>8.2f}s{total / before:>9.1f} MB/s")
+    print(f"{'downloader':<12}{after:>8.2f}s{total / after:>9.1f} MB/s{before / after:>8.1f}x")
+    print(f"stored objects: {args.files} for {len(names)} files; hashed from the page cache: {reread:.0f} MB")
+    print(f"resumed after an interrupted run: {resumed / 2 ** 20:.0f} of {args.size} MB already on disk")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
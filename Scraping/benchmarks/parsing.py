@@ -0,0 +1,73 @@
+"""HTML parse-time benchmark.
+
+Parses the saved release-page fixtures the way the scrapers used to (decode
+to text, build the whole tree with html.parser) and through
+common.parsing.parse_html (response bytes, html_backend(), tag-restricted
+trees). Both must extract the same data.
+
+    python benchmarks/parsing.py --runs 5
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+SCRAPING_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCRAPING_DIR))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from common.parsing import html_backend, parse_html  # noqa: E402
+
+
+def _links(soup):
+    return [a["href"] for a in soup.find_all("a", href=True)]
+
+
+def _fragment(soup):
+    tag = soup.find("include-fragment", {"src": lambda x: x and "expanded_assets" in x})
+    return tag and tag["src"]
+
+
+# (label, fixture, only, extract)
+CASES = [
+    ("git release links", "git/github_release_full.html", "a", _links),
+    ("git release, full tree", "git/github_release_full.html", None, _links),
+    ("obs asset fragment", "obs_studio/obs_release_page.html", "include-fragment", _fragment),
+    ("obs release links", "obs_studio/obs_release_page.html", "a", _links),
+]
+
+
+def median_time(func, runs: int):
+    samples, result = [], None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"backend: {html_backend()}")
+    print(f"{'case':<26}{'size':>8}{'before':>10}{'after':>10}{'speedup':>9}")
+    ok = True
+    for label, fixture, only, extract in CASES:
+        body = (SCRAPING_DIR / fixture).read_bytes()
+        before, expected = median_time(
+            lambda: extract(BeautifulSoup(body.decode("utf-8"), "html.parser")), args.runs)
+        after, got = median_time(lambda: extract(parse_html(body, only=only)), args.runs)
+        if got != expected:
+            print(f"{label}: restricted parse disagrees with the full parse")
+            ok = False
+        print(f"{label:<26}{len(body) / 1024:>6.0f}K{before * 1000:>8.1f}ms{after * 1000:>8.1f}ms"
+              f"{before / after:>8.1f}x")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
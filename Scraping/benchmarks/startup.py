@@ -0,0 +1,81 @@
+"""Cold-start benchmark for the orchestrator CLI.
+
+Times fresh interpreters running ``orchestrator.py --help`` and
+``orchestrator.py validate``, and checks that neither pulls in requests or
+bs4. Exits non-zero when the median exceeds ``--max-ms`` so a regression can
+fail a cron or CI job.
+
+    python benchmarks/startup.py --runs 10 --max-ms 250
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRAPING_DIR = Path(__file__).resolve().parents[1]
+ORCHESTRATOR = str(SCRAPING_DIR / "orchestrator.py")
+HEAVY_MODULES = ("requests", "bs4", "urllib3")
+
+# Runs the CLI in-process so sys.modules can be inspected afterwards
+_PROBE = """
+import asyncio, contextlib, io, sys
+sys.argv = ["orchestrator.py"] + {argv!r}
+import orchestrator
+with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+    try:
+        asyncio.run(orchestrator.main())
+    except SystemExit:
+        pass
+print(",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def _run(args, workdir: str, **kwargs) -> subprocess.CompletedProcess:
+    # Run from a scratch directory so the benchmark doesn't append to scraper.log
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(SCRAPING_DIR), os.environ.get("PYTHONPATH")]))}
+    return subprocess.run([sys.executable, *args], cwd=workdir, env=env, **kwargs)
+
+
+def time_command(args, runs: int, workdir: str):
+    """Median and min wall time (ms) of fresh interpreters running ``python *args``."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run(args, workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), min(samples)
+
+
+def heavy_imports(argv, workdir: str):
+    probe = _PROBE.format(argv=list(argv), heavy=HEAVY_MODULES)
+    output = _run(["-c", probe], workdir, capture_output=True, text=True)
+    return [m for m in output.stdout.strip().split(",") if m]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Orchestrator cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, help="Fail if a command's median exceeds this")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="orchestrator-startup-")
+    interpreter, _ = time_command(["-c", "pass"], args.runs, workdir)
+    print(f"bare interpreter: median {interpreter:.1f} ms")
+
+    failed = False
+    for argv in (["--help"], ["validate"]):
+        median, fastest = time_command([ORCHESTRATOR, *argv], args.runs, workdir)
+        heavy = heavy_imports(argv, workdir)
+        print(f"orchestrator.py {' '.join(argv)}: median {median:.1f} ms, min {fastest:.1f} ms"
+              + (f", imported {', '.join(heavy)}" if heavy else ""))
+        if heavy or (args.max_ms is not None and median > args.max_ms):
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
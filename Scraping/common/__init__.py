@@ -0,0 +1 @@
+"""Shared building blocks used by the orchestrator and the individual scrapers."""
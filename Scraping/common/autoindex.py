@@ -0,0 +1,147 @@
+import re
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import quote, unquote, urljoin, urlsplit
+
+# Parses the directory listings mirrors generate (Apache mod_autoindex in its
+# table and <pre> layouts, nginx autoindex, lighttpd/mirrorbrain tables and the
+# size-before-date tables of Mozilla's CDN) straight from the response bytes.
+# Only the anchor and the text up to the next anchor are looked at, so no tree
+# is built.
+
+# An anchor's href, then everything up to the next anchor (the row's date and size columns)
+_ROW = re.compile(
+    rb"""<a\s[^>]*?href\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))[^>]*>[^<]*(?:</a>)?([^<]*(?:<(?!a[\s>])[^<]*)*)""",
+    re.IGNORECASE,
+)
+_TAG = re.compile(rb"<[^>]*>|&nbsp;")
+_DATE = re.compile(
+    rb"(\d{4})-(\d{2}|[A-Za-z]{3})-(\d{1,2})[ T]+(\d{1,2}):(\d{2})(?::(\d{2}))?"  # 2024-05-01 / 2024-May-01
+    rb"|(\d{1,2})-([A-Za-z]{3})-(\d{4})[ T]+(\d{1,2}):(\d{2})(?::(\d{2}))?"  # 01-May-2024
+)
+_SIZE = re.compile(rb"\s*(-|\d+(?:\.\d+)?)\s*([KMGTP]?)(?:i?B)?(?=\s|$)", re.IGNORECASE)
+_SIZE_BEFORE = re.compile(rb"(-|\d+(?:\.\d+)?)\s*([KMGTP]?)(?:i?B)?\s*$", re.IGNORECASE)  # Mozilla's CDN
+_PLAIN_HREF = re.compile(r"[^?#/.:][^?#/:]*/?")  # "name" or "name/": the usual entry link
+MAX_TAIL = 512  # bytes after an anchor searched for its date and size
+
+_MONTHS = {m: i for i, m in enumerate(
+    (b"jan", b"feb", b"mar", b"apr", b"may", b"jun", b"jul", b"aug", b"sep", b"oct", b"nov", b"dec"), 1)}
+_UNITS = {b"": 1, b"K": 1024, b"M": 1024 ** 2, b"G": 1024 ** 3, b"T": 1024 ** 4, b"P": 1024 ** 5}
+
+
+class Entry(NamedTuple):
+    """One row of a directory listing."""
+    name: str  # unquoted, without the trailing slash of directories
+    is_dir: bool
+    size: Optional[int] = None  # bytes; approximate when the listing rounds (1.2M)
+    mtime: Optional[datetime] = None
+
+    @property
+    def href(self) -> str:
+        return quote(self.name) + ("/" if self.is_dir else "")
+
+    def url(self, base: str) -> str:
+        """Absolute URL of the entry in the listing at ``base``."""
+        return urljoin(base, self.href)
+
+
+def _month(text: bytes) -> int:
+    return int(text) if text.isdigit() else _MONTHS[text[:3].lower()]
+
+
+def _mtime(match) -> Optional[datetime]:
+    g = match.groups()
+    try:
+        if g[0] is not None:
+            return datetime(int(g[0]), _month(g[1]), int(g[2]), int(g[3]), int(g[4]), int(g[5] or 0))
+        return datetime(int(g[8]), _month(g[7]), int(g[6]), int(g[9]), int(g[10]), int(g[11] or 0))
+    except (KeyError, ValueError):
+        return None
+
+
+def _parse_tail(tail: bytes, dates: Dict[bytes, Optional[datetime]]):
+    """(size, mtime) from the text following an anchor; ``dates`` caches parsed timestamps."""
+    match = _DATE.search(tail)
+    if match is None:
+        return None, None
+    stamp = match.group()
+    mtime = dates[stamp] if stamp in dates else dates.setdefault(stamp, _mtime(match))
+    rest = tail[match.end():match.end() + MAX_TAIL]
+    if b"<" in rest or b"&" in rest:
+        rest = _TAG.sub(b" ", rest)
+    size_match = _SIZE.match(rest)
+    if size_match is None:
+        size_match = _SIZE_BEFORE.search(_TAG.sub(b" ", tail[:match.start()]))
+    if size_match is None or size_match.group(1) == b"-":
+        return None, mtime
+    number, unit = size_match.groups()
+    return int(number) if not unit and number.isdigit() else int(float(number) * _UNITS[unit.upper()]), mtime
+
+
+def _child(href: str, base_path: Optional[str]) -> Optional[Tuple[str, bool]]:
+    """(name, is_dir) for ``href``, or None for navigation links (sorting, parent, elsewhere)."""
+    if _PLAIN_HREF.fullmatch(href):
+        return (href[:-1], True) if href[-1] == "/" else (href, False)
+    if not href or href[0] in "?#" or href.startswith(("../", "./")) or href in ("..", "."):
+        return None
+    if "://" in href or href.startswith("//"):
+        if base_path is None:
+            return None
+        href = urlsplit(href).path
+    if href.startswith("/"):
+        if base_path is None or not href.startswith(base_path) or len(href) == len(base_path):
+            return None
+        href = href[len(base_path):]
+    href = href.split("?", 1)[0].split("#", 1)[0]
+    is_dir = href.endswith("/")
+    name = href[:-1] if is_dir else href
+    if not name or "/" in name:
+        return None
+    return name, is_dir
+
+
+def parse_listing(body: Union[bytes, str], base_url: Optional[str] = None, encoding: str = "utf-8") -> List[Entry]:
+    """Entries of an autoindex page, in listing order.
+
+    Navigation links (column sorting, the parent directory) are skipped.
+    Links with an absolute path or URL are only kept when ``base_url`` is
+    given and they point directly inside it.
+    """
+    if isinstance(body, str):
+        body = body.encode(encoding, errors="surrogateescape")
+    base_path = None
+    if base_url is not None:
+        base_path = urlsplit(base_url).path or "/"
+        if not base_path.endswith("/"):
+            base_path = base_path.rsplit("/", 1)[0] + "/"
+
+    entries: List[Entry] = []
+    seen = set()
+    dates: Dict[bytes, Optional[datetime]] = {}
+    for match in _ROW.finditer(body):
+        raw = match.group(1) or match.group(2) or match.group(3) or b""
+        href = raw.decode(encoding, errors="replace")
+        if "%" in href or "&" in href:
+            href = unquote(href.replace("&amp;", "&"))
+        child = _child(href, base_path)
+        if child is None or child[0] in seen:
+            continue
+        name, is_dir = child
+        seen.add(name)
+        size, mtime = _parse_tail(match.group(4)[:MAX_TAIL], dates)
+        entries.append(Entry(name, is_dir, size, mtime))
+    return entries
+
+
+def listing(response, base_url: Optional[str] = None) -> List[Entry]:
+    """Entries of a fetched listing, parsed once per run when the page is memoized."""
+    base_url = base_url or response.url
+
+    def build():
+        return parse_listing(response.content, base_url)
+
+    memo = getattr(response, "memo", None)
+    page = getattr(response, "memo_page", None)
+    if memo is None or page is None:
+        return build()
+    return memo.tree(page, f"autoindex:{base_url}", build)
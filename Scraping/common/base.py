@@ -0,0 +1,271 @@
+import abc
+import asyncio
+import contextvars
+import hashlib
+import inspect
+import itertools
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+from common.cadence import extract_versions
+from common.verify import iter_links
+
+logger = logging.getLogger(__name__)
+
+RECORD_KEYS = ("product", "version", "platform", "url", "text")  # written first, in this order
+UNKNOWN_PLATFORM = "Unknown"
+SYNC_BATCH = 256  # records taken from a blocking generator per trip to the executor
+
+
+class BaseScraper(abc.ABC):
+    """A scraper that yields its download records instead of writing files.
+
+    Subclasses implement ``scrape(ctx)`` as an async generator (fetching with
+    ``await ctx.fetch(url)``) or, for blocking code using ``get_client()``, a
+    plain generator; either way it yields one dict per download. ``product``
+    and ``platform`` fill records that don't name their own. The orchestrator
+    writes each record to ``output/<name>.jsonl`` as it arrives, so no record
+    is held in memory and none is serialized twice.
+    """
+    product: Optional[str] = None
+    platform: Optional[str] = None
+
+    @abc.abstractmethod
+    def scrape(self, ctx) -> Union[AsyncIterator[Dict[str, Any]], Iterator[Dict[str, Any]]]:
+        """Yield the download records."""
+
+    @classmethod
+    def main(cls) -> None:
+        """Run on its own (the scraper's ``__main__`` block): print the records as JSON Lines.
+
+        Progress is logged to stderr, so stdout stays valid JSON Lines.
+        """
+        from common.fetch import FetchContext
+
+        logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+        async def runner():
+            async with FetchContext.standalone(cls.__name__) as ctx:
+                async for record in records(cls, ctx):
+                    print(json.dumps(record, ensure_ascii=False))
+        asyncio.run(runner())
+
+
+def is_streaming(entry: Any) -> bool:
+    """Whether an entry point yields records: a BaseScraper (class or instance) or a generator function."""
+    if isinstance(entry, type):
+        return issubclass(entry, BaseScraper)
+    return isinstance(entry, BaseScraper) or inspect.isasyncgenfunction(entry) or inspect.isgeneratorfunction(entry)
+
+
+def normalize(record: Any, product: Optional[str] = None, platform: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The record with RECORD_KEYS first and the scraper's own keys after; None if it has no URL."""
+    if not isinstance(record, dict) or not isinstance(record.get("url"), str) or not record["url"].strip():
+        return None
+    url = record["url"].strip()
+    version = record.get("version")
+    normalized = {
+        "product": record.get("product") or product,
+        "version": str(version).strip() if version is not None else None,
+        "platform": record.get("platform") or platform or UNKNOWN_PLATFORM,
+        "url": url,
+        "text": record.get("text") or unquote(urlsplit(url).path.rsplit("/", 1)[-1]) or url,
+    }
+    normalized.update((key, value) for key, value in record.items() if key not in normalized)
+    return normalized
+
+
+def _take(generator: Iterator[Any], size: int) -> List[Any]:
+    """Up to ``size`` items; fewer only when the generator is exhausted."""
+    return list(itertools.islice(generator, size))
+
+
+async def _sync_records(generator: Iterator[Any], executor) -> AsyncIterator[Any]:
+    """Advance a blocking generator in ``executor``, a batch per step, keeping the caller's context."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()  # request counters stay attributed to this scraper
+    step = None
+    try:
+        while True:
+            step = loop.run_in_executor(executor, context.run, _take, generator, SYNC_BATCH)
+            batch = await asyncio.shield(step)  # cancelling the scrape must not mark a running step done
+            for item in batch:
+                yield item
+            if len(batch) < SYNC_BATCH:
+                return
+    finally:
+        if step is not None and not step.done():
+            # A cancelled step keeps running in its thread; close the generator once it returns
+            step.add_done_callback(lambda _: _close(generator))
+        else:
+            _close(generator)
+
+
+def _close(generator: Iterator[Any]) -> None:
+    try:
+        generator.close()
+    except Exception as e:
+        logger.debug(f"Closing an abandoned scrape failed: {e}")
+
+
+async def records(entry: Any, ctx, executor=None) -> AsyncIterator[Dict[str, Any]]:
+    """Normalized records from a streaming entry point, as they are produced.
+
+    Records without a URL are dropped with a warning. Sync generators run in
+    ``executor`` (the loop's default when None) so they don't block the loop.
+    """
+    from common.fetch import accepts_context
+
+    scraper = entry() if isinstance(entry, type) else entry
+    if isinstance(scraper, BaseScraper):
+        product, platform, source = scraper.product, scraper.platform, scraper.scrape(ctx)
+    else:
+        product = platform = None
+        source = scraper(ctx) if accepts_context(scraper) else scraper()
+    raw = source if hasattr(source, "__anext__") else _sync_records(iter(source), executor)
+    name = getattr(ctx, "name", None) or type(scraper).__name__
+    try:
+        async for record in raw:
+            normalized = normalize(record, product, platform)
+            if normalized is None:
+                logger.warning(f"{name}: dropped a record without a URL: {str(record)[:200]}")
+                continue
+            yield normalized
+    finally:
+        aclose = getattr(raw, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+@dataclass
+class StreamSummary:
+    """What a streamed run produced; stands in for the records in results and stats."""
+    path: str
+    records: int = 0
+    bytes: int = 0
+    versions: int = 0
+    fingerprint: Optional[str] = None  # same form as cadence.fingerprint(): versions, else a content hash
+
+    @property
+    def urls(self) -> Path:
+        """The download links of the records, one per line, for the link checks."""
+        return sidecar(self.path, "urls")
+
+
+def sidecar(path: Union[str, Path], kind: str) -> Path:
+    """A file kept next to a JSON Lines output, e.g. ``output/<name>.urls``."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.{kind}")
+
+
+class RecordStream:
+    """Writes a scraper's records to ``path`` as JSON Lines while they arrive.
+
+    Records go to a temporary file that replaces ``path`` only when the run
+    completes, so a failed or timed-out attempt keeps the last good output.
+    Each record is serialized exactly once and never read back, and nothing
+    held in memory grows with the output: the records' download links and
+    version strings go to the ``.urls`` and ``.versions`` sidecars as they are
+    met, and the cadence fingerprint is built from the versions sidecar.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._files: List[Tuple[Path, Path, Any]] = []  # (path, temporary path, open file)
+        self._file = self._open(self.path)
+        self._urls = self._open(sidecar(self.path, "urls"))
+        self._versions = self._open(sidecar(self.path, "versions"))
+        self._last_url: Optional[str] = None  # records of one release repeat these, so runs collapse
+        self._last_versions: Set[str] = set()
+        self._digest = hashlib.sha1()
+        self.summary = StreamSummary(str(self.path))
+
+    def _open(self, path: Path):
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        f = open(tmp, "w", encoding="utf-8")
+        self._files.append((path, tmp, f))
+        return f
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        self._file.write(line)
+        versions = extract_versions(record)
+        if versions and versions != self._last_versions:
+            self._versions.writelines(f"{version}\n" for version in versions)
+            self._last_versions = versions
+        for _, _, url in iter_links(record):
+            if url != self._last_url:
+                self._urls.write(url + "\n")
+                self._last_url = url
+        self._digest.update(line.encode("utf-8"))
+        self.summary.records += 1
+        self.summary.bytes += len(line.encode("utf-8"))
+
+    def commit(self) -> StreamSummary:
+        for _, _, f in self._files:
+            f.close()
+        # The fingerprint names every distinct version, so only those are held, never the records
+        versions = sorted(set(read_lines(self._files[2][1])))
+        for path, tmp, _ in self._files:
+            os.replace(tmp, path)
+        self.summary.versions = len(versions)
+        if versions:
+            self.summary.fingerprint = ",".join(versions)
+        elif self.summary.records:
+            self.summary.fingerprint = "sha1:" + self._digest.hexdigest()
+        return self.summary
+
+    def discard(self) -> None:
+        for _, tmp, f in self._files:
+            f.close()
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "RecordStream":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+async def stream_to(path: Union[str, Path], entry: Any, ctx, executor=None) -> StreamSummary:
+    """Run a streaming entry point and write its records to ``path``."""
+    with RecordStream(path) as out:
+        async for record in records(entry, ctx, executor):
+            out.write(record)
+    return out.summary
+
+
+def read_lines(path: Union[str, Path]) -> Iterator[str]:
+    """The non-empty lines of a sidecar, one at a time; nothing if it doesn't exist."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if line:
+                    yield line
+    except FileNotFoundError:
+        return
+
+
+def read_records(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """The records of a JSON Lines output, one at a time; nothing if it doesn't exist."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    except FileNotFoundError:
+        return
+
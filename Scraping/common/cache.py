@@ -0,0 +1,135 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+# Where standalone scraper runs and the orchestrator keep their shared cache
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / ".cache" / "http_cache.sqlite"
+
+NEGATIVE_STATUSES = (404, 410)
+NEGATIVE_TTL = 600  # seconds a 404/410 is trusted without asking again
+MAX_BODY_SIZE = 20 * 1024 * 1024  # don't keep artifacts, only pages/feeds
+
+# Headers that describe the wire encoding rather than the (decoded) stored body
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    status: int
+    final_url: str
+    headers: Dict[str, str]
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    expires_at: Optional[float] = None
+
+    @property
+    def is_negative(self) -> bool:
+        return self.status in NEGATIVE_STATUSES
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.expires_at is not None and self.expires_at > time.time()
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Validators to send so the server can answer 304 Not Modified."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """On-disk store of response validators and bodies, keyed by URL."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CACHE_PATH, negative_ttl: int = NEGATIVE_TTL):
+        self.path = Path(path)
+        self.negative_ttl = negative_ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                final_url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                expires_at REAL
+            )"""
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, final_url, headers, body, etag, last_modified, stored_at, expires_at "
+                "FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(*row)
+        entry.headers = json.loads(entry.headers)
+        if entry.is_negative and not entry.is_fresh:
+            return None
+        return entry
+
+    def store(self, url: str, response) -> bool:
+        """Remember ``response`` if it can be revalidated or negatively cached."""
+        status = response.status_code
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if status in NEGATIVE_STATUSES:
+            expires_at = time.time() + self.negative_ttl
+            body = b""
+        elif status == 200 and (etag or last_modified):
+            expires_at = None
+            body = response.content
+            if len(body) > MAX_BODY_SIZE:
+                return False
+        else:
+            return False
+
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, status, response.url or url, json.dumps(headers), body,
+                 etag, last_modified, time.time(), expires_at),
+            )
+            self._conn.commit()
+        return True
+
+    def touch(self, url: str, response) -> None:
+        """Record a 304 revalidation, picking up any refreshed validators."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (time.time(), etag, last_modified, url),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from statistics import median
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+DEFAULT_CADENCE_PATH = Path(__file__).resolve().parents[1] / ".state" / "cadence.json"
+MIN_TTL = 3600.0  # never wait less than an hour between checks of a product
+MAX_TTL = 7 * 86400.0  # ...or more than a week
+CHECKS_PER_RELEASE = 4  # poll this many times per typical gap between releases
+AGE_FRACTION = 0.1  # without a cadence yet, wait 10% of the time since the last change
+JITTER = 0.1  # +/- share of the TTL, so products don't all come due together
+MAX_CHANGES = 12  # change timestamps kept per product
+VERSION_KEYS = ("version", "latest_version", "tag_name", "tag")
+UNKNOWN_VERSIONS = {"", "unknown", "none", "n/a"}
+
+
+def extract_versions(data: Any) -> Set[str]:
+    """All version strings found under VERSION_KEYS anywhere in a scraper's output."""
+    found: Set[str] = set()
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            for key, value in item.items():
+                if key in VERSION_KEYS and isinstance(value, (str, int, float)):
+                    if str(value).strip().lower() not in UNKNOWN_VERSIONS:
+                        found.add(str(value).strip())
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        elif isinstance(item, list):
+            stack.extend(item)
+    return found
+
+
+def fingerprint(outputs: Iterable[Any]) -> Optional[str]:
+    """Identify what a scraper observed: its version strings, or a hash of its output without any.
+
+    Returns None when there is no output to go by.
+    """
+    outputs = [output for output in outputs if output is not None]
+    if not outputs:
+        return None
+    versions = set().union(*(extract_versions(output) for output in outputs))
+    if versions:
+        return ",".join(sorted(versions))
+    blob = json.dumps(outputs, sort_keys=True, default=str).encode("utf-8")
+    return "sha1:" + hashlib.sha1(blob).hexdigest()
+
+
+@dataclass
+class ProductCadence:
+    fingerprint: Optional[str] = None
+    first_seen: Optional[float] = None  # epoch seconds
+    changes: List[float] = field(default_factory=list)  # when a new fingerprint was observed
+    last_check: Optional[float] = None
+    next_check: Optional[float] = None
+
+    @property
+    def cadence(self) -> Optional[float]:
+        """Typical seconds between releases, once at least two changes have been seen."""
+        if len(self.changes) < 2:
+            return None
+        return median(b - a for a, b in zip(self.changes, self.changes[1:]))
+
+
+@dataclass
+class Decision:
+    run: bool
+    reason: str
+    next_check: Optional[float] = None
+
+
+class CadenceStore:
+    """Learns each product's release cadence and decides when it is worth checking again."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CADENCE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.products: Dict[str, ProductCadence] = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.products = {name: ProductCadence(**record) for name, record in data.items()}
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({name: asdict(p) for name, p in self.products.items()}, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    @staticmethod
+    def ttl(product: ProductCadence, now: float) -> float:
+        if product.cadence is not None:
+            ttl = product.cadence / CHECKS_PER_RELEASE
+        else:
+            since = product.changes[-1] if product.changes else product.first_seen
+            since = now if since is None else since
+            ttl = (now - since) * AGE_FRACTION
+        return min(MAX_TTL, max(MIN_TTL, ttl))
+
+    def observe(self, name: str, observed: Optional[str], now: Optional[float] = None) -> ProductCadence:
+        """Record a successful check of ``name`` and schedule the next one."""
+        now = time.time() if now is None else now
+        with self._lock:
+            product = self.products.setdefault(name, ProductCadence(first_seen=now))
+            if observed is not None and observed != product.fingerprint:
+                if product.fingerprint is not None:
+                    product.changes = (product.changes + [now])[-MAX_CHANGES:]
+                product.fingerprint = observed
+            product.last_check = now
+            product.next_check = now + self.ttl(product, now) * random.uniform(1 - JITTER, 1 + JITTER)
+            self._save()
+            return product
+
+    def decide(self, name: str, force: bool = False, now: Optional[float] = None) -> Decision:
+        now = time.time() if now is None else now
+        product = self.products.get(name)
+        if force:
+            return Decision(True, "forced", product.next_check if product else None)
+        if product is None or product.next_check is None:
+            return Decision(True, "no history")
+        if product.next_check <= now:
+            return Decision(True, "due", product.next_check)
+        cadence = product.cadence
+        basis = f"releases every ~{cadence / 86400:.1f}d" if cadence else "no release seen yet"
+        return Decision(False, f"not due ({basis})", product.next_check)
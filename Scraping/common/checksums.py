@@ -0,0 +1,253 @@
+import logging
+import posixpath
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import unquote, urljoin, urlsplit
+
+logger = logging.getLogger(__name__)
+
+ALGORITHMS = ("sha512", "sha256", "sha1", "md5")  # strongest first; only the strongest sidecar is fetched
+HEX_LENGTHS = {128: "sha512", 64: "sha256", 40: "sha1", 32: "md5"}
+SIGNATURE_SUFFIXES = (".asc", ".sig", ".gpg")
+MAX_WORKERS = 16  # sidecars fetched at once by the sync driver
+
+# SHA256SUMS, sha256sums, SHASUMS256.txt, md5sums, ...
+_MANIFEST_RE = re.compile(r"^(sha|md5)(\d*)sums?(\d*)(?:\.txt)?$", re.IGNORECASE)
+_GNU_LINE_RE = re.compile(r"^\\?([0-9a-fA-F]{32,128})\s+[ *]?(.+?)\s*$")  # sha256sum output
+_BSD_LINE_RE = re.compile(r"^(\w+)\s*\((.+)\)\s*=\s*([0-9a-fA-F]{32,128})\s*$")  # shasum --tag output
+_HEX_RE = re.compile(r"\b[0-9a-fA-F]{32,128}\b")
+
+# Kinds of sidecar file
+DIGEST = "digest"  # one artifact's digest: app.exe.sha256
+SIGNATURE = "signature"  # one artifact's detached signature: app.exe.asc
+MANIFEST = "manifest"  # digests of a whole directory: SHA256SUMS
+
+
+@dataclass
+class Sidecar:
+    url: str
+    kind: str
+    target: Optional[str] = None  # URL of the artifact described; None for a manifest
+    algorithm: Optional[str] = None
+
+
+def file_name(url: str) -> str:
+    return unquote(posixpath.basename(urlsplit(url).path))
+
+
+def _directory(url: str) -> str:
+    return url.rsplit("/", 1)[0] + "/"
+
+
+def classify(url: str) -> Optional[Sidecar]:
+    """What ``url`` is, if it is a checksum or signature file rather than an artifact."""
+    name = file_name(url)
+    manifest = _MANIFEST_RE.match(name)
+    if manifest:
+        prefix, before, after = manifest.groups()
+        algorithm = "md5" if prefix.lower() == "md5" else f"sha{before or after or 1}"
+        return Sidecar(url, MANIFEST, algorithm=algorithm if algorithm in ALGORITHMS else None)
+    stem, _, suffix = url.rpartition(".")
+    if not stem or "/" in suffix:
+        return None
+    suffix = suffix.lower()
+    algorithm = suffix[:-3] if suffix.endswith("sum") else suffix  # app.exe.sha256sum
+    if algorithm in ALGORITHMS:
+        return Sidecar(url, DIGEST, stem, algorithm)
+    if f".{suffix}" in SIGNATURE_SUFFIXES:
+        return Sidecar(url, SIGNATURE, stem)
+    return None
+
+
+def _algorithm(digest: str, declared: Optional[str]) -> Optional[str]:
+    by_length = HEX_LENGTHS.get(len(digest))
+    return declared if declared == by_length else by_length
+
+
+def parse_manifest(text: str, algorithm: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+    """Digests listed in a checksum file, by the path written next to them.
+
+    Reads both ``sha256sum`` lines (``<hex>  <path>``, ``*`` for binary mode)
+    and ``shasum --tag`` lines (``SHA256 (<path>) = <hex>``). The algorithm
+    is taken from the digest's length when ``algorithm`` doesn't fit it.
+    """
+    digests: Dict[str, Dict[str, str]] = {}
+    for line in text.splitlines():
+        line = line.strip()
+        match = _GNU_LINE_RE.match(line)
+        if match:
+            digest, path = match.groups()
+            declared = algorithm
+        else:
+            match = _BSD_LINE_RE.match(line)
+            if not match:
+                continue
+            declared, path, digest = match.group(1).lower().replace("-", ""), match.group(2), match.group(3)
+        found = _algorithm(digest, declared)
+        if found is not None:
+            digests.setdefault(path[2:] if path.startswith("./") else path, {})[found] = digest.lower()
+    return digests
+
+
+def parse_sidecar(text: str, algorithm: Optional[str] = None) -> Optional[str]:
+    """The digest in a single-artifact checksum file (a bare digest or one manifest line)."""
+    for digests in parse_manifest(text, algorithm).values():
+        if algorithm in digests:
+            return digests[algorithm]
+    match = _HEX_RE.search(text)
+    if match and _algorithm(match.group(0), algorithm) == algorithm:
+        return match.group(0).lower()
+    return None
+
+
+class _Harvest:
+    """Harvesting state shared by the sync and async drivers.
+
+    The first round fetches one manifest per directory (the strongest
+    algorithm on offer) and matches its entries to the artifacts, by URL or
+    else by unique file name. The second round fetches, for each artifact
+    still without a digest, only its strongest digest sidecar.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], url_key: str, extra: Iterable[str]):
+        self.url_key = url_key
+        self.artifacts: List[Dict[str, Any]] = []
+        self.digests: Dict[str, Dict[str, Sidecar]] = {}  # artifact URL -> algorithm -> sidecar
+        self.signatures: Dict[str, str] = {}
+        manifests: Dict[str, Sidecar] = {}
+        for url in extra:
+            self._add_manifest(manifests, classify(url) or Sidecar(url, MANIFEST))
+        for record in records:
+            sidecar = classify(record.get(url_key) or "")
+            if sidecar is None:
+                self.artifacts.append(record)
+            elif sidecar.kind == MANIFEST:
+                self._add_manifest(manifests, sidecar)
+            elif sidecar.kind == DIGEST:
+                self.digests.setdefault(sidecar.target, {})[sidecar.algorithm] = sidecar
+            else:
+                self.signatures[sidecar.target] = sidecar.url
+        self.manifests = list(manifests.values())
+        self.found: Dict[str, Dict[str, str]] = {}  # artifact URL -> algorithm -> digest
+        self.rounds = 0
+        self.requests = 0
+
+    @staticmethod
+    def _add_manifest(manifests: Dict[str, Sidecar], sidecar: Sidecar) -> None:
+        directory = _directory(sidecar.url)
+        current = manifests.get(directory)
+        if current is None or _rank(sidecar.algorithm) < _rank(current.algorithm):
+            manifests[directory] = sidecar
+
+    def first(self) -> Dict[str, Sidecar]:
+        return {sidecar.url: sidecar for sidecar in self.manifests}
+
+    def feed(self, sidecars: Dict[str, Sidecar], bodies: Dict[str, Optional[str]]) -> Dict[str, Sidecar]:
+        """Take one round's bodies; returns the next round's sidecars, empty when done."""
+        self.rounds += 1
+        self.requests += len(sidecars)
+        for url, sidecar in sidecars.items():
+            body = bodies.get(url)
+            if body is None:
+                continue
+            if sidecar.kind == MANIFEST:
+                self._match(sidecar, parse_manifest(body, sidecar.algorithm))
+            else:
+                digest = parse_sidecar(body, sidecar.algorithm)
+                if digest is not None:
+                    self.found.setdefault(sidecar.target, {})[sidecar.algorithm] = digest
+        if self.rounds > 1:
+            return {}
+        pending = {}
+        for record in self.artifacts:
+            url = record.get(self.url_key)
+            offered = self.digests.get(url)
+            if offered and url not in self.found:
+                strongest = min(offered.values(), key=lambda sidecar: _rank(sidecar.algorithm))
+                pending[strongest.url] = strongest
+        return pending
+
+    def _match(self, manifest: Sidecar, listed: Dict[str, Dict[str, str]]) -> None:
+        by_url = {urljoin(manifest.url, path): digests for path, digests in listed.items()}
+        names: Dict[str, List[Dict[str, str]]] = {}
+        for path, digests in listed.items():
+            names.setdefault(posixpath.basename(path), []).append(digests)
+        for record in self.artifacts:
+            url = record.get(self.url_key)
+            digests = by_url.get(url)
+            if digests is None:
+                candidates = names.get(file_name(url or ""), [])
+                digests = candidates[0] if len(candidates) == 1 else None
+            if digests:
+                self.found.setdefault(url, {}).update(digests)
+
+    def result(self) -> List[Dict[str, Any]]:
+        for record in self.artifacts:
+            url = record.get(self.url_key)
+            if url in self.found:
+                record["checksums"] = dict(sorted(self.found[url].items(), key=lambda item: _rank(item[0])))
+            if url in self.signatures:
+                record["signature"] = self.signatures[url]
+        logger.debug(f"Harvested digests for {len(self.found)} of {len(self.artifacts)} artifacts "
+                     f"in {self.requests} requests")
+        return self.artifacts
+
+
+def _rank(algorithm: Optional[str]) -> int:
+    return ALGORITHMS.index(algorithm) if algorithm in ALGORITHMS else len(ALGORITHMS)
+
+
+def _body(response) -> Optional[str]:
+    if response is None or isinstance(response, Exception) or not response.ok:
+        return None
+    return response.text
+
+
+def harvest(records: List[Dict[str, Any]], extra: Iterable[str] = (), url_key: str = "url", client=None,
+            **kwargs) -> List[Dict[str, Any]]:
+    """Fold checksum and signature files into the artifact records they describe.
+
+    ``records`` is a scraper's list of files; entries that are sidecars
+    (``.sha256``, ``.asc``, ``SHA256SUMS``, ...) are dropped from the
+    returned list and their content lands on the matching artifact as
+    ``checksums`` (algorithm -> hex digest) and ``signature`` (URL).
+    ``extra`` adds manifest URLs the records don't list. Sidecars are
+    fetched concurrently, at most two rounds: manifests, then the
+    single-file digests manifests didn't cover.
+    """
+    from common.http import get_client
+
+    client = client or get_client()
+    kwargs.setdefault("timeout", 10)
+    state = _Harvest(records, url_key, extra)
+
+    def fetch(url: str) -> Optional[str]:
+        try:
+            return _body(client.get(url, **kwargs))
+        except Exception as e:
+            logger.debug(f"Fetching {url} failed: {e}")
+            return None
+
+    sidecars = state.first()
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        while True:
+            bodies = dict(zip(sidecars, pool.map(fetch, sidecars)))
+            sidecars = state.feed(sidecars, bodies)
+            if not sidecars:
+                break
+    return state.result()
+
+
+async def aharvest(ctx, records: List[Dict[str, Any]], extra: Iterable[str] = (), url_key: str = "url",
+                   **kwargs) -> List[Dict[str, Any]]:
+    """Coroutine counterpart of harvest(), fetching through ``ctx``."""
+    state = _Harvest(records, url_key, extra)
+    sidecars = state.first()
+    while True:
+        responses = await ctx.fetch_all(list(sidecars), **kwargs) if sidecars else []
+        sidecars = state.feed(sidecars, dict(zip(sidecars, map(_body, responses))))
+        if not sidecars:
+            break
+    return state.result()
@@ -0,0 +1,110 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from common.autoindex import Entry, listing
+
+DEFAULT_CONCURRENCY = 8  # directory listings in flight per crawl
+
+
+@dataclass
+class CrawlEntry:
+    """A file or directory met while crawling, with where it was found."""
+    root: str  # the crawl root it was found under
+    url: str
+    entry: Entry
+    path: Tuple[str, ...]  # directory names between the root and the entry
+    order: Tuple[int, ...]  # listing positions along the way; sorting by it gives listing order
+
+    @property
+    def name(self) -> str:
+        return self.entry.name
+
+    @property
+    def depth(self) -> int:
+        """0 for entries of the root listing itself."""
+        return len(self.path)
+
+
+class MirrorCrawler:
+    """Walks autoindex directory trees, listing sibling directories concurrently.
+
+    Every directory found at one level is fetched at once (up to
+    ``concurrency`` listings in flight), so a crawl costs about one round trip
+    per level rather than one per directory. ``include_dir`` decides which
+    directories to descend into and ``include_file`` which files to report;
+    both get the CrawlEntry. Directories are listed down to ``max_depth``
+    (0 lists only the roots). Listings that fail are recorded in ``errors``
+    and the rest of the crawl carries on.
+    """
+
+    def __init__(self, ctx, max_depth: int = 1, include_dir: Optional[Callable[[CrawlEntry], bool]] = None,
+                 include_file: Optional[Callable[[CrawlEntry], bool]] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, **fetch_kwargs: Any):
+        self.ctx = ctx
+        self.max_depth = max_depth
+        self.include_dir = include_dir
+        self.include_file = include_file
+        self.concurrency = concurrency
+        self.fetch_kwargs = fetch_kwargs
+        self.errors: Dict[str, Exception] = {}
+        self.listings = 0
+
+    async def _list(self, url: str, slots: asyncio.Semaphore) -> List[Entry]:
+        async with slots:
+            response = await self.ctx.fetch(url, **self.fetch_kwargs)
+            response.raise_for_status()
+            self.listings += 1
+            return listing(response, url)
+
+    async def walk(self, *roots: str) -> AsyncIterator[CrawlEntry]:
+        """Yield files as their directory listings arrive (in no particular order)."""
+        slots = asyncio.Semaphore(self.concurrency)
+        found: asyncio.Queue = asyncio.Queue()
+        tasks = set()
+
+        def visit(root: str, url: str, path: Tuple[str, ...], order: Tuple[int, ...]) -> None:
+            task = asyncio.ensure_future(self._visit(root, url, path, order, slots, found, visit))
+            tasks.add(task)
+            task.add_done_callback(lambda t: found.put_nowait(None))
+
+        for index, root in enumerate(roots):
+            visit(root, root, (), (index,))
+        pending = len(tasks)
+        try:
+            while pending:
+                item = await found.get()
+                if item is None:
+                    pending -= 1
+                elif isinstance(item, int):
+                    pending += item
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _visit(self, root, url, path, order, slots, found, visit) -> None:
+        try:
+            entries = await self._list(url, slots)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.errors[url] = e
+            return
+        children = []
+        for position, entry in enumerate(entries):
+            item = CrawlEntry(root, entry.url(url), entry, path, order + (position,))
+            if entry.is_dir:
+                if len(path) < self.max_depth and (self.include_dir is None or self.include_dir(item)):
+                    children.append(item)
+            elif self.include_file is None or self.include_file(item):
+                found.put_nowait(item)
+        # Announce the subdirectories before this visit counts as done, so the walk can't end early
+        found.put_nowait(len(children))
+        for item in children:
+            visit(root, item.url, path + (item.name,), item.order)
+
+    async def collect(self, *roots: str) -> List[CrawlEntry]:
+        """All files under ``roots``, in listing order."""
+        return sorted([item async for item in self.walk(*roots)], key=lambda item: item.order)
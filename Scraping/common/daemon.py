@@ -0,0 +1,198 @@
+import asyncio
+import collections
+import contextlib
+import logging
+import signal
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from common.cron import CronSchedule
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 6 * 3600  # seconds, for scrapers with neither interval nor cron
+CONFIG_POLL_INTERVAL = 5.0  # seconds between checks of the config file's mtime
+
+
+class _Lanes:
+    """A semaphore whose size can change while it is held.
+
+    Growing admits waiters at once; shrinking takes effect as holders leave,
+    so the limit is never exceeded across a config reload.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.held = 0
+        self._waiters: collections.deque = collections.deque()
+
+    def resize(self, size: int) -> None:
+        self.size = size
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self.size - self.held
+        for waiter in self._waiters:
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def __aenter__(self) -> "_Lanes":
+        while self.held >= self.size:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()  # pass the lane we were given on to the next waiter
+                raise
+            finally:
+                self._waiters.remove(waiter)
+        self.held += 1
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.held -= 1
+        self._wake()
+
+
+class ScraperDaemon:
+    """Keeps one orchestrator resident and runs each scraper on its own schedule.
+
+    Connection pools, the DNS cache and compiled scrapers stay warm between
+    runs. The config file is re-read when its mtime changes; SIGTERM/SIGINT
+    stop new runs, let the in-flight ones finish and then close the clients.
+    """
+
+    def __init__(self, orchestrator, max_concurrent: int = 3, default_interval: float = DEFAULT_INTERVAL):
+        self.orchestrator = orchestrator
+        self.max_concurrent = max_concurrent
+        self.default_interval = default_interval
+        self.next_due: Dict[str, float] = {}  # epoch seconds
+        self.last_run: Dict[str, float] = {}
+        self.in_flight: Dict[str, asyncio.Task] = {}
+        self._started: Set[str] = set()  # in flight and past the concurrency slots
+        self._stop: Optional[asyncio.Event] = None
+        self._config_mtime = self._read_config_mtime()
+        # Kept for the daemon's lifetime: runs in flight across a config reload hold these same lanes
+        self._site_lanes: Dict[str, _Lanes] = {}  # max_concurrent scrapers per site
+        self._global_lanes = _Lanes(1)
+
+    def _read_config_mtime(self) -> Optional[float]:
+        config_file = self.orchestrator.config_file
+        try:
+            return Path(config_file).stat().st_mtime if config_file else None
+        except OSError:
+            return None
+
+    def next_run(self, name: str, after: float) -> float:
+        """When ``name`` is next due after a run at ``after``; never in the past.
+
+        A cron expression that can't be evaluated falls back to the interval.
+        """
+        config = self.orchestrator.scrapers.get(name)
+        interval = (config.interval if config is not None else None) or self.default_interval
+        if config is not None and config.cron:
+            try:
+                due = CronSchedule(config.cron).next_after(datetime.fromtimestamp(after)).timestamp()
+                return max(due, time.time())
+            except ValueError as e:
+                logger.error(f"{name}: invalid cron schedule, running every {interval}s instead: {e}")
+        return max(after + interval, time.time())
+
+    def _enabled(self):
+        return [name for name, config in self.orchestrator.scrapers.items() if config.enabled]
+
+    def _reschedule(self) -> None:
+        """Match the schedule to the current config: new scrapers are due now, removed ones are dropped."""
+        enabled = self._enabled()
+        now = time.time()
+        for name in enabled:
+            self.next_due.setdefault(name, now)
+        for name in set(self.next_due) - set(enabled):
+            del self.next_due[name]
+        _, _, _, parallelism = self.orchestrator.group_slots(enabled, self.max_concurrent)
+        self._global_lanes.resize(parallelism)
+
+    def _check_config(self) -> None:
+        mtime = self._read_config_mtime()
+        if mtime == self._config_mtime:
+            return
+        self._config_mtime = mtime
+        changed = self.orchestrator.reload_config()
+        now = time.time()
+        for name in changed:
+            # A changed schedule counts from the last run rather than waiting out the old one
+            if name in self.next_due and name not in self.in_flight:
+                self.next_due[name] = self.next_run(name, self.last_run[name]) if name in self.last_run else now
+        logger.info(f"Config reloaded, {len(changed)} scrapers changed")
+        self._reschedule()
+
+    async def _run_one(self, name: str) -> None:
+        try:
+            async with contextlib.AsyncExitStack() as lanes:
+                # Sites in sorted order, then the global lane: one acquisition order, so no deadlock
+                config = self.orchestrator.scrapers.get(name)  # None if a reload removed it meanwhile
+                for host in sorted(set(config.hosts if config else ())):
+                    lane = self._site_lanes.setdefault(host, _Lanes(self.max_concurrent))
+                    await lanes.enter_async_context(lane)
+                await lanes.enter_async_context(self._global_lanes)
+                self._started.add(name)
+                await self.orchestrator.run_scraper(name)
+                await self.orchestrator.verify_links([name])
+        finally:
+            self._started.discard(name)
+            self.in_flight.pop(name, None)
+            self.last_run[name] = time.time()
+            if name in self.next_due:
+                self.next_due[name] = self.next_run(name, self.last_run[name])
+                logger.info(f"{name} next due at {datetime.fromtimestamp(self.next_due[name]):%Y-%m-%d %H:%M:%S}")
+            self.orchestrator.save_statistics()
+
+    def stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # Windows, or not the main thread: rely on KeyboardInterrupt / stop()
+
+        self._reschedule()
+        logger.info(f"Daemon started with {len(self.next_due)} scheduled scrapers")
+        last_config_check = time.monotonic()
+        while not self._stop.is_set():
+            if time.monotonic() - last_config_check >= CONFIG_POLL_INTERVAL:
+                self._check_config()
+                last_config_check = time.monotonic()
+
+            now = time.time()
+            for name, due in list(self.next_due.items()):
+                if due <= now and name not in self.in_flight:
+                    self.in_flight[name] = asyncio.create_task(self._run_one(name), name=f"scrape-{name}")
+
+            upcoming = [due for name, due in self.next_due.items() if name not in self.in_flight]
+            wait = min([CONFIG_POLL_INTERVAL] + [due - now for due in upcoming])
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=max(wait, 0.05))
+            except asyncio.TimeoutError:
+                pass
+
+        # Drain: runs already holding a slot finish; queued ones never start
+        for name, task in list(self.in_flight.items()):
+            if name not in self._started:
+                task.cancel()
+        if self.in_flight:
+            logger.info(f"Shutting down, waiting for {len(self._started)} in-flight scrapers")
+            await asyncio.gather(*self.in_flight.values(), return_exceptions=True)
+        await self.orchestrator.close()
+        logger.info("Daemon stopped")
@@ -0,0 +1,515 @@
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+from common.scheduler import site_of
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE = Path(__file__).resolve().parents[1] / ".cache" / "artifacts"
+CHUNK_SIZE = 256 * 1024
+SEGMENT_SIZE = 8 * 1024 * 1024  # smallest Range segment; smaller files come in one piece
+MAX_SEGMENTS = 4  # Range requests per file
+MAX_CONNECTIONS = 8  # transfers in flight across all hosts
+HOST_CONNECTIONS = 4  # ...and per host
+MAX_ATTEMPTS = 3  # per segment; each retry resumes where the last one stopped
+CHECKPOINT_BYTES = 4 * 1024 * 1024  # progress is saved this often, so an interrupted file resumes near where it stopped
+
+# Download.status
+DOWNLOADED = "downloaded"
+STORED = "stored"  # already in the store and unchanged on the server; nothing fetched
+DEDUPLICATED = "deduplicated"  # fetched, but identical content was already stored for another URL
+FAILED = "failed"
+
+
+class DownloadError(Exception):
+    pass
+
+
+class _Restart(Exception):
+    """The server answered a Range request with the whole file: it changed, or ignores ranges."""
+
+
+@dataclass
+class Artifact:
+    """A file a scraper found, as far as the downloader cares."""
+    url: str
+    name: str
+    version: Optional[str] = None
+    platform: Optional[str] = None
+    sha256: Optional[str] = None  # expected digest, from the record's harvested checksums
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], key: str = "url") -> "Artifact":
+        url = record[key]
+        name = record.get("file_name") or record.get("text") or unquote(posixpath.basename(urlsplit(url).path)) or url
+        version = record.get("version") or record.get("latest_version")
+        platform = record.get("platform") or record.get("os")
+        return cls(url, str(name), str(version) if version else None, platform,
+                   (record.get("checksums") or {}).get("sha256"))
+
+
+def artifacts_in(outputs: Iterable[Any]) -> List[Artifact]:
+    """Every downloadable file in scraper outputs, once per URL."""
+    from common.verify import URL_KEYS, iter_links
+
+    found: Dict[str, Artifact] = {}
+    for output in outputs:
+        for holder, key, url in iter_links(output):
+            if url not in found:
+                # A {platform: url} map (Fiddler's platforms) names the platform, not the file
+                found[url] = (Artifact.from_record(holder, key) if key in URL_KEYS
+                              else Artifact.from_record({"url": url, "platform": key}))
+    return list(found.values())
+
+
+@dataclass
+class Download:
+    artifact: Artifact
+    status: str = FAILED
+    sha256: Optional[str] = None
+    size: Optional[int] = None
+    path: Optional[Path] = None  # the stored object
+    segments: int = 0
+    resumed_bytes: int = 0  # already on disk from an interrupted earlier attempt
+    reread_bytes: int = 0  # hashed from the part file rather than as they arrived
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class Bandwidth:
+    """Token bucket in bytes per second, shared by the transfers it caps; no rate means no cap."""
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst or (rate or 0) / 4 or CHUNK_SIZE
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: int) -> None:
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+class _Digest:
+    """SHA-256 of a file written out of order, advanced as its prefix fills in.
+
+    Bytes written at the front of the prefix are hashed from memory as they
+    arrive; bytes other segments wrote further ahead are hashed from the part
+    file (still in the page cache) as soon as the prefix reaches them, so
+    the digest is ready when the last byte lands.
+    """
+
+    def __init__(self, fd: int):
+        self.fd = fd
+        self.sha = hashlib.sha256()
+        self.frontier = 0
+        self.ahead: Dict[int, int] = {}  # offset -> length written beyond the frontier
+        self.reread = 0
+        self._lock = threading.Lock()
+
+    def wrote(self, offset: int, data: bytes) -> None:
+        with self._lock:
+            if offset != self.frontier:
+                self.ahead[offset] = len(data)
+                return
+            self.sha.update(data)
+            self.frontier += len(data)
+            self._catch_up()
+
+    def catch_up(self) -> None:
+        with self._lock:
+            self._catch_up()
+
+    def _catch_up(self) -> None:
+        while self.frontier in self.ahead:
+            length = self.ahead.pop(self.frontier)
+            while length:
+                data = os.pread(self.fd, min(length, CHUNK_SIZE), self.frontier)
+                if not data:
+                    raise DownloadError(f"Part file ended at {self.frontier}")
+                self.sha.update(data)
+                self.frontier += len(data)
+                self.reread += len(data)
+                length -= len(data)
+
+    def finish(self) -> str:
+        with self._lock:
+            self._catch_up()
+            return self.sha.hexdigest()
+
+
+@dataclass
+class _Segment:
+    start: int
+    end: Optional[int]  # exclusive; None while the size is unknown
+    done: int = 0
+
+    @property
+    def offset(self) -> int:
+        return self.start + self.done
+
+    @property
+    def complete(self) -> bool:
+        return self.end is not None and self.offset >= self.end
+
+
+@dataclass
+class _Plan:
+    """What a HEAD said about a file."""
+    size: Optional[int]
+    ranges: bool
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def validator(self) -> Optional[str]:
+        # If-Range only accepts strong ETags
+        if self.etag and not self.etag.startswith("W/"):
+            return self.etag
+        return self.last_modified
+
+
+class _Transfer:
+    """One file being fetched into its part file, with the progress needed to resume it."""
+
+    def __init__(self, store: "ArtifactStore", url: str, plan: _Plan, max_segments: int = MAX_SEGMENTS):
+        self.url = url
+        self.plan = plan
+        self.max_segments = max_segments
+        self.part, self.state = store.partial(url)
+        self.part.parent.mkdir(parents=True, exist_ok=True)
+        self.segments = self._resume() or self._split()
+        self.resumed = sum(segment.done for segment in self.segments)
+        if not self.resumed:
+            self.part.unlink(missing_ok=True)
+        self.fd = os.open(self.part, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        self.digest = _Digest(self.fd)
+        for segment in self.segments:
+            if segment.done:
+                self.digest.ahead[segment.start] = segment.done
+        self.digest.catch_up()  # bytes from an earlier run are hashed from disk once, up front
+        self._lock = threading.Lock()
+        self._unsaved = 0
+
+    def _split(self) -> List[_Segment]:
+        size = self.plan.size
+        if not size or not self.plan.ranges or size < 2 * SEGMENT_SIZE or self.max_segments < 2:
+            return [_Segment(0, size)]
+        count = min(self.max_segments, size // SEGMENT_SIZE)
+        bounds = [size * i // count for i in range(count + 1)]
+        return [_Segment(start, end) for start, end in zip(bounds, bounds[1:])]
+
+    def _resume(self) -> Optional[List[_Segment]]:
+        try:
+            state = json.loads(self.state.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        same = (state.get("url") == self.url and state.get("size") == self.plan.size
+                and state.get("validator") == self.plan.validator and self.plan.validator and self.plan.ranges)
+        if not same or not self.part.exists():
+            return None
+        return [_Segment(*segment) for segment in state["segments"]]
+
+    def wrote(self, segment: _Segment, data: bytes) -> None:
+        os.pwrite(self.fd, data, segment.offset)
+        self.digest.wrote(segment.offset, data)
+        with self._lock:
+            segment.done += len(data)
+            self._unsaved += len(data)
+            if self._unsaved < CHECKPOINT_BYTES:
+                return
+            self._unsaved = 0
+        self.checkpoint()
+
+    def checkpoint(self) -> None:
+        with self._lock:
+            state = {"url": self.url, "size": self.plan.size, "validator": self.plan.validator,
+                     "segments": [[s.start, s.end, s.done] for s in self.segments]}
+        tmp = self.state.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.state)
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+    def discard(self) -> None:
+        for path in (self.part, self.state):
+            path.unlink(missing_ok=True)
+
+
+class ArtifactStore:
+    """Content-addressed files: objects/<2 hex>/<sha256>, plus an index of which URL holds which digest.
+
+    Identical files published under different names or URLs (per-locale
+    builds, mirrors, ``latest`` aliases) are stored once.
+    """
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_STORE):
+        self.root = Path(root)
+        self.index_path = self.root / "index.json"
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # one save at a time, so the newest snapshot is the one kept
+        try:
+            self.index: Dict[str, Dict[str, Any]] = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.index = {}
+
+    def partial(self, url: str) -> Tuple[Path, Path]:
+        """Part file and progress file of an unfinished download of ``url``."""
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.root / "partial" / f"{key}.part", self.root / "partial" / f"{key}.json"
+
+    def object_path(self, sha256: str) -> Path:
+        return self.root / "objects" / sha256[:2] / sha256
+
+    def has(self, sha256: Optional[str]) -> bool:
+        return bool(sha256) and self.object_path(sha256).exists()
+
+    def entry(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.index.get(url)
+
+    def put(self, part: Path, sha256: str) -> bool:
+        """Move ``part`` into the store; False (and ``part`` removed) if the content was already there."""
+        target = self.object_path(sha256)
+        if target.exists():
+            part.unlink(missing_ok=True)
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(part, target)
+        return True
+
+    def record(self, artifact: Artifact, sha256: str, size: int, plan: Optional[_Plan]) -> None:
+        with self._lock:
+            self.index[artifact.url] = {
+                "sha256": sha256, "size": size, "name": artifact.name, "version": artifact.version,
+                "platform": artifact.platform, "etag": plan.etag if plan else None,
+                "last_modified": plan.last_modified if plan else None, "stored_at": time.time(),
+            }
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._save_lock:
+            with self._lock:
+                data = json.dumps(self.index, indent=1)
+            fd, tmp = tempfile.mkstemp(dir=self.root, prefix=f"{self.index_path.stem}.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self.index_path)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            digests = {entry["sha256"] for entry in self.index.values()}
+        return {"urls": len(self.index), "objects": len(digests)}
+
+
+class Downloader:
+    """Fetches artifacts in parallel Range segments into an ArtifactStore.
+
+    Requests go through the shared client, so the HostScheduler paces them
+    like any other; on top of that, ``connections``/``per_host`` cap the
+    transfers in flight and ``bandwidth``/``host_bandwidth`` (bytes per
+    second) cap their throughput. Interrupted files resume from their part
+    file, guarded by If-Range so a changed file starts over.
+    """
+
+    def __init__(self, store: Optional[ArtifactStore] = None, client=None, connections: int = MAX_CONNECTIONS,
+                 per_host: int = HOST_CONNECTIONS, bandwidth: Optional[float] = None,
+                 host_bandwidth: Optional[float] = None, segments: int = MAX_SEGMENTS, timeout: float = 30):
+        self.store = store or ArtifactStore()
+        self._client = client
+        self.connections = connections
+        self.per_host = per_host
+        self.segments = segments
+        self.timeout = timeout
+        self.bandwidth = Bandwidth(bandwidth)
+        self.host_bandwidth = host_bandwidth
+        self._hosts: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_bandwidth: Dict[str, Bandwidth] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        from common.http import get_client
+        return self._client or get_client()
+
+    def _host(self, url: str):
+        site = site_of(url)
+        with self._lock:
+            if site not in self._hosts:
+                self._hosts[site] = threading.BoundedSemaphore(self.per_host)
+                self._host_bandwidth[site] = Bandwidth(self.host_bandwidth)
+            return self._hosts[site], self._host_bandwidth[site]
+
+    def _plan(self, url: str) -> _Plan:
+        response = self.client.request("HEAD", url, allow_redirects=True, timeout=self.timeout)
+        if response.status_code >= 400:
+            raise DownloadError(f"HEAD {url}: {response.status_code}")
+        try:
+            size = int(response.headers.get("Content-Length"))
+        except (TypeError, ValueError):
+            size = None
+        ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+        return _Plan(size, ranges, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+    def _fetch(self, transfer: _Transfer, segment: _Segment) -> None:
+        slot, host_bandwidth = self._host(transfer.url)
+        headers = {}
+        if segment.offset or segment.end != transfer.plan.size:
+            end = "" if segment.end is None else segment.end - 1
+            headers["Range"] = f"bytes={segment.offset}-{end}"
+            if transfer.plan.validator:
+                headers["If-Range"] = transfer.plan.validator
+        with slot:
+            response = self.client.request("GET", transfer.url, headers=headers, stream=True, timeout=self.timeout)
+            try:
+                if headers and response.status_code == 200:
+                    raise _Restart(transfer.url)
+                response.raise_for_status()
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    if segment.end is not None:
+                        chunk = chunk[:segment.end - segment.offset]
+                    if not chunk:
+                        break
+                    self.bandwidth.consume(len(chunk))
+                    host_bandwidth.consume(len(chunk))
+                    transfer.wrote(segment, chunk)
+                    if segment.complete:
+                        break
+            finally:
+                response.close()
+        if segment.end is None:
+            segment.end = segment.offset  # size unknown up front: the stream's end is the file's end
+        elif not segment.complete:
+            raise DownloadError(f"{transfer.url} ended at byte {segment.offset} of {segment.end}")
+
+    def _fetch_segment(self, transfer: _Transfer, segment: _Segment) -> None:
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                return self._fetch(transfer, segment)
+            except _Restart:
+                raise
+            except Exception as e:
+                if attempt == MAX_ATTEMPTS or segment.end is None:
+                    raise
+                logger.warning(f"Segment {segment.start}-{segment.end} of {transfer.url} failed "
+                               f"(attempt {attempt}), resuming at {segment.offset}: {e}")
+                transfer.checkpoint()
+
+    def _transfer(self, pool: ThreadPoolExecutor, artifact: Artifact, plan: _Plan, result: Download) -> str:
+        transfer = _Transfer(self.store, artifact.url, plan, self.segments)
+        result.segments, result.resumed_bytes = len(transfer.segments), transfer.resumed
+        try:
+            futures = [pool.submit(self._fetch_segment, transfer, segment)
+                       for segment in transfer.segments if not segment.complete]
+            errors = [future.exception() for future in futures]
+            error = next((e for e in errors if isinstance(e, _Restart)), None) or next(filter(None, errors), None)
+            if error is not None:
+                if not isinstance(error, _Restart):
+                    transfer.checkpoint()  # keep what arrived for the next run
+                raise error
+            sha256 = transfer.digest.finish()
+            result.reread_bytes = transfer.digest.reread
+            result.size = transfer.digest.frontier
+        finally:
+            transfer.close()
+        if plan.size is not None and result.size != plan.size:
+            transfer.discard()
+            raise DownloadError(f"{artifact.url}: got {result.size} bytes, expected {plan.size}")
+        if artifact.sha256 and sha256 != artifact.sha256.lower():
+            transfer.discard()
+            raise DownloadError(f"{artifact.url}: SHA-256 {sha256} doesn't match the published {artifact.sha256}")
+        stored = self.store.put(transfer.part, sha256)
+        transfer.state.unlink(missing_ok=True)
+        result.sha256 = sha256
+        return DOWNLOADED if stored else DEDUPLICATED
+
+    def download(self, pool: ThreadPoolExecutor, artifact: Artifact) -> Download:
+        """Fetch one artifact into the store, with its segments on ``pool``."""
+        result = Download(artifact)
+        started = time.monotonic()
+        try:
+            if self.store.has(artifact.sha256):
+                # Published digest already in the store: nothing to fetch
+                result.status, result.sha256 = STORED, artifact.sha256.lower()
+                entry = self.store.entry(artifact.url)
+                result.size = self.store.object_path(result.sha256).stat().st_size
+                if entry is None or entry["sha256"] != result.sha256:
+                    self.store.record(artifact, result.sha256, result.size, None)
+            else:
+                plan = self._plan(artifact.url)
+                entry = self.store.entry(artifact.url)
+                if (entry is not None and self.store.has(entry["sha256"]) and entry["size"] == plan.size
+                        and (plan.etag or plan.last_modified)
+                        and (entry.get("etag"), entry.get("last_modified")) == (plan.etag, plan.last_modified)):
+                    result.status, result.sha256, result.size = STORED, entry["sha256"], entry["size"]
+                else:
+                    try:
+                        result.status = self._transfer(pool, artifact, plan, result)
+                    except _Restart:
+                        logger.info(f"{artifact.url} changed or ignores ranges; fetching it whole")
+                        for path in self.store.partial(artifact.url):
+                            path.unlink(missing_ok=True)
+                        plan = self._plan(artifact.url)
+                        plan.ranges = False
+                        result.status = self._transfer(pool, artifact, plan, result)
+                    self.store.record(artifact, result.sha256, result.size, plan)
+            result.path = self.store.object_path(result.sha256)
+        except Exception as e:
+            result.status, result.error = FAILED, str(e) or type(e).__name__
+            logger.error(f"Download of {artifact.url} failed: {result.error}")
+        result.seconds = time.monotonic() - started
+        return result
+
+    def download_all(self, artifacts: Iterable[Artifact]) -> List[Download]:
+        """Download ``artifacts`` (once per URL) concurrently; the index is saved at the end."""
+        artifacts = list({artifact.url: artifact for artifact in artifacts}.values())
+        if not artifacts:
+            return []
+        # Files wait on their segments, so they run on their own threads; segments are the transfers
+        with ThreadPoolExecutor(max_workers=self.connections, thread_name_prefix="segment") as segments, \
+                ThreadPoolExecutor(max_workers=self.connections, thread_name_prefix="artifact") as files:
+            results = list(files.map(lambda artifact: self.download(segments, artifact), artifacts))
+        self.store.save()
+        return results
+
+
+def summary(results: List[Download]) -> Dict[str, Any]:
+    """Totals of a download_all() run, for logs and the CLI."""
+    by_status: Dict[str, int] = {}
+    for result in results:
+        by_status[result.status] = by_status.get(result.status, 0) + 1
+    fetched = [r for r in results if r.status in (DOWNLOADED, DEDUPLICATED)]
+    return {
+        "files": len(results), **by_status,
+        "bytes": sum(r.size or 0 for r in fetched),
+        "resumed_bytes": sum(r.resumed_bytes for r in fetched),
+        "reread_bytes": sum(r.reread_bytes for r in fetched),
+        "failed_urls": [r.artifact.url for r in results if r.status == FAILED],
+    }
+
+
+def download_report(result: Download) -> Dict[str, Any]:
+    report = asdict(result)
+    report["path"] = str(result.path) if result.path else None
+    return report
@@ -0,0 +1,480 @@
+import asyncio
+import inspect
+import json
+import os
+import re
+import ssl
+import zlib
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+from urllib.request import getproxies
+
+import certifi
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_environ_proxies, select_proxy
+
+from common.cache import CacheEntry, HttpCache
+from common.http import DEFAULT_TIMEOUT, TrafficRecorder, install_dns_cache, request_key
+from common.memo import FETCHED, MEMOIZED, MemoPage, PageMemo, memo_key
+from common.mirrors import MirrorRouter
+from common.scheduler import HostScheduler
+
+DEFAULT_USER_AGENT = "Mozilla/5.0"
+MAX_REDIRECTS = 10
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+
+
+class FetchError(Exception):
+    """Transport-level failure while talking to a server."""
+
+
+class HTTPStatusError(FetchError):
+    """Raised by FetchResult.raise_for_status() for 4xx/5xx answers."""
+
+    def __init__(self, message: str, result: "FetchResult"):
+        super().__init__(message)
+        self.result = result
+
+
+class Headers(dict):
+    """Response headers with case-insensitive lookup (keys stored lower-case)."""
+
+    def __getitem__(self, key: str) -> str:
+        return super().__getitem__(key.lower())
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and super().__contains__(key.lower())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return super().get(key.lower(), default)
+
+
+class FetchResult:
+    """Response of an async fetch, shaped like the parts of requests.Response scrapers use."""
+
+    def __init__(self, url: str, status_code: int, reason: str, headers: Headers, content: bytes,
+                 from_cache: bool = False, not_modified: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.from_cache = from_cache
+        self.not_modified = not_modified
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def encoding(self) -> str:
+        match = _CHARSET_RE.search(self.headers.get("content-type", ""))
+        return match.group(1) if match else "utf-8"
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.content.decode(self.encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise HTTPStatusError(f"{self.status_code} {self.reason} for url: {self.url}", self)
+
+    @classmethod
+    def from_cache_entry(cls, entry: CacheEntry) -> "FetchResult":
+        headers = Headers((k.lower(), v) for k, v in entry.headers.items())
+        return cls(entry.final_url, entry.status, HTTPStatus(entry.status).phrase, headers, entry.body,
+                   from_cache=True, not_modified=True)
+
+    @classmethod
+    def from_page(cls, page: MemoPage) -> "FetchResult":
+        headers = Headers((k.lower(), v) for k, v in page.headers.items())
+        return cls(page.final_url, page.status, page.reason, headers, page.content,
+                   from_cache=True, not_modified=page.not_modified)
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @property
+    def usable(self) -> bool:
+        return not self.writer.is_closing() and not self.reader.at_eof()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class AsyncHttpClient:
+    """Minimal HTTP/1.1 client on asyncio streams with per-host keep-alive pools.
+
+    Every in-flight request is a coroutine on the orchestrator's event loop, so
+    crawling scrapers can keep hundreds of requests open without holding
+    executor threads. Shares the conditional-GET cache, traffic counters,
+    per-host scheduler, per-run page memo and mirror router with the
+    synchronous HttpClient, and trusts the same CA bundle. Requests that
+    HTTP(S)_PROXY sends through a proxy are made with requests instead.
+    """
+
+    def __init__(self, max_per_host: int = 8, timeout: float = DEFAULT_TIMEOUT,
+                 cache: Optional[HttpCache] = None, recorder: Optional[TrafficRecorder] = None,
+                 scheduler: Optional[HostScheduler] = None, memo: Optional[PageMemo] = None,
+                 mirrors: Optional[MirrorRouter] = None):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.cache = cache
+        self.scheduler = scheduler
+        self.memo = memo
+        self.mirrors = mirrors
+        self.recorder = recorder or TrafficRecorder()
+        self._idle: Dict[Tuple[str, str, int, bool], List[_Connection]] = {}
+        self._slots: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ssl_verified = ssl.create_default_context(cafile=os.environ.get("REQUESTS_CA_BUNDLE") or certifi.where())
+        self._proxies = getproxies()  # from the environment, like requests; NO_PROXY is checked per URL
+        self._session: Optional[requests.Session] = None  # for proxied requests, made on first use
+        self._ssl_unverified = ssl.create_default_context()
+        self._ssl_unverified.check_hostname = False
+        self._ssl_unverified.verify_mode = ssl.CERT_NONE
+        install_dns_cache()
+
+    def _bind_loop(self) -> None:
+        # Pools and semaphores belong to one event loop; start fresh if it changed
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._idle.clear()
+            self._slots.clear()
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None, use_cache: bool = True,
+                    **kwargs) -> FetchResult:
+        """GET ``url``, revalidating against the shared on-disk cache.
+
+        With a memo, concurrent and repeated GETs of ``url`` within the run
+        share one request, including ones made through the sync client.
+        """
+        if not use_cache:
+            return await self.request("GET", url, headers=headers, **kwargs)
+        key = request_key(url)  # as the sync client keys it, so the two share cache entries and pages
+        if self.memo is None:
+            return await self._fetch(key, url, headers, **kwargs)
+
+        result, page, how = await self.memo.aonce(
+            memo_key(key, headers, kwargs.get("allow_redirects", True)),
+            lambda: self._fetch(key, url, headers, **kwargs),
+        )
+        if how != FETCHED:
+            self.recorder.record("memo_hits" if how == MEMOIZED else "coalesced")
+            result = FetchResult.from_page(page)
+        result.memo, result.memo_page = self.memo, page
+        return result
+
+    async def _fetch(self, key: str, url: str, headers: Optional[Dict[str, str]], **kwargs) -> FetchResult:
+        if self.cache is None:
+            return await self.request("GET", url, headers=headers, **kwargs)
+
+        entry = self.cache.get(key)
+        if entry is not None and entry.is_negative:
+            self.recorder.record("cache_hits")
+            return FetchResult.from_cache_entry(entry)
+
+        if entry is not None:
+            headers = {**entry.conditional_headers(), **(headers or {})}
+        result = await self.request("GET", url, headers=headers, **kwargs)
+
+        if result.status_code == 304 and entry is not None:
+            self.cache.touch(key, result)
+            self.recorder.record("cache_revalidated")
+            return FetchResult.from_cache_entry(entry)
+
+        self.cache.store(key, result)
+        self.recorder.record("cache_misses")
+        return result
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      body: Optional[bytes] = None, allow_redirects: bool = True,
+                      timeout: Optional[float] = None, verify: bool = True, route: bool = True,
+                      headers_only: bool = False) -> FetchResult:
+        """Send one request; URLs on a mirror network go to its fastest mirror unless ``route`` is False.
+
+        With ``headers_only`` the response body is never read: the result has
+        empty content and its connection is closed instead of reused.
+        """
+        self._bind_loop()
+        timeout = self.timeout if timeout is None else timeout
+
+        async def send(target: str) -> FetchResult:
+            try:
+                return await self._request_following(method, target, headers or {}, body, allow_redirects, verify,
+                                                     timeout, headers_only)
+            except asyncio.TimeoutError:
+                raise FetchError(f"Timed out after {timeout}s fetching {target}") from None
+
+        if self.mirrors is None or not route:
+            return await send(url)
+        return await self.mirrors.acall(url, send)
+
+    async def _request_following(self, method, url, headers, body, allow_redirects, verify, timeout,
+                                 headers_only=False) -> FetchResult:
+        for _ in range(MAX_REDIRECTS + 1):
+            result = await self._send(method, url, headers, body, verify, timeout, headers_only)
+            location = result.headers.get("location")
+            if not allow_redirects or result.status_code not in REDIRECT_STATUSES or not location:
+                return result
+            url = urljoin(url, location)
+            if result.status_code == 303 or (result.status_code in (301, 302) and method == "POST"):
+                method, body = "GET", None
+        raise FetchError(f"Too many redirects fetching {url}")
+
+    async def _send(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes],
+                    verify: bool, timeout: float, headers_only: bool = False) -> FetchResult:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise FetchError(f"Unsupported URL scheme: {url}")
+        host = parts.hostname or ""
+        port = parts.port or (443 if scheme == "https" else 80)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        host_header = parts.netloc.rsplit("@", 1)[-1]
+
+        # Case-insensitive, so a caller's "user-agent" replaces the default instead of being sent twice
+        merged = CaseInsensitiveDict({"User-Agent": DEFAULT_USER_AGENT, "Accept": "*/*",
+                                      "Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+        merged.update(headers)
+        proxied = self._proxy_for(url) is not None
+        if not proxied:
+            lines = [f"{method} {target} HTTP/1.1", f"Host: {host_header}"]
+            if body is not None:
+                merged["Content-Length"] = str(len(body))
+            lines.extend(f"{k}: {v}" for k, v in merged.items())
+            payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b"")
+
+        async def exchange() -> FetchResult:
+            if proxied:
+                return await self._send_proxied(method, url, merged, body, verify, timeout, headers_only)
+            return await self._send_pooled(scheme, host, port, payload, method, url, verify, timeout, headers_only)
+
+        if self.scheduler is None:
+            return await exchange()
+        async with self.scheduler.aslot(url) as permit:
+            result = await exchange()
+            permit.status = result.status_code
+            permit.retry_after = result.headers.get("retry-after")
+            permit.headers = result.headers
+        return result
+
+    async def _send_pooled(self, scheme: str, host: str, port: int, payload: bytes, method: str, url: str,
+                           verify: bool, timeout: float, headers_only: bool = False) -> FetchResult:
+        slot_key = (scheme, host, port)
+        slot = self._slots.setdefault(slot_key, asyncio.Semaphore(self.max_per_host))
+        async with slot:
+            # Only the exchange itself is timed: waiting for the scheduler or a connection slot is
+            # this client's own queueing, not a slow server
+            return await asyncio.wait_for(
+                self._roundtrip((scheme, host, port, verify), payload, method, url, headers_only), timeout=timeout
+            )
+
+    def _proxy_for(self, url: str) -> Optional[str]:
+        if not self._proxies:
+            return None
+        return select_proxy(url, get_environ_proxies(url))
+
+    async def _send_proxied(self, method: str, url: str, headers: CaseInsensitiveDict, body: Optional[bytes],
+                            verify: bool, timeout: float, headers_only: bool = False) -> FetchResult:
+        """One request through the environment's proxy, made with requests on a worker thread."""
+        if self._session is None:
+            self._session = requests.Session()
+        self.recorder.record("requests")
+
+        def call() -> FetchResult:
+            response = self._session.request(method, url, headers=dict(headers), data=body, verify=verify,
+                                             timeout=timeout, allow_redirects=False, stream=headers_only)
+            headers_in = Headers((k.lower(), v) for k, v in response.headers.items())
+            if headers_only:
+                response.close()
+                return FetchResult(url, response.status_code, response.reason or "", headers_in, b"")
+            return FetchResult(url, response.status_code, response.reason or "", headers_in, response.content)
+
+        try:
+            return await asyncio.to_thread(call)
+        except requests.Timeout:
+            raise asyncio.TimeoutError() from None
+        except requests.RequestException as e:
+            raise FetchError(f"Request failed for {url}: {e}") from e
+
+    async def _roundtrip(self, pool_key, payload: bytes, method: str, url: str,
+                         headers_only: bool = False) -> FetchResult:
+        self.recorder.record("requests")
+        conn, reused = await self._acquire(pool_key)
+        try:
+            result, keep_alive = await self._exchange(conn, payload, method, url, headers_only)
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            conn.close()
+            if not reused:
+                raise FetchError(f"Connection failed for {url}: {e}") from e
+            # The server dropped an idle keep-alive connection; retry once on a fresh one
+            conn, _ = await self._acquire(pool_key, fresh=True)
+            try:
+                result, keep_alive = await self._exchange(conn, payload, method, url, headers_only)
+            except (ConnectionError, asyncio.IncompleteReadError) as e2:
+                conn.close()
+                raise FetchError(f"Connection failed for {url}: {e2}") from e2
+            except BaseException:
+                conn.close()
+                raise
+        except BaseException:
+            conn.close()
+            raise
+        if keep_alive and conn.usable:
+            self._idle.setdefault(pool_key, []).append(conn)
+        else:
+            conn.close()
+        return result
+
+    async def _acquire(self, pool_key, fresh: bool = False) -> Tuple[_Connection, bool]:
+        idle = self._idle.get(pool_key, [])
+        while idle and not fresh:
+            conn = idle.pop()
+            if conn.usable:
+                return conn, True
+            conn.close()
+        scheme, host, port, verify = pool_key
+        ssl_ctx = None
+        if scheme == "https":
+            ssl_ctx = self._ssl_verified if verify else self._ssl_unverified
+        self.recorder.record("connections")
+        try:
+            reader, writer = await asyncio.open_connection(
+                host, port, ssl=ssl_ctx, server_hostname=host if ssl_ctx else None, limit=2 ** 20
+            )
+        except OSError as e:
+            raise FetchError(f"Could not connect to {host}:{port}: {e}") from e
+        return _Connection(reader, writer), False
+
+    async def _exchange(self, conn: _Connection, payload: bytes, method: str, url: str, headers_only: bool = False):
+        conn.writer.write(payload)
+        await conn.writer.drain()
+        reader = conn.reader
+
+        while True:
+            status_line = (await reader.readuntil(b"\r\n")).decode("latin-1").strip()
+            if not status_line:
+                raise ConnectionResetError("empty response")
+            version, _, rest = status_line.partition(" ")
+            code, _, reason = rest.partition(" ")
+            status = int(code)
+            headers = Headers()
+            while True:
+                line = (await reader.readuntil(b"\r\n")).decode("latin-1")
+                if line == "\r\n":
+                    break
+                name, _, value = line.partition(":")
+                name = name.strip().lower()
+                value = value.strip()
+                headers[name] = f"{headers[name]}, {value}" if name in headers else value
+            if status >= 200 or status == 101:
+                break  # skip interim 1xx responses
+
+        keep_alive = version == "HTTP/1.1" and "close" not in headers.get("connection", "").lower()
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            content = b""
+        elif headers_only:
+            # The body stays unread on the socket, so the connection can't carry another request
+            content = b""
+            keep_alive = False
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            content = await self._read_chunked(reader)
+        elif "content-length" in headers:
+            content = await reader.readexactly(int(headers["content-length"]))
+        else:
+            content = await reader.read()
+            keep_alive = False
+
+        encoding = headers.get("content-encoding", "").lower()
+        if content and encoding in ("gzip", "x-gzip"):
+            content = zlib.decompress(content, 16 + zlib.MAX_WBITS)
+        elif content and encoding == "deflate":
+            try:
+                content = zlib.decompress(content)
+            except zlib.error:
+                content = zlib.decompress(content, -zlib.MAX_WBITS)
+
+        return FetchResult(url, status, reason, headers, content), keep_alive
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+        while True:
+            size_line = (await reader.readuntil(b"\r\n")).split(b";", 1)[0].strip()
+            size = int(size_line, 16)
+            if size == 0:
+                # Discard optional trailers up to the terminating blank line
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+    async def aclose(self) -> None:
+        for conns in self._idle.values():
+            for conn in conns:
+                conn.close()
+        self._idle.clear()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+class FetchContext:
+    """Handle passed to coroutine scrapers: ``await ctx.fetch(url)``."""
+
+    def __init__(self, client: AsyncHttpClient, name: Optional[str] = None):
+        self.client = client
+        self.name = name
+
+    async def fetch(self, url: str, **kwargs) -> FetchResult:
+        return await self.client.fetch(url, **kwargs)
+
+    async def head(self, url: str, **kwargs) -> FetchResult:
+        return await self.client.request("HEAD", url, **kwargs)
+
+    async def fetch_all(self, urls: List[str], **kwargs) -> List[Any]:
+        """Fetch several URLs concurrently; failures are returned as exceptions."""
+        return await asyncio.gather(*(self.fetch(url, **kwargs) for url in urls), return_exceptions=True)
+
+    @classmethod
+    def standalone(cls, name: Optional[str] = None) -> "FetchContext":
+        """Context for running a scraper on its own, sharing the default on-disk cache."""
+        return cls(AsyncHttpClient(cache=HttpCache()), name)
+
+    async def __aenter__(self) -> "FetchContext":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.client.aclose()
+
+
+def accepts_context(func: Callable) -> bool:
+    """Whether a scraper entry point takes the fetch context as its first argument."""
+    try:
+        return len(inspect.signature(func).parameters) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+def run_standalone(scrape: Callable[[FetchContext], Awaitable[Any]]) -> Any:
+    """Run a coroutine scraper from its ``__main__`` block."""
+    async def runner():
+        async with FetchContext.standalone() as ctx:
+            return await scrape(ctx)
+    return asyncio.run(runner())
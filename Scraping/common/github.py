@@ -0,0 +1,190 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://api.github.com"
+GRAPHQL_URL = f"{API_URL}/graphql"
+ACCEPT = "application/vnd.github+json"
+TOKEN_VARIABLES = ("GITHUB_TOKEN", "GH_TOKEN")
+BATCH_SIZE = 20  # repositories per GraphQL query
+MAX_ASSETS = 100  # assets fetched per release in a batched query
+
+_RELEASE_FIELDS = (
+    "tagName name url publishedAt isPrerelease "
+    f"releaseAssets(first: {MAX_ASSETS}) {{ nodes {{ name downloadUrl size contentType }} }}"
+)
+
+
+def github_token() -> Optional[str]:
+    """Token from GITHUB_TOKEN (or GH_TOKEN); without one the API allows 60 requests an hour."""
+    for variable in TOKEN_VARIABLES:
+        token = os.environ.get(variable, "").strip()
+        if token:
+            return token
+    return None
+
+
+@dataclass
+class Asset:
+    name: str
+    url: str  # browser download URL
+    size: Optional[int] = None
+    content_type: Optional[str] = None
+
+
+@dataclass
+class Release:
+    repo: str  # owner/name
+    tag: str
+    name: str
+    html_url: str
+    published_at: Optional[str] = None
+    prerelease: bool = False
+    assets: List[Asset] = field(default_factory=list)
+
+    @classmethod
+    def from_rest(cls, repo: str, data: Dict[str, Any]) -> "Release":
+        assets = [Asset(a["name"], a["browser_download_url"], a.get("size"), a.get("content_type"))
+                  for a in data.get("assets", [])]
+        return cls(repo, data["tag_name"], data.get("name") or data["tag_name"], data.get("html_url", ""),
+                   data.get("published_at"), data.get("prerelease", False), assets)
+
+    @classmethod
+    def from_graphql(cls, repo: str, node: Dict[str, Any]) -> "Release":
+        assets = [Asset(a["name"], a["downloadUrl"], a.get("size"), a.get("contentType"))
+                  for a in node["releaseAssets"]["nodes"]]
+        return cls(repo, node["tagName"], node.get("name") or node["tagName"], node.get("url", ""),
+                   node.get("publishedAt"), node.get("isPrerelease", False), assets)
+
+
+class GitHubReleases:
+    """Release metadata from the GitHub API, shared by every scraper of a run.
+
+    REST requests go through the shared client, so they are ETag-revalidated
+    against the HTTP cache (a 304 doesn't count against the rate limit),
+    memoized for the run and admitted against api.github.com's rate-limit
+    budget by the scheduler. With a token, prefetch() resolves the latest
+    release of many repositories in one GraphQL query; latest() then answers
+    from that batch.
+    """
+
+    def __init__(self, client=None, token: Optional[str] = None):
+        self._client = client
+        self.token = token if token is not None else github_token()
+        self._batched: Dict[str, Release] = {}
+        self._lock = threading.Lock()
+        self.batched_queries = 0
+
+    @property
+    def client(self):
+        from common.http import get_client
+        return self._client or get_client()
+
+    def headers(self, accept: str = ACCEPT) -> Dict[str, str]:
+        headers = {"Accept": accept, "X-GitHub-Api-Version": "2022-11-28"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def _get(self, path: str, accept: str = ACCEPT):
+        response = self.client.get(f"{API_URL}{path}", headers=self.headers(accept))
+        response.raise_for_status()
+        return response
+
+    def latest(self, repo: str) -> Release:
+        """Latest release (not draft or prerelease) of ``owner/name``."""
+        with self._lock:
+            release = self._batched.get(repo.lower())
+        if release is not None:
+            return release
+        return Release.from_rest(repo, self._get(f"/repos/{repo}/releases/latest").json())
+
+    def release(self, repo: str, tag: Optional[str] = None) -> Release:
+        """Release ``tag`` of ``owner/name``; the latest one without a tag."""
+        if tag is None:
+            return self.latest(repo)
+        with self._lock:
+            release = self._batched.get(repo.lower())
+        if release is not None and release.tag == tag:
+            return release
+        return Release.from_rest(repo, self._get(f"/repos/{repo}/releases/tags/{tag}").json())
+
+    def contents(self, repo: str, path: str) -> bytes:
+        """Raw bytes of ``path`` on the default branch of ``owner/name``."""
+        return self._get(f"/repos/{repo}/contents/{path}", accept="application/vnd.github.raw").content
+
+    def prefetch(self, repos: Iterable[str]) -> int:
+        """Resolve the latest releases of ``repos`` in batched GraphQL queries.
+
+        Needs a token (GraphQL doesn't serve anonymous clients); without one
+        this does nothing and latest() falls back to one REST request per
+        repository. Returns how many releases were resolved.
+        """
+        repos = sorted({repo.lower(): repo for repo in repos}.values())
+        if not self.token or not repos:
+            return 0
+        resolved = 0
+        for start in range(0, len(repos), BATCH_SIZE):
+            batch = repos[start:start + BATCH_SIZE]
+            try:
+                found = self._query_latest(batch)
+            except Exception as e:
+                logger.warning(f"Batched release query failed, falling back to REST: {e}")
+                continue
+            with self._lock:
+                self._batched.update((release.repo.lower(), release) for release in found)
+            resolved += len(found)
+        return resolved
+
+    def _query_latest(self, repos: List[str]) -> List[Release]:
+        variables, parameters, selections = {}, [], []
+        for index, repo in enumerate(repos):
+            owner, name = repo.split("/", 1)
+            variables[f"o{index}"], variables[f"n{index}"] = owner, name
+            parameters.append(f"$o{index}: String!, $n{index}: String!")
+            selections.append(f"r{index}: repository(owner: $o{index}, name: $n{index}) "
+                              f"{{ latestRelease {{ {_RELEASE_FIELDS} }} }}")
+        query = f"query({', '.join(parameters)}) {{ {' '.join(selections)} }}"
+        response = self.client.request("POST", GRAPHQL_URL, json={"query": query, "variables": variables},
+                                       headers=self.headers("application/json"))
+        response.raise_for_status()
+        payload = response.json()
+        self.batched_queries += 1
+        for error in payload.get("errors") or []:
+            logger.warning(f"GitHub GraphQL: {error.get('message')}")
+
+        releases = []
+        data = payload.get("data") or {}
+        for index, repo in enumerate(repos):
+            node = (data.get(f"r{index}") or {}).get("latestRelease")
+            if node is not None:
+                releases.append(Release.from_graphql(repo, node))
+        return releases
+
+    def clear(self) -> None:
+        """Forget batched answers; the next run asks again."""
+        with self._lock:
+            self._batched.clear()
+
+
+_github: Optional[GitHubReleases] = None
+_github_lock = threading.Lock()
+
+
+def get_github() -> GitHubReleases:
+    """Process-wide release provider; the orchestrator installs its own with set_github()."""
+    global _github
+    with _github_lock:
+        if _github is None:
+            _github = GitHubReleases()
+        return _github
+
+
+def set_github(github: GitHubReleases) -> None:
+    global _github
+    with _github_lock:
+        _github = github
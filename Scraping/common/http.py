@@ -0,0 +1,306 @@
+import socket
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from http import HTTPStatus
+from typing import Dict, Optional, Any, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from common.cache import CacheEntry, HttpCache
+from common.memo import FETCHED, MEMOIZED, MemoPage, PageMemo, memo_key
+from common.mirrors import MirrorRouter
+from common.scheduler import HostScheduler
+
+DEFAULT_TIMEOUT = 10  # seconds
+DNS_CACHE_TTL = 300  # seconds
+
+
+def request_key(url: str, params: Optional[Any] = None) -> str:
+    """The URL as requests sends it, used by both clients to key the cache and the memo."""
+    try:
+        return requests.Request("GET", url, params=params).prepare().url
+    except (requests.RequestException, ValueError):
+        return url  # not a URL requests can send; the request itself reports it
+
+
+@dataclass
+class RequestCounters:
+    """Request/connection counters for one scraper run (or the whole client)."""
+    requests: int = 0
+    connections: int = 0
+    cache_hits: int = 0  # answered from cache without touching the network
+    cache_misses: int = 0  # full body downloaded
+    cache_revalidated: int = 0  # server answered 304, cached body reused
+    memo_hits: int = 0  # page already fetched earlier in this run
+    coalesced: int = 0  # joined an identical request already in flight
+    bytes_saved: int = 0  # body bytes left unread by streaming searches that stopped early
+
+    @property
+    def reuse_ratio(self) -> Optional[float]:
+        """Share of requests that were served on an already-open connection."""
+        if not self.requests:
+            return None
+        return max(0.0, 1 - self.connections / self.requests)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["reuse_ratio"] = self.reuse_ratio
+        return data
+
+
+# Counters of the scraper currently running in this context. The orchestrator
+# sets this before invoking a scraper so traffic is attributed per scraper.
+current_counters: ContextVar[Optional[RequestCounters]] = ContextVar("current_counters", default=None)
+
+
+class TrafficRecorder:
+    """Thread-safe sink for traffic counters, shared by the sync and async clients."""
+
+    def __init__(self):
+        self.totals = RequestCounters()
+        self._lock = threading.Lock()
+
+    def record(self, field: str, amount: int = 1) -> None:
+        """Add ``amount`` to ``field`` run-wide and for the scraper running in this context."""
+        with self._lock:
+            setattr(self.totals, field, getattr(self.totals, field) + amount)
+            counters = current_counters.get()
+            if counters is not None:
+                setattr(counters, field, getattr(counters, field) + amount)
+
+
+class _DnsCache:
+    """Process-wide TTL cache in front of socket.getaddrinfo."""
+
+    def __init__(self, ttl: int = DNS_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[Tuple, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._resolve = socket.getaddrinfo
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+        result = self._resolve(host, port, family, type, proto, flags)
+        with self._lock:
+            self._entries[key] = (now + self.ttl, result)
+        return result
+
+
+_dns_cache: Optional[_DnsCache] = None
+
+
+def install_dns_cache(ttl: int = DNS_CACHE_TTL) -> None:
+    """Route name resolution through a shared TTL cache (idempotent)."""
+    global _dns_cache
+    if _dns_cache is None:
+        _dns_cache = _DnsCache(ttl)
+        socket.getaddrinfo = _dns_cache.getaddrinfo
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter that counts requests and newly opened connections."""
+
+    def __init__(self, recorder: TrafficRecorder, **kwargs):
+        self._recorder = recorder
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        recorder = self._recorder
+
+        def on_connect():
+            recorder.record("connections")
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):
+                on_connect()
+                return super()._new_conn()
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                on_connect()
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        self._recorder.record("requests")
+        return super().send(request, **kwargs)
+
+
+class HttpClient:
+    """Pooled HTTP client shared by every scraper of an orchestrator run.
+
+    One ``requests.Session`` keeps connections alive per host, so repeated
+    requests to the same mirror reuse the TCP connection and its TLS session
+    instead of handshaking again.
+    """
+
+    def __init__(self, max_hosts: int = 32, max_per_host: int = 6, timeout: int = DEFAULT_TIMEOUT,
+                 cache: Optional[HttpCache] = None, scheduler: Optional[HostScheduler] = None,
+                 memo: Optional[PageMemo] = None, mirrors: Optional[MirrorRouter] = None):
+        self.timeout = timeout
+        self.cache = cache
+        self.scheduler = scheduler
+        self.memo = memo
+        self.mirrors = mirrors
+        self.recorder = TrafficRecorder()
+        install_dns_cache()
+
+        self.session = requests.Session()
+        adapter = PooledAdapter(self.recorder, pool_connections=max_hosts, pool_maxsize=max_per_host, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, url: str, route: bool = True, **kwargs) -> requests.Response:
+        """Send one request; URLs on a mirror network go to its fastest mirror unless ``route`` is False."""
+        kwargs.setdefault("timeout", self.timeout)
+        if self.mirrors is None or not route:
+            return self._send(method, url, **kwargs)
+        return self.mirrors.call(url, lambda target: self._send(method, target, **kwargs))
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        if self.scheduler is None:
+            return self.session.request(method, url, **kwargs)
+        with self.scheduler.slot(url) as permit:
+            response = self.session.request(method, url, **kwargs)
+            permit.status = response.status_code
+            permit.retry_after = response.headers.get("Retry-After")
+            permit.headers = response.headers
+        return response
+
+    def get(self, url: str, use_cache: bool = True, **kwargs) -> requests.Response:
+        """GET ``url``, revalidating against the on-disk cache when possible.
+
+        Responses carry ``from_cache`` and ``not_modified`` attributes so callers
+        can skip re-parsing a page the server reported as unchanged. With a
+        memo, concurrent and repeated GETs of a URL within the run share one
+        request.
+        """
+        if not use_cache or kwargs.get("stream"):
+            return self._mark(self.request("GET", url, **kwargs))
+        key = request_key(url, kwargs.get("params"))
+        if self.memo is None:
+            return self._get(key, url, **kwargs)
+
+        response, page, how = self.memo.once(
+            memo_key(key, kwargs.get("headers"), kwargs.get("allow_redirects", True)),
+            lambda: self._get(key, url, **kwargs),
+        )
+        if how != FETCHED:
+            self.recorder.record("memo_hits" if how == MEMOIZED else "coalesced")
+            response = _response_from_page(page)
+        response.memo, response.memo_page = self.memo, page
+        return response
+
+    def memoized(self, url: str, **kwargs) -> Optional[requests.Response]:
+        """The response a GET of ``url`` would get from this run's memo, without fetching it."""
+        if self.memo is None:
+            return None
+        key = request_key(url, kwargs.get("params"))
+        page = self.memo.peek(memo_key(key, kwargs.get("headers"), kwargs.get("allow_redirects", True)))
+        if page is None:
+            return None
+        self.recorder.record("memo_hits")
+        response = _response_from_page(page)
+        response.memo, response.memo_page = self.memo, page
+        return response
+
+    def _get(self, key: str, url: str, **kwargs) -> requests.Response:
+        if self.cache is None:
+            return self._mark(self.request("GET", url, **kwargs))
+
+        entry = self.cache.get(key)
+        if entry is not None and entry.is_negative:
+            self.recorder.record("cache_hits")
+            return _response_from_cache(entry, not_modified=True)
+
+        if entry is not None:
+            kwargs["headers"] = {**entry.conditional_headers(), **(kwargs.get("headers") or {})}
+        response = self.request("GET", url, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(key, response)
+            self.recorder.record("cache_revalidated")
+            return _response_from_cache(entry, not_modified=True)
+
+        self.cache.store(key, response)
+        self.recorder.record("cache_misses")
+        return self._mark(response)
+
+    @staticmethod
+    def _mark(response: requests.Response) -> requests.Response:
+        response.from_cache = False
+        response.not_modified = False
+        return response
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("allow_redirects", True)
+        return self.request("HEAD", url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.recorder.totals.to_dict()
+
+    def close(self) -> None:
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+def _response_from_cache(entry: CacheEntry, not_modified: bool) -> requests.Response:
+    """Rebuild a requests.Response from a cache entry."""
+    return _build_response(entry.status, HTTPStatus(entry.status).phrase, entry.final_url, entry.headers,
+                           entry.body, not_modified)
+
+
+def _response_from_page(page: MemoPage) -> requests.Response:
+    """Rebuild a requests.Response from a page fetched earlier in the run."""
+    return _build_response(page.status, page.reason, page.final_url, page.headers, page.content, page.not_modified)
+
+
+def _build_response(status: int, reason: str, url: str, headers: Dict[str, str], body: bytes,
+                    not_modified: bool) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response.url = url
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = body
+    response.from_cache = True
+    response.not_modified = not_modified
+    return response
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Return the client injected by the orchestrator, creating one for standalone runs."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(cache=HttpCache())
+        return _client
+
+
+def set_client(client: HttpClient) -> None:
+    """Install ``client`` as the shared client returned by get_client()."""
+    global _client
+    with _client_lock:
+        _client = client
@@ -0,0 +1,755 @@
+import bz2
+import codecs
+import io
+import json
+import logging
+import lzma
+import os
+import plistlib
+import posixpath
+import re
+import struct
+import tarfile
+import tempfile
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTROSPECT_PATH = Path(__file__).resolve().parents[1] / ".state" / "introspect.json"
+READ_AHEAD = 64 * 1024  # bytes fetched per range request; most headers fit in the first one
+MAX_BYTES = 2 * 1024 * 1024  # per artifact; introspection gives up rather than read more
+MAX_WORKERS = 8
+PLACEHOLDER_VERSIONS = {"", "latest", "unknown", "none", "n/a"}
+
+_VERSION_RE = re.compile(r"\d+(?:\.\d+){1,3}")
+TAIL_FIRST = (".zip", ".jar", ".whl", ".nupkg", ".vsix", ".xpi", ".apk", ".dmg")  # metadata lives at the end
+
+
+class IntrospectionError(Exception):
+    pass
+
+
+@dataclass
+class Introspection:
+    """What an artifact says about itself."""
+    url: str
+    format: Optional[str] = None  # pe, msi, zip, deb, rpm, tar, dmg
+    version: Optional[str] = None
+    fields: Dict[str, str] = field(default_factory=dict)  # product name, file version, architecture, ...
+    size: Optional[int] = None
+    bytes_read: int = 0
+    requests: int = 0
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    error: Optional[str] = None
+
+
+def version_in(text: Optional[str]) -> Optional[str]:
+    match = _VERSION_RE.search(text or "")
+    return match.group(0) if match else None
+
+
+class RangeReader:
+    """Random access to a remote file through Range requests, fetching each region once."""
+
+    def __init__(self, url: str, client=None, max_bytes: int = MAX_BYTES, **kwargs):
+        from common.http import get_client
+
+        self.url = url
+        self.client = client or get_client()
+        self.max_bytes = max_bytes
+        self.kwargs = kwargs
+        self.size: Optional[int] = None
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.blocks: List[Tuple[int, bytes]] = []
+        self.bytes_read = 0
+        self.requests = 0
+
+    def _fetch(self, spec: str) -> Tuple[int, bytes]:
+        if self.bytes_read >= self.max_bytes:
+            raise IntrospectionError(f"Read {self.bytes_read} bytes without finding the metadata")
+        response = self.client.request("GET", self.url, headers={"Range": f"bytes={spec}"}, stream=True,
+                                       **self.kwargs)
+        try:
+            self.requests += 1
+            if response.status_code != 206:
+                raise IntrospectionError(f"{self.url} answered {response.status_code} to a Range request")
+            match = re.match(r"bytes (\d+)-(\d+)/(\d+|\*)", response.headers.get("Content-Range", ""))
+            if not match:
+                raise IntrospectionError(f"{self.url} sent no usable Content-Range")
+            data = response.raw.read(int(match.group(2)) - int(match.group(1)) + 1, decode_content=False)
+        finally:
+            response.close()
+        # Later reads skip the redirects (download.example.com/latest -> CDN)
+        self.url = response.url or self.url
+        if match.group(3) != "*":
+            self.size = int(match.group(3))
+        self.etag = self.etag or response.headers.get("ETag")
+        self.last_modified = self.last_modified or response.headers.get("Last-Modified")
+        self.bytes_read += len(data)
+        self.blocks.append((int(match.group(1)), data))
+        return int(match.group(1)), data
+
+    def _cached(self, offset: int, length: int) -> Optional[bytes]:
+        for start, data in self.blocks:
+            if start <= offset and offset + length <= start + len(data):
+                return data[offset - start:offset - start + length]
+        return None
+
+    def read(self, offset: int, length: int, ahead: int = READ_AHEAD) -> bytes:
+        """``length`` bytes at ``offset`` (fewer at the end of the file), fetching at least ``ahead``."""
+        if self.size is not None:
+            length = max(0, min(length, self.size - offset))
+        data = self._cached(offset, length)
+        if data is not None:
+            return data
+        if self.bytes_read + length > self.max_bytes:
+            raise IntrospectionError(f"Metadata at {offset} ({length} bytes) is past the read budget")
+        start, block = self._fetch(f"{offset}-{offset + max(length, ahead) - 1}")
+        return block[offset - start:offset - start + length]
+
+    def tail(self, length: int) -> Tuple[int, bytes]:
+        """The last ``length`` bytes, and the offset they start at."""
+        if self.size is not None:
+            offset = max(0, self.size - length)
+            return offset, self.read(offset, length)
+        return self._fetch(f"-{max(length, READ_AHEAD)}")
+
+
+def _c_string(data: bytes, offset: int = 0) -> str:
+    end = data.find(b"\0", offset)
+    return data[offset:end if end >= 0 else len(data)].decode("utf-8", "replace")
+
+
+# --- PE: VS_VERSIONINFO resource -----------------------------------------------------------------------------
+
+RT_VERSION = 16
+PE_STRINGS = ("ProductName", "ProductVersion", "FileVersion", "CompanyName", "FileDescription", "OriginalFilename")
+
+
+def _align4(offset: int) -> int:
+    return (offset + 3) & ~3
+
+
+def _version_block(data: bytes, pos: int) -> Tuple[str, int, bytes, int, int]:
+    """(key, type, value, first child offset, end) of one VS_VERSIONINFO-style block."""
+    length, value_length, kind = struct.unpack_from("<HHH", data, pos)
+    key_end = pos + 6
+    while key_end + 1 < len(data) and data[key_end:key_end + 2] != b"\0\0":
+        key_end += 2
+    key = data[pos + 6:key_end].decode("utf-16-le", "replace")
+    value_start = _align4(key_end + 2)
+    value_size = value_length * 2 if kind == 1 else value_length
+    value = data[value_start:value_start + value_size]
+    return key, kind, value, _align4(value_start + value_size), pos + max(length, 6)
+
+
+def _version_children(data: bytes, start: int, end: int):
+    pos = start
+    while pos + 6 <= min(end, len(data)):
+        block = _version_block(data, pos)
+        yield block
+        pos = _align4(block[4])
+
+
+def parse_version_info(data: bytes) -> Dict[str, str]:
+    """Fields of a VS_VERSIONINFO resource: the fixed file/product versions and its StringFileInfo strings."""
+    key, _, value, children, end = _version_block(data, 0)
+    if key != "VS_VERSION_INFO":
+        raise IntrospectionError("Not a version resource")
+    fields: Dict[str, str] = {}
+    if len(value) >= 52 and struct.unpack_from("<I", value)[0] == 0xFEEF04BD:
+        file_ms, file_ls, product_ms, product_ls = struct.unpack_from("<IIII", value, 8)
+        fields["FixedFileVersion"] = f"{file_ms >> 16}.{file_ms & 0xFFFF}.{file_ls >> 16}.{file_ls & 0xFFFF}"
+        fields["FixedProductVersion"] = (f"{product_ms >> 16}.{product_ms & 0xFFFF}."
+                                         f"{product_ls >> 16}.{product_ls & 0xFFFF}")
+    for child_key, _, _, child_start, child_end in _version_children(data, children, end):
+        if child_key != "StringFileInfo":
+            continue
+        for _, _, _, table_start, table_end in _version_children(data, child_start, child_end):
+            for name, kind, text, _, _ in _version_children(data, table_start, table_end):
+                if kind == 1 and name in PE_STRINGS and name not in fields:
+                    fields[name] = text.decode("utf-16-le", "replace").rstrip("\0").strip()
+    return fields
+
+
+def introspect_pe(reader: RangeReader) -> Tuple[Optional[str], Dict[str, str]]:
+    head = reader.read(0, 64)
+    (pe_offset,) = struct.unpack_from("<I", head, 0x3C)
+    header = reader.read(pe_offset, 24)
+    if header[:4] != b"PE\0\0":
+        raise IntrospectionError("No PE header")
+    machine, sections, _, _, _, optional_size, _ = struct.unpack_from("<HHIIIHH", header, 4)
+    optional = reader.read(pe_offset + 24, optional_size)
+    magic = struct.unpack_from("<H", optional)[0]
+    directories = 96 if magic == 0x10B else 112  # PE32 / PE32+
+    rsrc_rva, rsrc_size = struct.unpack_from("<II", optional, directories + 2 * 8)
+    table = reader.read(pe_offset + 24 + optional_size, 40 * sections)
+    layout = [struct.unpack_from("<8sIIII", table, 40 * i) for i in range(sections)]
+
+    def file_offset(rva: int) -> int:
+        for _, virtual_size, address, raw_size, raw_pointer in layout:
+            if address <= rva < address + max(virtual_size, raw_size):
+                return rva - address + raw_pointer
+        raise IntrospectionError(f"RVA {rva:#x} is outside every section")
+
+    fields = {"Machine": {0x14C: "x86", 0x8664: "x64", 0xAA64: "arm64"}.get(machine, f"{machine:#x}")}
+    if not rsrc_rva:
+        return None, fields
+    root = file_offset(rsrc_rva)
+
+    def entries(directory: int) -> List[Tuple[int, int]]:
+        named, ids = struct.unpack_from("<HH", reader.read(root + directory + 12, 4))
+        data = reader.read(root + directory + 16, 8 * (named + ids))
+        return [struct.unpack_from("<II", data, 8 * i) for i in range(named + ids)]
+
+    def descend(directory: int, want: Optional[int]) -> int:
+        for name, target in entries(directory):
+            if want is None or (not name & 0x80000000 and name == want):
+                return target
+        raise IntrospectionError("No version resource")
+
+    node = descend(0, RT_VERSION)
+    while node & 0x80000000:  # type -> name -> language -> data entry
+        node = descend(node & 0x7FFFFFFF, None)
+    data_rva, data_size = struct.unpack_from("<II", reader.read(root + node, 8))
+    fields.update(parse_version_info(reader.read(file_offset(data_rva), data_size)))
+    version = (version_in(fields.get("ProductVersion")) or version_in(fields.get("FileVersion"))
+               or fields.get("FixedProductVersion"))
+    return version, fields
+
+
+# --- MSI: compound file, string pool and Property table ------------------------------------------------------
+
+_MSI_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz._"
+_END_OF_CHAIN = 0xFFFFFFFE
+
+
+def msi_stream_name(name: str) -> str:
+    """Decode MSI's packed stream names ("!Property", "!_StringPool", ...)."""
+    out = []
+    for char in name:
+        code = ord(char)
+        if 0x3800 <= code < 0x4800:
+            code -= 0x3800
+            out.append(_MSI_CHARS[code & 0x3F] + _MSI_CHARS[(code >> 6) & 0x3F])
+        elif 0x4800 <= code < 0x4840:
+            out.append(_MSI_CHARS[code - 0x4800])
+        elif code == 0x4840:
+            out.append("!")
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+class CompoundFile:
+    """Streams of an OLE compound file (MSI, old Office), read sector by sector through a RangeReader."""
+
+    def __init__(self, reader: RangeReader):
+        self.reader = reader
+        header = reader.read(0, 512)
+        if header[:8] != b"\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1":
+            raise IntrospectionError("Not a compound file")
+        self.sector_size = 1 << struct.unpack_from("<H", header, 0x1E)[0]
+        self.mini_size = 1 << struct.unpack_from("<H", header, 0x20)[0]
+        self.directory_start = struct.unpack_from("<I", header, 0x30)[0]
+        self.cutoff = struct.unpack_from("<I", header, 0x38)[0]
+        self.mini_fat_start = struct.unpack_from("<I", header, 0x3C)[0]
+        self.difat_next = struct.unpack_from("<I", header, 0x44)[0]
+        self.difat = [s for s in struct.unpack_from("<109I", header, 0x4C)]
+        self.per_sector = self.sector_size // 4
+        self._fat: Dict[int, Tuple[int, ...]] = {}
+        self.entries = self._directory()
+        self._mini_fat: Optional[List[int]] = None
+        self._mini_stream: Optional[List[int]] = None
+
+    def _sector(self, sector: int) -> bytes:
+        return self.reader.read((sector + 1) * self.sector_size, self.sector_size)
+
+    def _fat_sector(self, index: int) -> int:
+        while index >= len(self.difat) and self.difat_next < _END_OF_CHAIN:
+            data = self._sector(self.difat_next)
+            values = struct.unpack(f"<{self.per_sector}I", data)
+            self.difat.extend(values[:-1])
+            self.difat_next = values[-1]
+        if index >= len(self.difat):
+            raise IntrospectionError("FAT is truncated")
+        return self.difat[index]
+
+    def _next(self, sector: int) -> int:
+        index = sector // self.per_sector
+        if index not in self._fat:
+            self._fat[index] = struct.unpack(f"<{self.per_sector}I", self._sector(self._fat_sector(index)))
+        return self._fat[index][sector % self.per_sector]
+
+    def _chain(self, start: int, limit: Optional[int] = None) -> List[int]:
+        chain = []
+        while start < _END_OF_CHAIN and (limit is None or len(chain) < limit):
+            chain.append(start)
+            start = self._next(start)
+            if len(chain) > 1 << 20:
+                raise IntrospectionError("FAT chain loops")
+        return chain
+
+    def _directory(self) -> Dict[str, Tuple[int, int, int]]:
+        entries = {}
+        for sector in self._chain(self.directory_start):
+            data = self._sector(sector)
+            for pos in range(0, len(data), 128):
+                name_length, kind = struct.unpack_from("<HB", data, pos + 64)
+                if kind not in (1, 2, 5):
+                    continue
+                name = data[pos:pos + max(0, name_length - 2)].decode("utf-16-le", "replace")
+                start, size = struct.unpack_from("<II", data, pos + 116)
+                entries[msi_stream_name(name)] = (kind, start, size)
+        return entries
+
+    def stream(self, name: str) -> bytes:
+        if name not in self.entries:
+            raise IntrospectionError(f"No {name} stream")
+        kind, start, size = self.entries[name]
+        if size >= self.cutoff or kind == 5:
+            sectors = self._chain(start, -(-size // self.sector_size))
+            return b"".join(self._sector(sector) for sector in sectors)[:size]
+        return self._mini(start, size)
+
+    def _mini(self, start: int, size: int) -> bytes:
+        if self._mini_fat is None:
+            raw = b"".join(self._sector(s) for s in self._chain(self.mini_fat_start))
+            self._mini_fat = list(struct.unpack(f"<{len(raw) // 4}I", raw))
+            root = next(entry for entry in self.entries.values() if entry[0] == 5)
+            self._mini_stream = self._chain(root[1])
+        data, sector = [], start
+        while sector < _END_OF_CHAIN and len(data) * self.mini_size < size:
+            offset = sector * self.mini_size
+            big = self._mini_stream[offset // self.sector_size]
+            data.append(self.reader.read((big + 1) * self.sector_size + offset % self.sector_size, self.mini_size))
+            sector = self._mini_fat[sector]
+        return b"".join(data)[:size]
+
+
+def msi_properties(cfb: CompoundFile) -> Dict[str, str]:
+    """The Property table of an MSI database (ProductName, ProductVersion, Manufacturer, ...)."""
+    pool = cfb.stream("!_StringPool")
+    data = cfb.stream("!_StringData")
+    words = struct.unpack(f"<{len(pool) // 2}H", pool)
+    codepage = words[0] | ((words[1] & 0x7FFF) << 16)
+    wide_refs = bool(words[1] & 0x8000)
+    try:
+        codec = codecs.lookup(f"cp{codepage}" if codepage not in (0, 65001) else "utf-8").name
+    except LookupError:
+        codec = "latin-1"
+    strings, offset, index, i = {}, 0, 1, 1
+    count = len(words) // 2
+    while i < count:
+        length, refs = words[2 * i], words[2 * i + 1]
+        if length == 0 and refs == 0:
+            i, index = i + 1, index + 1
+            continue
+        if length == 0:  # over 64k: the length continues in the next entry
+            length = (words[2 * i + 3] << 16) + words[2 * i + 2]
+            i += 2
+        else:
+            i += 1
+        strings[index] = data[offset:offset + length].decode(codec, "replace")
+        offset += length
+        index += 1
+
+    table = cfb.stream("!Property")
+    ref_size = 3 if wide_refs else 2
+    rows = len(table) // (2 * ref_size)
+
+    def ref(position: int) -> int:
+        raw = table[position * ref_size:(position + 1) * ref_size]
+        return int.from_bytes(raw, "little")
+
+    return {strings.get(ref(row), ""): strings.get(ref(rows + row), "") for row in range(rows)}
+
+
+def introspect_msi(reader: RangeReader) -> Tuple[Optional[str], Dict[str, str]]:
+    properties = msi_properties(CompoundFile(reader))
+    fields = {key: properties[key] for key in ("ProductName", "ProductVersion", "Manufacturer", "ProductCode",
+                                               "UpgradeCode") if key in properties}
+    return version_in(fields.get("ProductVersion")), fields
+
+
+# --- ZIP: central directory and well-known metadata members --------------------------------------------------
+
+def _zip_entries(reader: RangeReader) -> Dict[str, Tuple[int, int, int]]:
+    """name -> (compression method, compressed size, local header offset), from the central directory."""
+    base, tail = reader.tail(READ_AHEAD)
+    end = tail.rfind(b"PK\x05\x06")
+    if end < 0:
+        raise IntrospectionError("No end of central directory")
+    count, size, offset = struct.unpack_from("<HII", tail, end + 10)
+    if offset == 0xFFFFFFFF and end >= 20 and tail[end - 20:end - 16] == b"PK\x06\x07":
+        (zip64_end,) = struct.unpack_from("<Q", tail, end - 12)
+        record = reader.read(zip64_end, 56)
+        count, size, offset = struct.unpack_from("<QQQ", record, 32)
+    directory = reader.read(offset, size)
+    entries, pos = {}, 0
+    while pos + 46 <= len(directory) and directory[pos:pos + 4] == b"PK\x01\x02":
+        method, = struct.unpack_from("<H", directory, pos + 10)
+        compressed, = struct.unpack_from("<I", directory, pos + 20)
+        name_length, extra_length, comment_length = struct.unpack_from("<HHH", directory, pos + 28)
+        local, = struct.unpack_from("<I", directory, pos + 42)
+        name = directory[pos + 46:pos + 46 + name_length].decode("utf-8", "replace")
+        extra = directory[pos + 46 + name_length:pos + 46 + name_length + extra_length]
+        if 0xFFFFFFFF in (compressed, local):
+            compressed, local = _zip64_sizes(extra, compressed, local, directory, pos)
+        entries[name] = (method, compressed, local)
+        pos += 46 + name_length + extra_length + comment_length
+    return entries
+
+
+def _zip64_sizes(extra: bytes, compressed: int, local: int, directory: bytes, pos: int) -> Tuple[int, int]:
+    uncompressed, = struct.unpack_from("<I", directory, pos + 24)
+    at = 0
+    while at + 4 <= len(extra):
+        kind, length = struct.unpack_from("<HH", extra, at)
+        if kind == 1:
+            values = iter(struct.unpack_from(f"<{length // 8}Q", extra, at + 4))
+            if uncompressed == 0xFFFFFFFF:
+                next(values, None)
+            if compressed == 0xFFFFFFFF:
+                compressed = next(values, compressed)
+            if local == 0xFFFFFFFF:
+                local = next(values, local)
+            break
+        at += 4 + length
+    return compressed, local
+
+
+def _zip_member(reader: RangeReader, entry: Tuple[int, int, int]) -> bytes:
+    method, compressed, local = entry
+    header = reader.read(local, 30)
+    name_length, extra_length = struct.unpack_from("<HH", header, 26)
+    data = reader.read(local + 30 + name_length + extra_length, compressed)
+    if method == 0:
+        return data
+    if method == 8:
+        return zlib.decompressobj(-15).decompress(data)
+    raise IntrospectionError(f"Unsupported zip compression {method}")
+
+
+def _manifest_fields(text: str, separator: str = ":") -> Dict[str, str]:
+    fields = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition(separator)
+        if sep and key and not key.startswith(" "):
+            fields.setdefault(key.strip(), value.strip())
+    return fields
+
+
+def _plist_fields(data: bytes) -> Dict[str, str]:
+    plist = plistlib.loads(data)
+    return {key: str(plist[key]) for key in ("CFBundleName", "CFBundleIdentifier", "CFBundleShortVersionString",
+                                             "CFBundleVersion") if key in plist}
+
+
+def _json_fields(data: bytes) -> Dict[str, str]:
+    document = json.loads(data.decode("utf-8-sig"))
+    return {key: str(document[key]) for key in ("name", "version", "publisher") if key in document}
+
+
+# (member pattern, parser, keys holding the version), most specific first
+_ZIP_METADATA: List[Tuple[str, Callable[[bytes], Dict[str, str]], Tuple[str, ...]]] = [
+    (r"(^|/)[^/]+\.app/Contents/Info\.plist$", _plist_fields, ("CFBundleShortVersionString", "CFBundleVersion")),
+    (r"^META-INF/MANIFEST\.MF$", lambda d: _manifest_fields(d.decode("utf-8", "replace")),
+     ("Implementation-Version", "Bundle-Version", "Specification-Version")),
+    (r"^[^/]+\.dist-info/METADATA$", lambda d: _manifest_fields(d.decode("utf-8", "replace")), ("Version",)),
+    (r"^[^/]+\.nuspec$", lambda d: dict(re.findall(r"<(version|id)>([^<]+)<", d.decode("utf-8", "replace"))),
+     ("version",)),
+    (r"^(extension/)?(package|manifest)\.json$", _json_fields, ("version",)),
+]
+
+
+def introspect_zip(reader: RangeReader) -> Tuple[Optional[str], Dict[str, str]]:
+    entries = _zip_entries(reader)
+    fields = {"entries": str(len(entries))}
+    for pattern, parse, keys in _ZIP_METADATA:
+        names = sorted((name for name in entries if re.search(pattern, name)), key=len)
+        if not names:
+            continue
+        fields["metadata"] = names[0]
+        fields.update(parse(_zip_member(reader, entries[names[0]])))
+        version = next((fields[key] for key in keys if fields.get(key)), None)
+        if version:
+            return version, fields
+    # Portable zips unpack into "product-1.2.3/"
+    top = {name.split("/", 1)[0] for name in entries if "/" in name}
+    if len(top) == 1:
+        fields["top_level"] = top.pop()
+        return version_in(fields["top_level"]), fields
+    return None, fields
+
+
+# --- Linux packages: deb control file, rpm header -------------------------------------------------------------
+
+def introspect_deb(reader: RangeReader) -> Tuple[Optional[str], Dict[str, str]]:
+    pos = 8  # "!<arch>\n"
+    while True:
+        header = reader.read(pos, 60)
+        if len(header) < 60:
+            raise IntrospectionError("No control archive")
+        name, size = header[:16].decode("ascii", "replace").strip().rstrip("/"), int(header[48:58])
+        if name.startswith("control.tar"):
+            break
+        pos += 60 + size + size % 2
+    data = reader.read(pos + 60, size)
+    if name.endswith(".gz"):
+        data = zlib.decompress(data, 31)
+    elif name.endswith(".xz"):
+        data = lzma.decompress(data)
+    elif name.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise IntrospectionError("control.tar.zst needs the zstandard package")
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+        member = next((m for m in archive.getmembers() if m.name in ("./control", "control")), None)
+        if member is None:
+            raise IntrospectionError("No control file")
+        control = archive.extractfile(member).read().decode("utf-8", "replace")
+    fields = {key: value for key, value in _manifest_fields(control).items()
+              if key in ("Package", "Version", "Architecture", "Maintainer")}
+    return fields.get("Version"), fields
+
+
+_RPM_TAGS = {1000: "Name", 1001: "Version", 1002: "Release", 1022: "Arch"}
+
+
+def introspect_rpm(reader: RangeReader) -> Tuple[Optional[str], Dict[str, str]]:
+    pos = 96  # the lead
+    for header_number in range(2):  # signature header, then the package header
+        intro = reader.read(pos, 16)
+        if intro[:3] != b"\x8E\xAD\xE8":
+            raise IntrospectionError("No rpm header")
+        count, store_size = struct.unpack_from(">II", intro, 8)
+        if header_number == 0:
+            pos += 16 + 16 * count + store_size
+            pos += -pos % 8  # the signature header is padded to 8 bytes
+    index = reader.read(pos + 16, 16 * count)
+    store = pos + 16 + 16 * count
+    fields = {}
+    for i in range(count):
+        tag, kind, offset, _ = struct.unpack_from(">IIII", index, 16 * i)
+        if tag in _RPM_TAGS and kind in (6, 8, 9):  # string, string array, i18n string
+            fields[_RPM_TAGS[tag]] = _c_string(reader.read(store + offset, 256))
+    version = fields.get("Version")
+    if version and fields.get("Release"):
+        version = f"{version}-{fields['Release']}"
+    return version, fields
+
+
+# --- Compressed tarballs: gzip header and the first tar entries ----------------------------------------------
+
+def introspect_tar(reader: RangeReader) -> Tuple[Optional[str], Dict[str, str]]:
+    head = reader.read(0, READ_AHEAD)
+    fields = {}
+    if head[:2] == b"\x1F\x8B":
+        flags = head[3]
+        if flags & 0x08:  # FNAME: the name the tarball had when it was compressed
+            at = 10 + (2 + struct.unpack_from("<H", head, 10)[0] if flags & 0x04 else 0)
+            fields["original_name"] = _c_string(head, at)
+        decompressor = zlib.decompressobj(31)
+    elif head[:6] == b"\xFD7zXZ\0":
+        decompressor = lzma.LZMADecompressor()
+    elif head[:3] == b"BZh":
+        decompressor = bz2.BZ2Decompressor()
+    else:
+        raise IntrospectionError("Unknown compression")
+    try:
+        data = decompressor.decompress(head)
+    except (zlib.error, lzma.LZMAError, OSError, EOFError):
+        data = b""
+    names, pos = [], 0
+    while pos + 512 <= len(data) and data[pos:pos + 1] != b"\0":
+        block = data[pos:pos + 512]
+        name = _c_string(block[:100])
+        if block[257:262] == b"ustar" and block[345]:
+            name = f"{_c_string(block[345:500])}/{name}"
+        names.append(name)
+        size = int(_c_string(block[124:136]).strip() or "0", 8)
+        pos += 512 + -(-size // 512) * 512
+    if names:
+        fields["top_level"] = names[0].split("/", 1)[0]
+    version = version_in(fields.get("top_level")) or version_in(fields.get("original_name"))
+    return version, fields
+
+
+# --- DMG: koly trailer and resource plist ----------------------------------------------------------------------
+
+def introspect_dmg(reader: RangeReader) -> Tuple[Optional[str], Dict[str, str]]:
+    _, tail = reader.tail(512)
+    trailer = tail[-512:]
+    if trailer[:4] != b"koly":
+        raise IntrospectionError("No koly trailer")
+    xml_offset, xml_length = struct.unpack_from(">QQ", trailer, 216)
+    fields = {}
+    if xml_length:
+        plist = plistlib.loads(reader.read(xml_offset, xml_length))
+        names = [block.get("Name") or block.get("CFName") for block in plist.get("resource-fork", {}).get("blkx", [])]
+        fields["partitions"] = ", ".join(filter(None, names))
+    # The filesystem inside (and its Info.plist) is compressed; only partition names can carry a version
+    return version_in(fields.get("partitions")), fields
+
+
+# --- Dispatch --------------------------------------------------------------------------------------------------
+
+def _format(head: bytes, name: str) -> Optional[Tuple[str, Callable[[RangeReader], Tuple[Optional[str], Dict]]]]:
+    if head[:2] == b"MZ":
+        return "pe", introspect_pe
+    if head[:8] == b"\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1":
+        return "msi", introspect_msi
+    if head[:4] == b"PK\x03\x04":
+        return "zip", introspect_zip
+    if head[:8] == b"!<arch>\n":
+        return "deb", introspect_deb
+    if head[:4] == b"\xED\xAB\xEE\xDB":
+        return "rpm", introspect_rpm
+    if head[:2] == b"\x1F\x8B" or head[:6] == b"\xFD7zXZ\0" or head[:3] == b"BZh":
+        return "tar", introspect_tar
+    if name.endswith(".dmg"):
+        return "dmg", introspect_dmg
+    return None
+
+
+def introspect(url: str, client=None, **kwargs) -> Introspection:
+    """Read the version an artifact embeds, fetching only the byte ranges its format needs.
+
+    Handles Windows executables (the VS_VERSIONINFO resource), MSI
+    databases (the Property table), zip archives (Info.plist, MANIFEST.MF,
+    wheel METADATA, nuspec, package.json), .deb control files, rpm headers,
+    the first entries of compressed tarballs, and DMG partition names. A
+    typical artifact costs two to five requests of READ_AHEAD bytes.
+    """
+    kwargs.setdefault("timeout", 15)
+    reader = RangeReader(url, client, **kwargs)
+    result = Introspection(url)
+    name = unquote(posixpath.basename(urlsplit(url).path)).lower()
+    try:
+        tail_first = name.endswith(TAIL_FIRST)
+        if tail_first:
+            reader.tail(READ_AHEAD)
+        found = _format(reader.read(0, 16, ahead=16 if tail_first else READ_AHEAD), name)
+        if found is None:
+            raise IntrospectionError("Unrecognised format")
+        result.format, parse = found
+        result.version, result.fields = parse(reader)
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+        logger.debug(f"Introspecting {url} failed: {result.error}")
+    result.size, result.etag, result.last_modified = reader.size, reader.etag, reader.last_modified
+    result.bytes_read, result.requests = reader.bytes_read, reader.requests
+    return result
+
+
+class IntrospectionCache:
+    """Past introspections, reused while the server reports the file unchanged (ETag/Last-Modified/size)."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_INTROSPECT_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # one save at a time, so the newest snapshot is the one kept
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.results = {url: Introspection(**result) for url, result in data.items()}
+        except (OSError, ValueError, TypeError):
+            self.results: Dict[str, Introspection] = {}
+
+    def lookup(self, url: str, client) -> Optional[Introspection]:
+        with self._lock:
+            cached = self.results.get(url)
+        if cached is None or cached.error or not (cached.etag or cached.last_modified):
+            return None
+        response = client.head(url, timeout=15)
+        length = response.headers.get("Content-Length")
+        if (response.headers.get("ETag"), response.headers.get("Last-Modified")) != (cached.etag,
+                                                                                     cached.last_modified):
+            return None
+        if length is not None and cached.size is not None and int(length) != cached.size:
+            return None
+        return cached
+
+    def put(self, result: Introspection) -> None:
+        with self._lock:
+            self.results[result.url] = result
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._save_lock:
+            with self._lock:
+                data = {url: asdict(result) for url, result in self.results.items()}
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f"{self.path.stem}.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data, indent=1))
+            os.replace(tmp, self.path)
+
+
+_cache: Optional[IntrospectionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_introspection_cache() -> IntrospectionCache:
+    """Process-wide introspection cache, shared by every scraper so none overwrites another's results."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = IntrospectionCache()
+        return _cache
+
+
+def introspect_all(urls: Iterable[str], client=None, cache: Optional[IntrospectionCache] = None,
+                   max_workers: int = MAX_WORKERS, **kwargs) -> Dict[str, Introspection]:
+    """Introspect ``urls`` concurrently; unchanged files are answered from the cache with one HEAD."""
+    from common.http import get_client
+
+    client = client or get_client()
+    cache = cache if cache is not None else get_introspection_cache()
+    urls = list(dict.fromkeys(urls))
+
+    def one(url: str) -> Introspection:
+        try:
+            cached = cache.lookup(url, client)
+        except Exception as e:
+            logger.debug(f"HEAD {url} failed: {e}")
+            cached = None
+        if cached is not None:
+            return cached
+        result = introspect(url, client, **kwargs)
+        cache.put(result)
+        return result
+
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        results = dict(zip(urls, pool.map(one, urls)))
+    cache.save()
+    return results
+
+
+def fill_versions(records: List[Dict[str, Any]], url_key: str = "url", **kwargs) -> List[Dict[str, Any]]:
+    """Give records without a real version (``""``, ``"latest"``, ...) the version their artifact embeds.
+
+    Each introspected record also gets ``embedded``: the format and fields read from the file.
+    """
+    pending = [record for record in records
+               if str(record.get("version") or "").strip().lower() in PLACEHOLDER_VERSIONS and record.get(url_key)]
+    results = introspect_all((record[url_key] for record in pending), **kwargs)
+    for record in pending:
+        result = results.get(record[url_key])
+        if result is None or result.error:
+            continue
+        if result.version:
+            record["version"] = result.version
+        record["embedded"] = {"format": result.format, **result.fields}
+    return records
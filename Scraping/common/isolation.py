@@ -0,0 +1,155 @@
+import asyncio
+import multiprocessing
+import pickle
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# spawn gives every worker a clean interpreter: no inherited threads, sockets or event loop
+_mp = multiprocessing.get_context("spawn")
+
+
+@dataclass
+class WorkerSpec:
+    """Everything a worker process needs to run one scraper."""
+    name: str
+    path: str
+    module: str
+    function: str
+    cache_path: str
+    output: Optional[str] = None  # where a streaming scraper's records go
+    memory_limit_mb: Optional[int] = None
+    cpu_limit: Optional[int] = None  # seconds of CPU time
+
+
+class WorkerCrashed(Exception):
+    """The worker process died without reporting a result."""
+
+
+class WorkerFailed(Exception):
+    """The scraper raised inside its worker; carries the worker's traffic counters."""
+
+    def __init__(self, message: str, counters: Dict[str, int]):
+        super().__init__(message)
+        self.counters = counters
+
+
+def _apply_limits(spec: WorkerSpec) -> None:
+    if resource is None:
+        return
+    if spec.memory_limit_mb:
+        limit = spec.memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if spec.cpu_limit:
+        # SIGXCPU at the soft limit, SIGKILL at the hard one
+        resource.setrlimit(resource.RLIMIT_CPU, (spec.cpu_limit, spec.cpu_limit + 5))
+
+
+def _worker_main(conn, spec: WorkerSpec) -> None:
+    """Entry point of the worker process: run the scraper and report over the pipe."""
+    from common.base import is_streaming, stream_to
+    from common.cache import HttpCache
+    from common.fetch import AsyncHttpClient, FetchContext, accepts_context
+    from common.http import HttpClient, RequestCounters, current_counters, set_client
+    from common.loader import ScraperLoader
+
+    counters = RequestCounters()
+    current_counters.set(counters)
+    try:
+        _apply_limits(spec)
+        client = HttpClient(cache=HttpCache(spec.cache_path))
+        set_client(client)
+
+        func = ScraperLoader().load(spec.name, spec.path, spec.module, spec.function).function
+
+        if is_streaming(func):
+            # Records are written where the orchestrator reads them; only the summary crosses the pipe
+            async def run_stream():
+                ctx = FetchContext(AsyncHttpClient(cache=client.cache, recorder=client.recorder), spec.name)
+                async with ctx:
+                    return await stream_to(spec.output, func, ctx)
+            result = asyncio.run(run_stream())
+        elif asyncio.iscoroutinefunction(func):
+            async def run_async():
+                ctx = FetchContext(AsyncHttpClient(cache=client.cache, recorder=client.recorder), spec.name)
+                async with ctx:
+                    return await (func(ctx) if accepts_context(func) else func())
+            result = asyncio.run(run_async())
+        else:
+            result = func()
+
+        try:
+            conn.send(("ok", result, asdict(counters)))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            conn.send(("ok", None, asdict(counters)))
+    except BaseException as e:
+        conn.send(("error", f"{type(e).__name__}: {e}", asdict(counters)))
+    finally:
+        conn.close()
+
+
+async def run_in_process(spec: WorkerSpec, timeout: float) -> Dict[str, Any]:
+    """Run a scraper in a killable worker process.
+
+    Returns ``{"result": ..., "counters": {...}}``. Raises asyncio.TimeoutError
+    after killing the worker if it overruns, so its sockets and memory are
+    released immediately, and re-raises scraper failures as WorkerFailed.
+    """
+    loop = asyncio.get_running_loop()
+    parent_conn, child_conn = _mp.Pipe(duplex=False)
+    process = _mp.Process(target=_worker_main, args=(child_conn, spec), name=f"scraper-{spec.name}", daemon=True)
+    process.start()
+    child_conn.close()
+
+    ready = loop.create_future()
+    try:
+        loop.add_reader(parent_conn.fileno(), lambda: ready.done() or ready.set_result(None))
+        watching = True
+    except (NotImplementedError, AttributeError):
+        # Event loops without add_reader (Windows proactor): poll from the default executor
+        watching = False
+        loop.run_in_executor(None, parent_conn.poll, timeout).add_done_callback(
+            lambda _: ready.done() or ready.set_result(None)
+        )
+
+    try:
+        await asyncio.wait_for(ready, timeout=timeout)
+        try:
+            status, payload, counters = parent_conn.recv()
+        except EOFError:
+            process.join(5)
+            raise WorkerCrashed(f"Worker for {spec.name} exited with code {process.exitcode} without a result")
+    except asyncio.TimeoutError:
+        process.kill()
+        raise
+    finally:
+        if watching:
+            loop.remove_reader(parent_conn.fileno())
+        parent_conn.close()
+        if process.is_alive():
+            process.kill()
+        await loop.run_in_executor(None, process.join, 5)
+
+    if status != "ok":
+        raise WorkerFailed(payload, counters)
+    return {"result": payload, "counters": counters}
+
+
+def worker_spec_for(name: str, base_path: Path, config, cache_path: Path,
+                    output: Optional[Path] = None) -> WorkerSpec:
+    """Build the worker spec for a ScraperConfig."""
+    return WorkerSpec(
+        name=name,
+        path=str(base_path / config.path),
+        module=config.module,
+        function=config.function,
+        cache_path=str(cache_path),
+        output=str(output) if output else None,
+        memory_limit_mb=config.memory_limit_mb,
+        cpu_limit=config.cpu_limit,
+    )
@@ -0,0 +1,143 @@
+import ast
+import builtins
+import hashlib
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType, ModuleType
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+
+def candidate_function_names(scraper_name: str, function_name: str) -> List[str]:
+    """Names tried, in order, when looking for a scraper's entry point."""
+    return [
+        function_name,
+        f"scrape_{scraper_name.lower().replace('-', '_').replace('_main', '')}",
+        f"scrape_{scraper_name.lower().replace('-', '_')}",
+        "main",
+        "scrape",
+        "run"
+    ]
+
+
+def find_entry_point(module: ModuleType, scraper_name: str, function_name: str) -> Optional[Callable]:
+    """Find the scraping function: the configured name first, then common fallbacks,
+    then a BaseScraper subclass the module defines."""
+    if hasattr(module, function_name):
+        return getattr(module, function_name)
+
+    for func_name in candidate_function_names(scraper_name, function_name):
+        func = getattr(module, func_name, None)
+        if callable(func):
+            return func
+
+    from common.base import BaseScraper
+    for value in vars(module).values():
+        if (isinstance(value, type) and issubclass(value, BaseScraper) and value is not BaseScraper
+                and value.__module__ == module.__name__):
+            return value
+    return None
+
+
+@dataclass
+class LoadedScraper:
+    module: ModuleType
+    function: Callable
+    is_script: bool  # module body is the entry point, run on call rather than on import
+    stat_key: Tuple[int, int]  # (mtime_ns, size) of the source when loaded
+    digest: str  # sha1 of the source
+
+
+def _top_level_functions(tree: ast.Module) -> List[str]:
+    return [node.name for node in tree.body if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+
+
+def scraper_classes(tree: ast.Module) -> List[str]:
+    """Top-level classes deriving from BaseScraper (by name, as far as the source shows)."""
+    return [node.name for node in tree.body if isinstance(node, ast.ClassDef)
+            and any((base.id if isinstance(base, ast.Name) else getattr(base, "attr", None)) == "BaseScraper"
+                    for base in node.bases)]
+
+
+def _script_entry_point(code: CodeType, path: Path) -> Callable[[], None]:
+    """Wrap a script's module body so it runs when called, like ``python main.py``."""
+    def run_script():
+        namespace = {"__name__": "__main__", "__file__": str(path), "__builtins__": builtins}
+        try:
+            exec(code, namespace)
+        except SystemExit as e:
+            # exit()/sys.exit(0) is how these scripts stop early; anything else is a failure
+            if e.code not in (None, 0):
+                raise RuntimeError(f"Script exited with status {e.code}") from None
+    run_script.__name__ = f"run_{path.parent.name}_script"
+    return run_script
+
+
+class ScraperLoader:
+    """Registry of compiled scrapers, reloaded only when their source changes.
+
+    Scrapers that define an entry point are imported once and the function is
+    reused. Scrapers written as plain scripts (all work at module level) are
+    compiled but *not* executed; their body becomes the entry point, so the
+    scrape happens under the orchestrator's timeout instead of during loading.
+    """
+
+    def __init__(self):
+        self._registry: Dict[str, LoadedScraper] = {}
+        self._lock = threading.Lock()
+
+    def load(self, scraper_name: str, path: Union[str, Path], module_name: str,
+             function_name: str) -> LoadedScraper:
+        path = Path(path)
+        stat = path.stat()
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._registry.get(scraper_name)
+            if cached is not None and cached.stat_key == stat_key:
+                return cached
+
+            source = path.read_bytes()
+            digest = hashlib.sha1(source).hexdigest()
+            if cached is not None and cached.digest == digest:
+                cached.stat_key = stat_key  # touched but unchanged
+                return cached
+
+            loaded = self._compile(scraper_name, path, module_name, function_name, source)
+            loaded.stat_key = stat_key
+            loaded.digest = digest
+            self._registry[scraper_name] = loaded
+            return loaded
+
+    def _compile(self, scraper_name: str, path: Path, module_name: str, function_name: str,
+                 source: bytes) -> LoadedScraper:
+        tree = ast.parse(source, filename=str(path))
+        code = compile(tree, str(path), "exec")
+        defined = set(_top_level_functions(tree))
+        classes = scraper_classes(tree)
+        has_entry_point = bool(classes) or any(
+            name in defined for name in candidate_function_names(scraper_name, function_name)
+        )
+
+        module = ModuleType(module_name)
+        module.__file__ = str(path)
+        if not has_entry_point:
+            return LoadedScraper(module, _script_entry_point(code, path), True, (0, 0), "")
+
+        sys.modules[module_name] = module
+        exec(code, module.__dict__)
+        func = find_entry_point(module, scraper_name, function_name)
+        if func is None:
+            raise LookupError(f"Scraping function not found in {scraper_name}. Tried: {function_name}")
+        return LoadedScraper(module, func, False, (0, 0), "")
+
+    def invalidate(self, scraper_name: Optional[str] = None) -> None:
+        with self._lock:
+            if scraper_name is None:
+                self._registry.clear()
+            else:
+                self._registry.pop(scraper_name, None)
+
+    def __contains__(self, scraper_name: str) -> bool:
+        return scraper_name in self._registry
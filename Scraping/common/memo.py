@@ -0,0 +1,239 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+MEMO_ENTRIES = 128  # pages kept per run
+MEMO_BYTES = 64 * 1024 * 1024  # bodies plus estimated tree sizes
+MEMO_TTL = 900  # seconds; bounds staleness when one orchestrator serves many runs (daemon)
+MAX_MEMO_BODY = 8 * 1024 * 1024  # larger bodies are shared while in flight but not kept
+TREE_WEIGHT = 8  # a parsed tree costs roughly this many times its page's size
+# Request headers that can change the answer; the rest (User-Agent, validators) are ignored
+VARY_HEADERS = ("accept", "accept-language", "authorization", "cookie", "range")
+
+# How once()/aonce() obtained the page
+FETCHED = "fetched"
+MEMOIZED = "memoized"  # completed earlier in the run
+COALESCED = "coalesced"  # joined another caller's in-flight request
+
+MemoKey = Tuple[str, bool, Tuple[Tuple[str, str], ...]]
+
+
+def memo_key(url: str, headers: Optional[Dict[str, str]] = None, allow_redirects: bool = True) -> MemoKey:
+    varying = tuple(sorted((k.lower(), str(v)) for k, v in (headers or {}).items() if k.lower() in VARY_HEADERS))
+    return url, allow_redirects, varying
+
+
+def _memoizable(status: int) -> bool:
+    # Transient answers are shared with concurrent callers but not kept for later ones
+    return status < 500 and status != 429
+
+
+@dataclass(eq=False)
+class MemoPage:
+    """A completed GET, in a form either HTTP client can rebuild its response type from."""
+    url: str
+    status: int
+    reason: str
+    final_url: str
+    headers: Dict[str, str]
+    content: bytes
+    from_cache: bool = False
+    not_modified: bool = False
+    stored_at: float = 0.0
+    kept: bool = False  # currently held by the LRU
+    trees: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def of(cls, url: str, response) -> "MemoPage":
+        return cls(url, response.status_code, response.reason or "", response.url or url, dict(response.headers),
+                   response.content, getattr(response, "from_cache", False),
+                   getattr(response, "not_modified", False), time.monotonic())
+
+    @property
+    def size(self) -> int:
+        return len(self.content) * (1 + TREE_WEIGHT * len(self.trees))
+
+
+class _Flight:
+    """One in-flight fetch that sync threads and coroutines on any loop can wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.page: Optional[MemoPage] = None
+        self.error: Optional[BaseException] = None
+        self.waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def outcome(self) -> MemoPage:
+        if self.error is not None:
+            raise self.error
+        return self.page
+
+
+class PageMemo:
+    """Per-run single-flight layer and bounded LRU of fetched pages and their parsed trees.
+
+    Shared by the sync and async clients: concurrent GETs of one URL share a
+    single request, and later GETs in the same run are answered from memory.
+    Parsed trees are kept with their page, so scrapers reading the same
+    listing don't parse it again. Trees are shared; treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int = MEMO_ENTRIES, max_bytes: int = MEMO_BYTES, ttl: float = MEMO_TTL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._pages: "OrderedDict[MemoKey, MemoPage]" = OrderedDict()
+        self._flights: Dict[MemoKey, _Flight] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _lookup(self, key: MemoKey) -> Optional[MemoPage]:
+        page = self._pages.get(key)
+        if page is None:
+            return None
+        if time.monotonic() - page.stored_at > self.ttl:
+            self._drop(key)
+            return None
+        self._pages.move_to_end(key)
+        return page
+
+    def _drop(self, key: MemoKey) -> None:
+        page = self._pages.pop(key)
+        page.kept = False
+        self._bytes -= page.size
+
+    def _trim(self) -> None:
+        while self._pages and (len(self._pages) > self.max_entries or self._bytes > self.max_bytes):
+            self._drop(next(iter(self._pages)))
+            self.evictions += 1
+
+    def _join(self, key: MemoKey) -> Tuple[Optional[MemoPage], Optional[_Flight], bool]:
+        """Under the lock: (memoized page, flight to wait on or lead, whether we lead it)."""
+        page = self._lookup(key)
+        if page is not None:
+            self.hits += 1
+            return page, None, False
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            return None, flight, False
+        flight = self._flights[key] = _Flight()
+        return None, flight, True
+
+    def _land(self, key: MemoKey, flight: _Flight, response: Any = None, error: Optional[BaseException] = None) -> None:
+        """Finish a flight: memoize its page and wake every waiter."""
+        with self._lock:
+            if error is None:
+                flight.page = MemoPage.of(key[0], response)
+                if _memoizable(flight.page.status) and len(flight.page.content) <= MAX_MEMO_BODY:
+                    if key in self._pages:
+                        self._drop(key)
+                    self._pages[key] = flight.page
+                    flight.page.kept = True
+                    self._bytes += flight.page.size
+                    self._trim()
+            else:
+                flight.error = error
+            del self._flights[key]
+            flight.done.set()
+            waiters, flight.waiters = flight.waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+
+    def peek(self, key: MemoKey) -> Optional[MemoPage]:
+        """The memoized page for ``key``, if any; never fetches or waits."""
+        with self._lock:
+            page = self._lookup(key)
+            if page is not None:
+                self.hits += 1
+            return page
+
+    def once(self, key: MemoKey, fetch: Callable[[], Any]) -> Tuple[Optional[Any], MemoPage, str]:
+        """Fetch ``key`` at most once per run from a sync caller.
+
+        Returns ``(response, page, how)``; ``response`` is the caller's own
+        response when it did the fetch, else None and it should rebuild one
+        from ``page``.
+        """
+        while True:
+            with self._lock:
+                page, flight, leader = self._join(key)
+            if page is not None:
+                return None, page, MEMOIZED
+            if leader:
+                break
+            flight.done.wait()
+            if not isinstance(flight.error, asyncio.CancelledError):
+                return None, flight.outcome(), COALESCED
+            # The leader was cancelled, not failed; fetch again ourselves
+        try:
+            response = fetch()
+        except BaseException as e:
+            self._land(key, flight, error=e)
+            raise
+        self._land(key, flight, response)
+        return response, flight.page, FETCHED
+
+    async def aonce(self, key: MemoKey, fetch: Callable[[], Awaitable[Any]]) -> Tuple[Optional[Any], MemoPage, str]:
+        """Coroutine counterpart of once()."""
+        while True:
+            with self._lock:
+                page, flight, leader = self._join(key)
+                if flight is not None and not leader:
+                    future = asyncio.get_running_loop().create_future()
+                    flight.waiters.append((asyncio.get_running_loop(), future))
+            if page is not None:
+                return None, page, MEMOIZED
+            if leader:
+                break
+            await future
+            if not isinstance(flight.error, asyncio.CancelledError):
+                return None, flight.outcome(), COALESCED
+        try:
+            response = await fetch()
+        except BaseException as e:
+            self._land(key, flight, error=e)
+            raise
+        self._land(key, flight, response)
+        return response, flight.page, FETCHED
+
+    def tree(self, page: MemoPage, kind: str, build: Callable[[], Any]) -> Any:
+        """Parsed form of ``page`` (e.g. a BeautifulSoup with ``kind`` features), built once per run."""
+        with self._lock:
+            if kind in page.trees:
+                return page.trees[kind]
+        tree = build()
+        with self._lock:
+            if kind in page.trees:
+                return page.trees[kind]  # another thread parsed it meanwhile
+            if page.kept:
+                self._bytes -= page.size
+            page.trees[kind] = tree
+            if page.kept:
+                self._bytes += page.size
+                self._trim()
+        return tree
+
+    def clear(self) -> None:
+        with self._lock:
+            for page in self._pages.values():
+                page.kept = False
+            self._pages.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"pages": len(self._pages), "bytes": self._bytes, "hits": self.hits,
+                    "coalesced": self.coalesced, "evictions": self.evictions}
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
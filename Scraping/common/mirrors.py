@@ -0,0 +1,333 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import urlsplit
+
+from common.autoindex import listing
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIRRORS_PATH = Path(__file__).resolve().parents[1] / ".state" / "mirrors.json"
+RANKING_TTL = 6 * 3600  # seconds a ranking is trusted before the mirrors are probed again
+FAILURE_COOLDOWN = 600  # seconds a mirror that failed a routed request is passed over
+PROBE_TIMEOUT = 8
+PROBE_BYTES = 256 * 1024  # ranged read of a sample file, for throughput
+MAX_CANDIDATES = 8  # mirrors probed per network, origin included
+FAILOVER_STATUSES = (404, 410, 429, 500, 502, 503, 504)  # answers that send a request on to the next mirror
+MISSING_STATUSES = (404, 410)  # a lagging mirror, or a URL probed on purpose: no cooldown for the mirror
+
+_METALINK_URL = "{urn:ietf:params:xml:ns:metalink}url"
+
+
+@dataclass
+class MirrorNetwork:
+    """A download host whose tree is replicated on mirrors with the same layout."""
+    origin: str  # base URL the scrapers use
+    seeds: List[str] = field(default_factory=list)  # known mirror base URLs
+    probe: str = ""  # directory under the base every mirror carries; listed to time and compare mirrors
+    metalink: bool = False  # the origin answers <file>.meta4 with the mirrors carrying that file
+
+
+# Seeds are only candidates: a mirror is used once a probe shows it answering with an up-to-date listing
+NETWORKS = [
+    MirrorNetwork("https://download.videolan.org/",
+                  ["https://ftp.fau.de/videolan/", "https://ftp.osuosl.org/pub/videolan/"],
+                  probe="vlc/", metalink=True),
+    MirrorNetwork("https://download.documentfoundation.org/", probe="libreoffice/stable/", metalink=True),
+    MirrorNetwork("https://download-installer.cdn.mozilla.net/",
+                  ["https://archive.mozilla.org/", "https://ftp.mozilla.org/"],
+                  probe="pub/thunderbird/releases/"),
+    MirrorNetwork("https://2.na.dl.wireshark.org/",
+                  ["https://1.na.dl.wireshark.org/", "https://1.eu.dl.wireshark.org/"],
+                  probe="src/"),
+]
+
+
+@dataclass
+class MirrorStats:
+    base: str
+    latency: Optional[float] = None  # seconds to fetch the probe listing
+    throughput: Optional[float] = None  # bytes/s of the probe read
+    healthy: bool = False  # answered, with a listing at least as new as the origin's
+    error: Optional[str] = None
+    failed_at: Optional[float] = None  # epoch seconds a routed request last failed here
+
+
+@dataclass
+class Ranking:
+    origin: str
+    mirrors: List[MirrorStats] = field(default_factory=list)
+    ranked_at: float = 0.0
+    discovered: List[str] = field(default_factory=list)  # bases learnt from metalinks and redirects
+    sample: Optional[str] = None  # path of a file under the origin, for metalinks and throughput probes
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Ranking":
+        data = dict(data)
+        data["mirrors"] = [MirrorStats(**stats) for stats in data.get("mirrors", [])]
+        return cls(**data)
+
+
+def _timed_get(client, url: str, **kwargs):
+    start = time.perf_counter()
+    response = client.request("GET", url, route=False, timeout=PROBE_TIMEOUT, **kwargs)
+    content = response.content
+    return response, content, time.perf_counter() - start
+
+
+def metalink_mirrors(text: Union[str, bytes], origin: str, path: str) -> List[str]:
+    """Base URLs of the mirrors a metalink lists for ``origin + path``, by priority."""
+    try:
+        root = ElementTree.fromstring(text)
+    except ElementTree.ParseError:
+        return []
+    urls = []
+    for element in root.iter(_METALINK_URL):
+        url = (element.text or "").strip()
+        priority = int(element.get("priority", "999999"))
+        if url.endswith(path) and url.startswith(("http://", "https://")):
+            urls.append((priority, url[:len(url) - len(path)]))
+    return [base for _, base in sorted(urls) if base != origin]
+
+
+class MirrorRouter:
+    """Routes requests for mirror-network hosts to their fastest healthy mirror.
+
+    Each network is ranked lazily, on its first routed request once the
+    ranking is older than RANKING_TTL. Candidates are the seeds, the mirrors
+    a metalink lists for a file seen under the origin, and the hosts the
+    origin redirected to. Every candidate lists the network's probe
+    directory; one answering with fewer entries than the origin is behind and
+    is not used. Listings (URLs ending in "/") go to the lowest-latency
+    mirror, files to the highest-throughput one. A request that fails or gets
+    a FAILOVER_STATUSES answer moves on to the next mirror and finally the
+    origin; unless the file was just missing, the failed mirror is passed
+    over for FAILURE_COOLDOWN seconds.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_MIRRORS_PATH, networks: Optional[List[MirrorNetwork]] = None,
+                 client=None, ttl: float = RANKING_TTL):
+        self.path = Path(path)
+        self.networks = list(NETWORKS if networks is None else networks)
+        self.ttl = ttl
+        self._client = client
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # one save at a time, so the newest snapshot is the one kept
+        self._ranking_locks = {network.origin: threading.Lock() for network in self.networks}
+        self.rankings: Dict[str, Ranking] = {}
+        self.routed = 0
+        self.failovers = 0
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.rankings = {origin: Ranking.from_dict(ranking) for origin, ranking in data.items()}
+        except (OSError, ValueError, TypeError):
+            pass
+
+    @property
+    def client(self):
+        from common.http import get_client
+        return self._client or get_client()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._save_lock:
+            with self._lock:
+                data = {origin: asdict(ranking) for origin, ranking in self.rankings.items()}
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f"{self.path.stem}.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data, indent=1))
+            os.replace(tmp, self.path)
+
+    def network_for(self, url: str) -> Optional[MirrorNetwork]:
+        return next((network for network in self.networks if url.startswith(network.origin)), None)
+
+    def _ranking(self, network: MirrorNetwork) -> Ranking:
+        with self._lock:
+            return self.rankings.setdefault(network.origin, Ranking(network.origin))
+
+    def stale(self, network: MirrorNetwork) -> bool:
+        return time.time() - self._ranking(network).ranked_at >= self.ttl
+
+    # --- ranking ---------------------------------------------------------------------------------------------
+
+    def _candidates(self, network: MirrorNetwork, ranking: Ranking) -> List[str]:
+        bases = [network.origin, *network.seeds, *ranking.discovered]
+        if network.metalink and ranking.sample:
+            try:
+                response, content, _ = _timed_get(self.client, network.origin + ranking.sample + ".meta4")
+                if response.status_code == 200:
+                    bases.extend(metalink_mirrors(content, network.origin, ranking.sample))
+            except Exception as e:
+                logger.debug(f"Metalink for {network.origin}{ranking.sample} failed: {e}")
+        return list(dict.fromkeys(bases))[:MAX_CANDIDATES]
+
+    def _probe(self, network: MirrorNetwork, base: str, sample: Optional[str]) -> Tuple[MirrorStats, Set[str]]:
+        stats = MirrorStats(base)
+        names: Set[str] = set()
+        try:
+            response, content, elapsed = _timed_get(self.client, base + network.probe)
+            if response.status_code != 200:
+                raise ValueError(f"probe listing answered {response.status_code}")
+            names = {entry.name for entry in listing(response, base + network.probe)}
+            if not names:
+                raise ValueError("probe listing is empty")
+            stats.latency, stats.throughput = elapsed, len(content) / max(elapsed, 1e-6)
+            if sample:
+                response, content, elapsed = _timed_get(self.client, base + sample,
+                                                        headers={"Range": f"bytes=0-{PROBE_BYTES - 1}"})
+                if response.status_code in (200, 206) and content:
+                    stats.throughput = len(content) / max(elapsed, 1e-6)
+            stats.healthy = True
+        except Exception as e:
+            stats.error = str(e) or type(e).__name__
+        return stats, names
+
+    def rank(self, network: MirrorNetwork) -> Ranking:
+        """Probe the network's candidate mirrors now and store the ranking."""
+        ranking = self._ranking(network)
+        bases = self._candidates(network, ranking)
+        with ThreadPoolExecutor(max_workers=len(bases)) as pool:
+            probed = list(pool.map(lambda base: self._probe(network, base, ranking.sample), bases))
+        # Mirrors are judged against the origin's listing; without one, against the fullest listing any
+        # mirror returned, so an unreachable origin doesn't make every stale mirror look current
+        origin_stats, origin_names = probed[0]
+        reference = origin_names if origin_stats.healthy else max((names for _, names in probed), key=len)
+        behind = "the origin" if origin_stats.healthy else "the fullest mirror"
+        for stats, names in probed[1:]:
+            missing = reference - names
+            if stats.healthy and missing:
+                stats.healthy, stats.error = False, f"behind {behind}: {len(missing)} entries missing"
+        ranking.mirrors = [stats for stats, _ in probed]
+        ranking.ranked_at = time.time()
+        healthy = [stats.base for stats in ranking.mirrors if stats.healthy]
+        logger.info(f"Ranked {len(bases)} mirrors of {network.origin}: {len(healthy)} healthy")
+        self.save()
+        return ranking
+
+    def ensure_ranked(self, network: MirrorNetwork) -> Ranking:
+        """The network's ranking, probing first if it is stale; concurrent callers wait for one probe."""
+        if self.stale(network):
+            with self._ranking_locks[network.origin]:
+                if self.stale(network):
+                    try:
+                        return self.rank(network)
+                    except Exception as e:
+                        logger.warning(f"Ranking mirrors of {network.origin} failed: {e}")
+                        self._ranking(network).ranked_at = time.time()  # keep routing to the origin until the TTL
+        return self._ranking(network)
+
+    # --- routing ---------------------------------------------------------------------------------------------
+
+    def targets(self, url: str) -> List[str]:
+        """URLs to try for ``url``, best mirror first and ``url`` itself last."""
+        network = self.network_for(url)
+        if network is None:
+            return [url]
+        ranking = self._ranking(network)
+        path = url[len(network.origin):]
+        now = time.time()
+        usable = [stats for stats in ranking.mirrors
+                  if stats.healthy and (stats.failed_at is None or now - stats.failed_at >= FAILURE_COOLDOWN)]
+        if path.split("?", 1)[0].endswith("/") or not path:
+            usable.sort(key=lambda stats: stats.latency or float("inf"))
+        else:
+            usable.sort(key=lambda stats: -(stats.throughput or 0.0))
+        bases = [stats.base for stats in usable if stats.base != network.origin]
+        return [base + path for base in bases] + [url]
+
+    def _base_of(self, target: str) -> Optional[MirrorStats]:
+        for ranking in self.rankings.values():
+            for stats in ranking.mirrors:
+                if target.startswith(stats.base) and stats.base != ranking.origin:
+                    return stats
+        return None
+
+    def failed(self, target: str, reason: Any) -> None:
+        stats = self._base_of(target)
+        if stats is not None and reason not in MISSING_STATUSES:
+            stats.failed_at = time.time()
+            stats.error = str(reason)
+        self.failovers += 1
+        logger.info(f"Mirror request {target} failed ({reason}), trying the next mirror")
+
+    def observe(self, url: str, final_url: Optional[str]) -> None:
+        """Learn from a routed request: a file to sample, and mirrors the origin redirects to."""
+        network = self.network_for(url)
+        if network is None:
+            return
+        ranking = self._ranking(network)
+        path = url[len(network.origin):]
+        if path and not path.endswith("/") and "?" not in path:
+            ranking.sample = path
+        if final_url and final_url != url and final_url.endswith(path) and path:
+            base = final_url[:len(final_url) - len(path)]
+            if urlsplit(base).netloc != urlsplit(network.origin).netloc and base not in ranking.discovered:
+                with self._lock:
+                    ranking.discovered.append(base)
+
+    def _accept(self, url: str, target: str, response) -> bool:
+        if target != url and response.status_code in FAILOVER_STATUSES:
+            self.failed(target, response.status_code)
+            close = getattr(response, "close", None)
+            if close is not None:
+                close()
+            return False
+        self.routed += target != url
+        self.observe(url, getattr(response, "url", None) if target == url else None)
+        return True
+
+    def call(self, url: str, send: Callable[[str], Any]) -> Any:
+        """``send(target)`` for each of the targets of ``url`` until a mirror (or the origin) answers."""
+        network = self.network_for(url)
+        if network is not None:
+            self.ensure_ranked(network)
+        targets = self.targets(url)
+        for target in targets[:-1]:
+            try:
+                response = send(target)
+            except Exception as e:
+                self.failed(target, e)
+                continue
+            if self._accept(url, target, response):
+                return response
+        response = send(url)
+        self._accept(url, url, response)
+        return response
+
+    async def acall(self, url: str, send: Callable[[str], Awaitable[Any]]) -> Any:
+        """Coroutine counterpart of call(); a stale ranking is probed off the event loop."""
+        network = self.network_for(url)
+        if network is not None and self.stale(network):
+            await asyncio.get_running_loop().run_in_executor(None, self.ensure_ranked, network)
+        targets = self.targets(url)
+        for target in targets[:-1]:
+            try:
+                response = await send(target)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed(target, e)
+                continue
+            if self._accept(url, target, response):
+                return response
+        response = await send(url)
+        self._accept(url, url, response)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        best = {}
+        for origin, ranking in self.rankings.items():
+            healthy = [stats for stats in ranking.mirrors if stats.healthy and stats.base != origin
+                       and (stats.failed_at is None or time.time() - stats.failed_at >= FAILURE_COOLDOWN)]
+            if healthy:
+                best[origin] = max(healthy, key=lambda stats: stats.throughput or 0.0).base
+        return {"routed": self.routed, "failovers": self.failovers, "fastest": best}
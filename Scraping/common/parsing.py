@@ -0,0 +1,73 @@
+import re
+from typing import Any, Iterable, Optional, Union
+
+_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+_backend: Optional[str] = None
+
+Only = Union[None, str, Iterable[str], Any]  # tag name(s) or a bs4 SoupStrainer
+
+
+def html_backend() -> str:
+    """Fastest tree builder installed: lxml when it imports, else the stdlib html.parser."""
+    global _backend
+    if _backend is None:
+        try:
+            import lxml.etree  # noqa: F401
+            _backend = "lxml"
+        except ImportError:
+            _backend = "html.parser"
+    return _backend
+
+
+def declared_encoding(response) -> Optional[str]:
+    """Charset from the Content-Type header, or None to let the parser sniff <meta> / BOM."""
+    match = _CHARSET_RE.search(response.headers.get("Content-Type", "") or "")
+    return match.group(1) if match else None
+
+
+def _strainer(only: Only):
+    if only is None:
+        return None
+    from bs4 import SoupStrainer
+    if isinstance(only, SoupStrainer):
+        return only
+    return SoupStrainer(only if isinstance(only, str) else list(only))
+
+
+def _tree_key(features: str, only: Only) -> Optional[str]:
+    """Memo key for trees built from tag names; custom strainers aren't shared."""
+    if only is None or isinstance(only, str):
+        return f"{features}:{only or '*'}"
+    if isinstance(only, (list, tuple)) and all(isinstance(name, str) for name in only):
+        return f"{features}:{','.join(only)}"
+    return None
+
+
+def parse_html(source, only: Only = None, features: Optional[str] = None):
+    """Parse a response (or raw bytes/str) into a BeautifulSoup tree.
+
+    Bytes go to the parser with the charset the server declared, so nothing
+    is decoded twice. ``only`` restricts the tree to some tags, e.g.
+    ``only="a"`` or ``only=SoupStrainer("script", type="application/ld+json")``;
+    everything else is skipped while parsing. Navigating above a kept tag
+    (find_parent) therefore only works without ``only``. ``features``
+    defaults to html_backend(). Trees of memoized responses are built once
+    per run and shared; treat them as read-only.
+    """
+    from bs4 import BeautifulSoup
+
+    features = features or html_backend()
+    if isinstance(source, (bytes, str)):
+        content, encoding, memo, page = source, None, None, None
+    else:
+        content, encoding = source.content, declared_encoding(source)
+        memo, page = getattr(source, "memo", None), getattr(source, "memo_page", None)
+
+    def build():
+        kwargs = {"from_encoding": encoding} if encoding and isinstance(content, bytes) else {}
+        return BeautifulSoup(content, features, parse_only=_strainer(only), **kwargs)
+
+    key = _tree_key(features, only)
+    if memo is None or page is None or key is None:
+        return build()
+    return memo.tree(page, key, build)
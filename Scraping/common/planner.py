@@ -0,0 +1,113 @@
+import heapq
+import json
+import os
+import threading
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Optional, Union
+
+DEFAULT_HISTORY_PATH = Path(__file__).resolve().parents[1] / ".state" / "durations.json"
+DEFAULT_EXPECTED = 30.0  # seconds, for a scraper with no history and nothing to compare with
+HISTORY_ALPHA = 0.3  # weight of the newest run in the moving average
+
+
+@dataclass
+class DurationRecord:
+    expected: float  # exponentially weighted moving average of run durations
+    last: float
+    runs: int = 1
+    failures: int = 0
+
+
+class DurationHistory:
+    """Per-scraper run durations, persisted as JSON between orchestrator runs."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_HISTORY_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.records: Dict[str, DurationRecord] = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.records = {name: DurationRecord(**record) for name, record in data.items()}
+        except (OSError, ValueError, TypeError):
+            pass  # no history yet, or unreadable: plan as if every scraper were new
+
+    def record(self, name: str, duration: float, success: bool) -> None:
+        """Fold one run into the average and persist. Failed runs count too: they cost wall time."""
+        with self._lock:
+            record = self.records.get(name)
+            if record is None:
+                record = self.records[name] = DurationRecord(expected=duration, last=duration, runs=0)
+            else:
+                record.expected = HISTORY_ALPHA * duration + (1 - HISTORY_ALPHA) * record.expected
+            record.last = duration
+            record.runs += 1
+            record.failures += 0 if success else 1
+            self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({name: asdict(r) for name, r in self.records.items()}, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def expected(self, name: str) -> float:
+        """Expected duration; scrapers never seen before get the median of those that have been."""
+        record = self.records.get(name)
+        if record is not None:
+            return record.expected
+        known = [r.expected for r in self.records.values()]
+        return median(known) if known else DEFAULT_EXPECTED
+
+
+@dataclass
+class RunPlan:
+    order: List[str]  # start order
+    expected: Dict[str, float]
+    finish: Dict[str, float] = field(default_factory=dict)  # simulated finish time per scraper
+    skipped: List[str] = field(default_factory=list)  # left out to stay within the time budget
+    makespan: float = 0.0
+
+
+def simulate(order: List[str], expected: Dict[str, float], group_of: Dict[str, str],
+             group_lanes: Dict[str, int], parallelism: int) -> Dict[str, float]:
+    """Finish time of each scraper if started in ``order`` as soon as a global and a group lane free up."""
+    lanes = [0.0] * parallelism
+    groups: Dict[str, List[float]] = {group: [0.0] * n for group, n in group_lanes.items()}
+    finish = {}
+    for name in order:
+        group = groups[group_of[name]]
+        start = max(lanes[0], group[0])
+        end = start + expected[name]
+        heapq.heapreplace(lanes, end)
+        heapq.heapreplace(group, end)
+        finish[name] = end
+    return finish
+
+
+def plan_run(names: List[str], priorities: Dict[str, int], history: DurationHistory,
+             group_of: Dict[str, str], group_lanes: Dict[str, int], parallelism: int,
+             time_budget: Optional[float] = None) -> RunPlan:
+    """Order scrapers longest-expected-first within each priority tier.
+
+    Starting the long crawlers first keeps them from setting the makespan by
+    starting last. With ``time_budget``, scrapers are admitted tier by tier and
+    one is skipped when its simulated finish would land past the budget.
+    """
+    expected = {name: history.expected(name) for name in names}
+    order = sorted(names, key=lambda name: (priorities[name], -expected[name], name))
+
+    skipped: List[str] = []
+    if time_budget is not None:
+        admitted: List[str] = []
+        for name in order:
+            if simulate(admitted + [name], expected, group_of, group_lanes, parallelism)[name] <= time_budget:
+                admitted.append(name)
+            else:
+                skipped.append(name)
+        order = admitted
+
+    finish = simulate(order, expected, group_of, group_lanes, parallelism)
+    return RunPlan(order=order, expected=expected, finish=finish, skipped=skipped,
+                   makespan=max(finish.values(), default=0.0))
@@ -0,0 +1,160 @@
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+DEFAULT_POINTERS_PATH = Path(__file__).resolve().parents[1] / ".state" / "versions.json"
+POINTER_TTL = 6 * 3600  # seconds a resolved version is trusted before probing again
+
+_HREF_RE = re.compile(r"""href\s*=\s*["']?([^"'\s>]+)""", re.IGNORECASE)
+
+
+def version_key(version: str) -> Tuple[int, ...]:
+    """Sort key comparing versions numerically: 3.0.21 > 3.0.9."""
+    return tuple(int(part) for part in re.findall(r"\d+", version))
+
+
+def newest(versions: Iterable[str]) -> Optional[str]:
+    return max(versions, key=version_key, default=None)
+
+
+def versions_in_listing(html: str, pattern: str) -> List[str]:
+    """Versions captured by ``pattern``'s first group from the hrefs of a directory listing."""
+    regex = re.compile(pattern)
+    found = []
+    for href in _HREF_RE.findall(html):
+        match = regex.fullmatch(href)
+        if match:
+            found.append(match.group(1))
+    return found
+
+
+def latest_in_listing(html: str, pattern: str) -> Optional[str]:
+    return newest(versions_in_listing(html, pattern))
+
+
+def latest_github_tag(repo: str) -> str:
+    """Tag of the latest GitHub release of ``owner/name`` (batched or one ETag-revalidated API call)."""
+    from common.github import get_github
+    return get_github().latest(repo).tag
+
+
+def redirect_version(url: str, pattern: str) -> str:
+    """Follow a "latest" download redirect with HEAD and pull the version out of where it lands."""
+    from common.http import get_client
+    response = get_client().head(url)
+    match = re.search(pattern, response.url)
+    if not match:
+        raise LookupError(f"No version in redirect target {response.url}")
+    return match.group(1)
+
+
+@dataclass
+class VersionPointer:
+    version: str
+    resolved_at: float  # epoch seconds
+    scraped: Optional[str] = None  # version the last successful full scrape saw
+
+
+class VersionPointers:
+    """Cached "current version" per product, resolved by the product's probe.
+
+    Replaces versions pinned in scraper code: the pointer is resolved once per
+    POINTER_TTL and shared by the orchestrator's change check and the scraper
+    itself, so a run that probes first doesn't resolve the version twice.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_POINTERS_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.pointers: Dict[str, VersionPointer] = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.pointers = {name: VersionPointer(**record) for name, record in data.items()}
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({name: asdict(p) for name, p in self.pointers.items()}, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def get(self, name: str) -> Optional[VersionPointer]:
+        return self.pointers.get(name)
+
+    def set(self, name: str, version: str) -> None:
+        with self._lock:
+            pointer = self.pointers.get(name)
+            scraped = pointer.scraped if pointer else None
+            self.pointers[name] = VersionPointer(version, time.time(), scraped)
+            self._save()
+
+    def mark_scraped(self, name: str, version: str) -> None:
+        """Record that a full scrape succeeded while ``version`` was current."""
+        with self._lock:
+            pointer = self.pointers.get(name) or VersionPointer(version, time.time())
+            pointer.scraped = version
+            self.pointers[name] = pointer
+            self._save()
+
+    def _fresh(self, name: str, max_age: float) -> Optional[str]:
+        pointer = self.pointers.get(name)
+        if pointer is not None and time.time() - pointer.resolved_at < max_age:
+            return pointer.version
+        return None
+
+    def _fallback(self, name: str, fallback: Optional[str], error: Exception) -> str:
+        pointer = self.pointers.get(name)
+        if pointer is not None:
+            return pointer.version  # stale beats pinned
+        if fallback is not None:
+            return fallback
+        raise LookupError(f"Could not resolve the current {name} version: {error}") from error
+
+    def resolve(self, name: str, probe: Callable[[], str], fallback: Optional[str] = None,
+                max_age: float = POINTER_TTL) -> str:
+        version = self._fresh(name, max_age)
+        if version is not None:
+            return version
+        try:
+            version = probe()
+        except Exception as e:
+            return self._fallback(name, fallback, e)
+        self.set(name, version)
+        return version
+
+    async def aresolve(self, name: str, probe: Callable[[], Awaitable[str]], fallback: Optional[str] = None,
+                       max_age: float = POINTER_TTL) -> str:
+        version = self._fresh(name, max_age)
+        if version is not None:
+            return version
+        try:
+            version = await probe()
+        except Exception as e:
+            return self._fallback(name, fallback, e)
+        self.set(name, version)
+        return version
+
+
+_pointers: Optional[VersionPointers] = None
+_pointers_lock = threading.Lock()
+
+
+def get_pointers() -> VersionPointers:
+    """Process-wide pointer store; the orchestrator installs its own with set_pointers()."""
+    global _pointers
+    with _pointers_lock:
+        if _pointers is None:
+            _pointers = VersionPointers()
+        return _pointers
+
+
+def set_pointers(pointers: VersionPointers) -> None:
+    global _pointers
+    with _pointers_lock:
+        _pointers = pointers
@@ -0,0 +1,361 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Starting point for a host we know nothing about; AIMD moves it from here
+INITIAL_LIMIT = 2
+MIN_LIMIT = 1
+MAX_LIMIT = 8
+DEFAULT_RATE = 5.0  # requests per second, refilled continuously
+DEFAULT_BURST = 5
+# A response slower than this multiple of the host's best latency counts as congestion
+LATENCY_FACTOR = 3.0
+BACKOFF = 0.5  # multiplicative decrease
+EWMA_ALPHA = 0.2
+THROTTLE_STATUSES = (429, 503)
+MAX_RETRY_AFTER = 60.0  # seconds; ignore longer server-requested pauses
+
+
+def site_of(url_or_host: str) -> str:
+    """Key hosts by registrable domain so api.github.com and github.com share one budget."""
+    host = urlsplit(url_or_host).hostname if "://" in url_or_host else url_or_host
+    host = (host or "").lower().rstrip(".")
+    if ":" in host or host.replace(".", "").isdigit():
+        return host  # IP literal
+    labels = host.split(".")
+    if len(labels) > 2 and len(labels[-1]) == 2 and len(labels[-2]) <= 3:
+        return ".".join(labels[-3:])  # greenend.org.uk, not org.uk
+    return ".".join(labels[-2:])
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return min(MAX_RETRY_AFTER, max(0.0, float(value))) if value else None
+    except ValueError:
+        return None  # HTTP-date form; fall back to the normal backoff
+
+
+@dataclass
+class Permit:
+    """A granted request slot; the caller fills in the outcome before releasing it."""
+    site: str
+    started: float
+    status: Optional[int] = None
+    retry_after: Optional[str] = None
+    headers: Optional[Mapping[str, str]] = None  # response headers, for rate-limit budgets
+
+
+class BudgetExhausted(Exception):
+    """An API host's rate limit is used up until its window resets."""
+
+    def __init__(self, host: str, reset_at: Optional[float]):
+        self.host = host
+        self.reset_at = reset_at
+        wait = f" for {max(0, int(reset_at - time.time()))}s" if reset_at else ""
+        super().__init__(f"Rate limit of {host} exhausted{wait}")
+
+
+class RateBudget:
+    """Requests an API host still allows in one rate-limit window.
+
+    Follows the host's own ``X-RateLimit-Limit/Remaining/Reset`` headers, so
+    answers the host doesn't charge for (such as GitHub's 304s to conditional
+    requests) don't use the budget up. Requests in flight are counted
+    against it until their answer arrives. Once nothing is left, requests
+    fail fast with BudgetExhausted instead of waiting out a window that can
+    last an hour.
+    """
+
+    def __init__(self, host: str, resource: str = ""):
+        self.host = host
+        self.resource = resource  # X-RateLimit-Resource, for hosts with several buckets ("core", "graphql")
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None  # epoch seconds
+        self.in_flight = 0
+        self.refused = 0
+        self._lock = threading.Lock()
+
+    def admit(self) -> None:
+        with self._lock:
+            if self.reset_at is not None and time.time() >= self.reset_at:
+                self.remaining = self.reset_at = None  # new window; the next answer tells how much is left
+            if self.remaining is not None and self.remaining - self.in_flight <= 0:
+                self.refused += 1
+                raise BudgetExhausted(self.host, self.reset_at)
+            self.in_flight += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        try:
+            remaining = int(headers["x-ratelimit-remaining"])
+            limit = int(headers.get("x-ratelimit-limit") or remaining)
+            reset_at = float(headers["x-ratelimit-reset"]) if headers.get("x-ratelimit-reset") else None
+        except (KeyError, ValueError):
+            return
+        with self._lock:
+            self.remaining, self.limit, self.reset_at = remaining, limit, reset_at
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"limit": self.limit, "remaining": self.remaining, "reset_at": self.reset_at,
+                "refused": self.refused}
+
+
+class HostLimiter:
+    """Concurrency limit plus token bucket for one site, tuned AIMD-style.
+
+    Each fast, successful response raises the concurrency limit by 1/limit
+    (about +1 per round trip of the whole window); errors, 429/503 and
+    responses much slower than the site's best observed latency halve it.
+    A ``Retry-After`` empties the token bucket for that long.
+    """
+
+    def __init__(self, site: str, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 initial_limit: int = INITIAL_LIMIT, max_limit: int = MAX_LIMIT):
+        self.site = site
+        self.rate = rate
+        self.burst = burst
+        self.max_limit = max_limit
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.tokens = float(burst)
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.latency: Optional[float] = None  # EWMA of successful request latency
+        self.best_latency: Optional[float] = None
+        self._refilled = time.monotonic()
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    def _try_acquire(self, now: float) -> float:
+        """Take a slot and a token if possible. Returns 0 on success, else seconds to wait (-1: until a release)."""
+        self.tokens = min(self.burst, self.tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        if self.in_flight >= int(self.limit):
+            return -1
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        self.tokens -= 1
+        self.in_flight += 1
+        self.requests += 1
+        return 0
+
+    def acquire(self) -> None:
+        with self._cond:
+            while True:
+                wait = self._try_acquire(time.monotonic())
+                if wait == 0:
+                    return
+                self._cond.wait(None if wait < 0 else wait)
+
+    async def acquire_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                wait = self._try_acquire(time.monotonic())
+                if wait == 0:
+                    return
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter), None if wait < 0 else wait)
+            except asyncio.TimeoutError:
+                pass  # tokens have refilled; try again
+            finally:
+                with self._cond:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+
+    def release(self, latency: float, ok: bool, throttled: bool = False,
+                retry_after: Optional[float] = None) -> None:
+        now = time.monotonic()
+        with self._cond:
+            self.in_flight -= 1
+            congested = not ok or throttled
+            if ok:
+                self.latency = latency if self.latency is None else (
+                    EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency
+                )
+                self.best_latency = latency if self.best_latency is None else min(self.best_latency, latency)
+                congested = congested or latency > LATENCY_FACTOR * max(self.best_latency, 0.05)
+            else:
+                self.errors += 1
+            if throttled:
+                self.throttled += 1
+                if retry_after:
+                    self.tokens = -retry_after * self.rate
+                    self._refilled = now
+
+            if congested:
+                # Halve at most once per window, or one slow burst would collapse the limit to 1
+                if now - self._last_decrease > (self.latency or 1.0):
+                    self.limit = max(MIN_LIMIT, self.limit * BACKOFF)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+            self._cond.notify_all()
+            waiters, self._waiters = self._waiters, deque()
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(lambda w=waiter: w.done() or w.set_result(None))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "avg_latency": round(self.latency, 3) if self.latency is not None else None,
+        }
+
+
+class HostScheduler:
+    """Per-site request admission shared by the sync and async HTTP clients.
+
+    Threads and coroutines hitting the same site queue on one HostLimiter, so
+    github.com sees a single, adaptive budget no matter how many scrapers use it.
+    Hosts that announce a rate limit (``X-RateLimit-*`` headers) also get a
+    RateBudget, tracked per host since api.github.com's limit doesn't apply
+    to github.com pages, and per bucket when the host names one: requests
+    are charged to the bucket earlier answers from the same top-level path
+    (/graphql, /repos) reported.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST, max_limit: int = MAX_LIMIT):
+        self.rate = rate
+        self.burst = burst
+        self.max_limit = max_limit
+        self._limiters: Dict[str, HostLimiter] = {}
+        self._overrides: Dict[str, Dict[str, Any]] = {}
+        self._budgets: Dict[Tuple[str, str], RateBudget] = {}
+        self._resources: Dict[Tuple[str, str], str] = {}  # (host, first path segment) -> rate-limit bucket
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, **settings) -> None:
+        """Override rate/burst/max_limit/initial_limit for one site."""
+        site = site_of(host)
+        with self._lock:
+            self._overrides[site] = settings
+            self._limiters.pop(site, None)
+
+    def limiter(self, url: str) -> HostLimiter:
+        site = site_of(url)
+        with self._lock:
+            limiter = self._limiters.get(site)
+            if limiter is None:
+                settings = {"rate": self.rate, "burst": self.burst, "max_limit": self.max_limit}
+                settings.update(self._overrides.get(site, {}))
+                limiter = self._limiters[site] = HostLimiter(site, **settings)
+            return limiter
+
+    @staticmethod
+    def _route(url: str) -> Tuple[str, str]:
+        parts = urlsplit(url)
+        return (parts.hostname or "").lower(), parts.path.lstrip("/").split("/", 1)[0]
+
+    def budget(self, url: str) -> Optional[RateBudget]:
+        """Rate-limit budget ``url`` is charged to, once its host has announced one."""
+        route = self._route(url)
+        with self._lock:
+            return self._budgets.get((route[0], self._resources.get(route, "")))
+
+    def _admit(self, url: str) -> Optional[RateBudget]:
+        budget = self.budget(url)
+        if budget is not None:
+            budget.admit()
+        return budget
+
+    def _finish(self, limiter: HostLimiter, permit: Permit, ok: bool, url: str,
+                budget: Optional[RateBudget]) -> None:
+        if budget is not None:
+            budget.release()
+        headers = permit.headers
+        if headers is not None and headers.get("x-ratelimit-remaining") is not None:
+            route = self._route(url)
+            resource = headers.get("x-ratelimit-resource") or ""
+            with self._lock:
+                self._resources[route] = resource
+                key = (route[0], resource)
+                budget = self._budgets.get(key) or self._budgets.setdefault(key, RateBudget(*key))
+            budget.update(headers)
+        status = permit.status
+        throttled = status in THROTTLE_STATUSES
+        ok = ok and status is not None and status < 500
+        limiter.release(time.monotonic() - permit.started, ok, throttled, _retry_after(permit.retry_after))
+
+    @contextmanager
+    def slot(self, url: str):
+        limiter = self.limiter(url)
+        budget = self._admit(url)
+        limiter.acquire()
+        permit = Permit(limiter.site, time.monotonic())
+        ok = False
+        try:
+            yield permit
+            ok = True
+        finally:
+            self._finish(limiter, permit, ok, url, budget)
+
+    @asynccontextmanager
+    async def aslot(self, url: str):
+        limiter = self.limiter(url)
+        budget = self._admit(url)
+        try:
+            await limiter.acquire_async()
+        except BaseException:
+            if budget is not None:
+                budget.release()
+            raise
+        permit = Permit(limiter.site, time.monotonic())
+        ok = False
+        try:
+            yield permit
+            ok = True
+        finally:
+            self._finish(limiter, permit, ok, url, budget)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.site: limiter.snapshot() for limiter in limiters}
+
+    def budgets(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            budgets = list(self._budgets.values())
+        return {"/".join(filter(None, (budget.host, budget.resource))): budget.snapshot() for budget in budgets}
+
+
+def independent_groups(hosts_by_name: Dict[str, List[str]]) -> List[List[str]]:
+    """Group scrapers that share a site (transitively); groups never contend for a host.
+
+    Scrapers with no declared hosts are put together in one group, so unknown
+    traffic is paced as conservatively as before.
+    """
+    parent: Dict[str, str] = {}
+
+    def find(key: str) -> str:
+        while parent.setdefault(key, key) != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for name, hosts in hosts_by_name.items():
+        sites = [f"site:{site_of(h)}" for h in hosts] or ["site:<unknown>"]
+        for site in sites:
+            parent[find(site)] = find(f"scraper:{name}")
+
+    groups: Dict[str, List[str]] = {}
+    for name in hosts_by_name:
+        groups.setdefault(find(f"scraper:{name}"), []).append(name)
+    return list(groups.values())
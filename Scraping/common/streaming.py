@@ -0,0 +1,239 @@
+import codecs
+import logging
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Tuple, Union
+
+from common.parsing import declared_encoding
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 16 * 1024  # bytes read from the socket between predicate checks
+TEXT_WINDOW = 1024  # characters of page text kept so a text match can span chunks
+MATCH_SLACK = 64  # characters that must follow a text match before it is taken as complete
+VOID_TAGS = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param",
+                       "source", "track", "wbr"))
+_RAW_TEXT = frozenset(("script", "style"))  # their contents aren't page text (as in soup.get_text())
+
+
+class Node:
+    """An element seen by the streaming parser.
+
+    Predicates get each element as its end tag is read, so ``text`` covers the
+    whole element; ``parent`` and its ancestors are still open and only know
+    what has been read so far.
+    """
+    __slots__ = ("tag", "attrs", "parent", "first_href", "_texts", "_start", "_end")
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional["Node"], texts: List[str]):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.first_href: Optional[str] = None  # href of the first <a> opened inside, once one was read
+        self._texts = texts
+        self._start = len(texts)
+        self._end: Optional[int] = None
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.attrs.get(name, default)
+
+    @property
+    def text(self) -> str:
+        return "".join(self._texts[self._start:self._end])
+
+    @property
+    def closed(self) -> bool:
+        return self._end is not None
+
+    def closest(self, tag: str) -> Optional["Node"]:
+        """Nearest enclosing ``tag`` element (like bs4's find_parent)."""
+        node = self.parent
+        while node is not None and node.tag != tag:
+            node = node.parent
+        return node
+
+    def __repr__(self) -> str:
+        return f"<{self.tag} {self.attrs}>"
+
+
+class _StreamParser(HTMLParser):
+    """Tokenizes HTML fed in pieces, calling ``on_element`` as elements close and ``on_text`` for page text."""
+
+    def __init__(self, on_element: Optional[Callable[[Node], Any]] = None,
+                 on_text: Optional[Callable[[str], Any]] = None):
+        super().__init__(convert_charrefs=True)
+        self.on_element = on_element
+        self.on_text = on_text
+        self.texts: List[str] = []
+        self.stack: List[Node] = []
+        self.raw_depth = 0
+        self.found: Any = None
+
+    def _check(self, result: Any) -> None:
+        if result and self.found is None:
+            self.found = result
+
+    def handle_starttag(self, tag, attrs):
+        parent = self.stack[-1] if self.stack else None
+        node = Node(tag, {name: value or "" for name, value in attrs}, parent, self.texts)
+        if tag == "a" and "href" in node.attrs:
+            ancestor = parent
+            while ancestor is not None and ancestor.first_href is None:
+                ancestor.first_href = node.attrs["href"]
+                ancestor = ancestor.parent
+        if tag in VOID_TAGS:
+            self._close(node)
+            return
+        if tag in _RAW_TEXT:
+            self.raw_depth += 1
+        self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.stack and self.stack[-1].tag == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        # Unclosed elements (<li>, <p>, ...) end with their parent, as in an HTML tree
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth].tag == tag:
+                while len(self.stack) > depth:
+                    self._close(self.stack.pop())
+                return
+
+    def _close(self, node: Node) -> None:
+        if node.tag in _RAW_TEXT:
+            self.raw_depth -= 1
+        node._end = len(self.texts)
+        if self.on_element is not None:
+            self._check(self.on_element(node))
+
+    def close(self):
+        super().close()
+        while self.stack:
+            self._close(self.stack.pop())
+
+    def handle_data(self, data):
+        if self.raw_depth:
+            return
+        self.texts.append(data)
+        if self.on_text is not None:
+            self._check(self.on_text(data))
+
+
+class _TextSearch:
+    """Searches page text as it arrives, keeping a window so matches can span chunks."""
+
+    def __init__(self, pattern: Union[str, Pattern], group: int = 0):
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+        self.group = group
+        self.text = ""
+        self.searched = 0  # offset in ``text`` below which no match can start
+
+    def __call__(self, data: str) -> Optional[str]:
+        self.text += data
+        return self.search(final=False)
+
+    def search(self, final: bool) -> Optional[str]:
+        # Text more than half a window back can't start a match that is still incomplete
+        start = max(self.searched, len(self.text) - TEXT_WINDOW // 2)
+        for match in self.pattern.finditer(self.text, self.searched):
+            # A match near the end of what was read may still grow with the next piece of text
+            if final or match.end() + MATCH_SLACK <= len(self.text):
+                return match.group(self.group)
+            start = min(start, match.start())
+            break
+        cut = min(start, max(0, len(self.text) - TEXT_WINDOW))
+        self.text = self.text[cut:]
+        self.searched = start - cut
+        return None
+
+
+@dataclass
+class StreamResult:
+    """What a streaming search found and what it cost."""
+    url: str
+    found: Any  # the predicate's answer, or None
+    bytes_read: int  # body bytes taken off the wire (decoded bytes for chunked bodies, whose reads urllib3 doesn't count)
+    content_length: Optional[int] = None  # as announced by the server; None for chunked bodies
+    complete: bool = False  # the whole body was read
+    memoized: bool = False  # answered from a page already fetched this run, without a request
+
+    @property
+    def bytes_saved(self) -> Optional[int]:
+        """Body bytes left unread, when the server announced a length."""
+        if self.memoized:
+            return self.content_length
+        if self.content_length is None:
+            return None
+        return max(0, self.content_length - self.bytes_read)
+
+
+def _content_length(response) -> Optional[int]:
+    try:
+        return int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _scan(chunks: Iterable[bytes], encoding: Optional[str], parser: _StreamParser,
+          text_search: Optional[_TextSearch]) -> Tuple[bool, int]:
+    """Feed body chunks to ``parser`` until it finds something: (whether the body ran out, bytes fed)."""
+    decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    fed = 0
+    for chunk in chunks:
+        fed += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.found is not None:
+            return False, fed
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    if parser.found is None and text_search is not None:
+        parser.found = text_search.search(final=True)
+    return True, fed
+
+
+def _stream(url: str, parser: _StreamParser, text_search: Optional[_TextSearch] = None, client=None,
+            chunk_size: int = CHUNK_SIZE, **kwargs) -> StreamResult:
+    from common.http import get_client
+
+    client = client or get_client()
+    memoized = client.memoized(url, **kwargs)
+    if memoized is not None:
+        _scan([memoized.content], declared_encoding(memoized), parser, text_search)
+        return StreamResult(url, parser.found, 0, len(memoized.content), True, memoized=True)
+
+    response = client.request("GET", url, stream=True, **kwargs)
+    try:
+        response.raise_for_status()
+        complete, fed = _scan(response.iter_content(chunk_size), declared_encoding(response), parser, text_search)
+        result = StreamResult(url, parser.found, response.raw.tell() or fed, _content_length(response), complete)
+    finally:
+        # Closing with the body half read drops the connection instead of returning it to the pool
+        response.close()
+    if result.bytes_saved:
+        client.recorder.record("bytes_saved", result.bytes_saved)
+    logger.debug(f"Streamed {url}: read {result.bytes_read} bytes, saved {result.bytes_saved}")
+    return result
+
+
+def find_element(url: str, predicate: Callable[[Node], Any], **kwargs) -> StreamResult:
+    """Stream ``url`` until ``predicate`` returns something truthy for an element.
+
+    ``predicate`` sees every element as it closes, in document order of end
+    tags. Its first truthy answer becomes ``found`` and the rest of the body
+    is never read. ``kwargs`` go to the request (headers, timeout, ...).
+    A page already memoized this run is searched without a request.
+    """
+    return _stream(url, _StreamParser(on_element=predicate), **kwargs)
+
+
+def search_text(url: str, pattern: Union[str, Pattern], group: int = 0, **kwargs) -> StreamResult:
+    """Stream ``url`` until ``pattern`` matches its text (script and style excluded).
+
+    Text is matched the way ``re.search(pattern, soup.get_text())`` would
+    see it; ``found`` is the match's ``group``.
+    """
+    text_search = _TextSearch(pattern, group)
+    return _stream(url, _StreamParser(on_text=text_search), text_search, **kwargs)
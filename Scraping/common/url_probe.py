@@ -0,0 +1,179 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from common.probe import get_pointers, version_key
+
+logger = logging.getLogger(__name__)
+
+MAX_ROUNDS = 5  # successive releases climbed in one probe before giving up and scraping
+MISSING_STATUSES = (404, 410)  # answers that prove a candidate doesn't exist
+CANARY_STEP = 1000  # major versions ahead of the known one: a URL that must not exist
+
+Version = Tuple[int, ...]
+
+
+class Inconclusive(LookupError):
+    """URL probing couldn't tell the current version; the full scrape has to."""
+
+
+def dotted(version: Version) -> str:
+    return ".".join(str(part) for part in version)
+
+
+def short_dotted(version: Version) -> str:
+    """Mozilla style: 140.0 rather than 140.0.0, but 140.0.1."""
+    if len(version) > 2 and version[-1] == 0:
+        version = version[:-1]
+    return dotted(version)
+
+
+@dataclass
+class UrlTemplate:
+    """Where a release of a product lives, as a function of its version.
+
+    ``template`` is a str.format pattern: ``{version}`` is the version as
+    the product writes it (``format``, dotted by default) and ``{major}``,
+    ``{minor}``, ``{patch}`` are its numeric parts, e.g.
+    ``"a/7z{major:02d}{minor:02d}-x64.exe"``. ``parts`` is how many
+    components the product's versions have, so successors of 24.09 are
+    24.10 and 25.0.
+    """
+    template: str
+    parts: int = 3
+    format: Callable[[Version], str] = dotted
+    parse: Callable[[str], Tuple[int, ...]] = version_key
+
+    def url(self, version: Version) -> str:
+        numbers = dict(zip(("major", "minor", "patch"), version))
+        return self.template.format(version=self.format(version), **numbers)
+
+    def version(self, text: str) -> Version:
+        parsed = tuple(self.parse(text))[:self.parts]
+        if not parsed:
+            raise Inconclusive(f"Not a version: {text!r}")
+        return parsed + (0,) * (self.parts - len(parsed))
+
+
+def successors(version: Version) -> List[Version]:
+    """Next patch, minor and major release of ``version`` (a bump resets the parts after it)."""
+    return [version[:i] + (version[i] + 1,) + (0,) * (len(version) - i - 1) for i in range(len(version) - 1, -1, -1)]
+
+
+@dataclass
+class ProbeResult:
+    version: str
+    url: str
+    requests: int  # HEAD requests made
+    rounds: int  # releases climbed past the known version
+
+
+class _Climb:
+    """Probing state shared by the sync and async drivers.
+
+    The first round checks the known version (proving the template still
+    works), a canary version far ahead (catching servers that answer 200 for
+    anything) and the known version's successors. Each later round checks
+    the successors of the newest version found, until none of them exists.
+    """
+
+    def __init__(self, template: UrlTemplate, known: str, max_rounds: int = MAX_ROUNDS):
+        self.template = template
+        self.current = template.version(known)
+        self.max_rounds = max_rounds
+        self.rounds = 0
+        self.requests = 0
+
+    def first(self) -> Dict[str, Version]:
+        canary = (self.current[0] + CANARY_STEP,) + self.current[1:]
+        candidates = [self.current, canary] + successors(self.current)
+        return {self.template.url(version): version for version in candidates}
+
+    def feed(self, candidates: Dict[str, Version], statuses: Dict[str, Optional[int]]) -> Dict[str, Version]:
+        """Take one round's answers; returns the next round's candidates, empty when done."""
+        self.requests += len(statuses)
+        found = []
+        for url, version in candidates.items():
+            status = statuses.get(url)
+            if status is None or (status >= 300 and status not in MISSING_STATUSES):
+                raise Inconclusive(f"{url} answered {status or 'nothing'}")
+            if status < 300:
+                found.append(version)
+        if self.rounds == 0:
+            if self.current not in found:
+                raise Inconclusive(f"Known release {self.template.url(self.current)} is gone")
+            if any(version[0] >= self.current[0] + CANARY_STEP for version in found):
+                raise Inconclusive(f"{self.template.template} answers for versions that don't exist")
+        newer = [version for version in found if version > self.current and version[0] < self.current[0] + CANARY_STEP]
+        if not newer:
+            return {}
+        self.current = max(newer)
+        self.rounds += 1
+        if self.rounds >= self.max_rounds:
+            raise Inconclusive(f"Still finding releases after {self.rounds} rounds")
+        return {self.template.url(version): version for version in successors(self.current)}
+
+    def result(self) -> ProbeResult:
+        return ProbeResult(self.template.format(self.current), self.template.url(self.current),
+                           self.requests, self.rounds)
+
+
+def _status(response) -> Optional[int]:
+    return getattr(response, "status_code", None)
+
+
+def probe_successors(template: UrlTemplate, known: str, client=None, max_rounds: int = MAX_ROUNDS,
+                     **kwargs) -> ProbeResult:
+    """Newest release reachable from ``known`` through ``template``, found with concurrent HEADs.
+
+    Raises Inconclusive when the answers can't be trusted (the known
+    release is gone, a candidate errored, the server answers for anything).
+    """
+    from common.http import get_client
+
+    client = client or get_client()
+    kwargs.setdefault("timeout", 10)
+    climb = _Climb(template, known, max_rounds)
+
+    def head(url: str) -> Optional[int]:
+        try:
+            return _status(client.head(url, **kwargs))
+        except Exception as e:
+            logger.debug(f"HEAD {url} failed: {e}")
+            return None
+
+    candidates = climb.first()
+    with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+        while candidates:
+            statuses = dict(zip(candidates, pool.map(head, candidates)))
+            candidates = climb.feed(candidates, statuses)
+    return climb.result()
+
+
+async def aprobe_successors(ctx, template: UrlTemplate, known: str, max_rounds: int = MAX_ROUNDS,
+                            **kwargs) -> ProbeResult:
+    """Coroutine counterpart of probe_successors(), sending the HEADs through ``ctx``."""
+    climb = _Climb(template, known, max_rounds)
+
+    async def head(url: str) -> Optional[int]:
+        try:
+            return _status(await ctx.head(url, **kwargs))
+        except Exception as e:
+            logger.debug(f"HEAD {url} failed: {e}")
+            return None
+
+    candidates = climb.first()
+    while candidates:
+        statuses = dict(zip(candidates, await asyncio.gather(*(head(url) for url in candidates))))
+        candidates = climb.feed(candidates, statuses)
+    return climb.result()
+
+
+def known_version(name: str) -> str:
+    """Last version resolved for product ``name``, the starting point of a probe."""
+    pointer = get_pointers().get(name)
+    if pointer is None:
+        raise Inconclusive(f"No known {name} version to probe from")
+    return pointer.version
@@ -0,0 +1,187 @@
+import ast
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from common.loader import candidate_function_names, scraper_classes
+
+# Calls that reach the network when executed at module level
+_NETWORK_CALLS = {"urlopen", "urllib.request.urlopen", "webdriver.Chrome", "webdriver.Firefox"}
+_NETWORK_PREFIXES = ("requests.", "get_client().", "urllib3.request", "httpx.", "aiohttp.")
+# Calls that write to disk
+_WRITE_CALLS = {"json.dump", "os.makedirs", "os.mkdir", "os.remove", "os.unlink", "shutil.copy",
+                "shutil.move", "shutil.rmtree"}
+_WRITE_METHODS = {"write_text", "write_bytes", "mkdir", "unlink"}
+_EXIT_CALLS = {"exit", "quit", "sys.exit"}
+
+
+@dataclass
+class SourceReport:
+    """What a scraper file defines and does on import, found without running it."""
+    path: str
+    functions: List[str] = field(default_factory=list)
+    async_functions: List[str] = field(default_factory=list)
+    scraper_classes: List[str] = field(default_factory=list)  # BaseScraper subclasses
+    side_effects: List[str] = field(default_factory=list)
+    local_imports: List[str] = field(default_factory=list)
+    syntax_error: Optional[str] = None
+
+
+def _dotted_name(node: ast.AST) -> str:
+    """``requests.get`` for Attribute/Name chains, ``get_client().get`` for call chains."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return f"{_dotted_name(node.value)}.{node.attr}"
+    if isinstance(node, ast.Call):
+        return f"{_dotted_name(node.func)}()"
+    return ""
+
+
+def _is_main_guard(node: ast.stmt) -> bool:
+    test = getattr(node, "test", None)
+    return (
+        isinstance(node, ast.If)
+        and isinstance(test, ast.Compare)
+        and isinstance(test.left, ast.Name)
+        and test.left.id == "__name__"
+    )
+
+
+def _open_mode(call: ast.Call) -> str:
+    mode = call.args[1] if len(call.args) > 1 else next((k.value for k in call.keywords if k.arg == "mode"), None)
+    return mode.value if isinstance(mode, ast.Constant) and isinstance(mode.value, str) else "r"
+
+
+def _classify_call(call: ast.Call) -> Optional[str]:
+    name = _dotted_name(call.func)
+    if name in _NETWORK_CALLS or name.startswith(_NETWORK_PREFIXES):
+        return f"network call {name}()"
+    if name == "open" and any(flag in _open_mode(call) for flag in "wax+"):
+        return f"file write open(..., '{_open_mode(call)}')"
+    if name in _WRITE_CALLS or name.rsplit(".", 1)[-1] in _WRITE_METHODS:
+        return f"file write {name}()"
+    if name in _EXIT_CALLS:
+        return f"process exit {name}()"
+    return None
+
+
+def _module_level_nodes(tree: ast.Module):
+    """Yield nodes executed on import, skipping function/class bodies and __main__ guards."""
+    stack = [stmt for stmt in tree.body if not _is_main_guard(stmt)]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            continue
+        yield node
+        stack.extend(ast.iter_child_nodes(node))
+
+
+def inspect_source(path: Path, base_path: Optional[Path] = None) -> SourceReport:
+    """Parse ``path`` and report its top-level functions and import-time side effects."""
+    report = SourceReport(path=str(path))
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except SyntaxError as e:
+        report.syntax_error = f"line {e.lineno}: {e.msg}"
+        return report
+
+    for stmt in tree.body:
+        if isinstance(stmt, ast.FunctionDef):
+            report.functions.append(stmt.name)
+        elif isinstance(stmt, ast.AsyncFunctionDef):
+            report.async_functions.append(stmt.name)
+    report.scraper_classes = scraper_classes(tree)
+
+    for node in _module_level_nodes(tree):
+        if isinstance(node, ast.Call):
+            effect = _classify_call(node)
+            if effect:
+                report.side_effects.append(f"line {node.lineno}: {effect}")
+        elif isinstance(node, ast.ImportFrom) and node.module and base_path is not None:
+            # Imports of sibling scraper files run their module body too
+            local = base_path.joinpath(*node.module.split(".")).with_suffix(".py")
+            if local.exists():
+                report.local_imports.append(str(local))
+
+    report.side_effects.sort(key=lambda effect: int(effect.split(":")[0].split()[1]))
+    return report
+
+
+def validate_scraper(scraper_name: str, config: Any, base_path: Path,
+                     reports: Optional[Dict[str, SourceReport]] = None) -> Dict[str, Any]:
+    """Statically validate one ScraperConfig: file, entry point and import-time behaviour.
+
+    ``reports`` caches the modules it imports, which most scrapers share (common/).
+    """
+    validation = {
+        "name": scraper_name,
+        "enabled": config.enabled,
+        "file_exists": False,
+        "function_found": False,
+        "entry_point": None,
+        "side_effects": [],
+        "notes": [],
+        "errors": []
+    }
+
+    scraper_path = base_path / config.path
+    if not scraper_path.exists():
+        validation["errors"].append(f"File not found: {scraper_path}")
+        return validation
+    validation["file_exists"] = True
+
+    report = inspect_source(scraper_path, base_path)
+    if report.syntax_error:
+        validation["errors"].append(f"Syntax error: {report.syntax_error}")
+        return validation
+
+    defined = report.functions + report.async_functions + report.scraper_classes
+    if config.function in defined:
+        validation["function_found"] = True
+        validation["entry_point"] = config.function
+    else:
+        fallback = next((name for name in candidate_function_names(scraper_name, config.function)
+                         if name in defined), None)
+        validation["entry_point"] = fallback or next(iter(report.scraper_classes), "<module body>")
+        # The loader runs the fallback, or the module body as a script, so this is how it runs, not a fault
+        validation["notes"].append(
+            f"Function '{config.function}' not found, runs {validation['entry_point']}"
+        )
+
+    # Work done at module level, including modules it imports from this tree
+    validation["side_effects"] = list(report.side_effects)
+    seen: Set[str] = {str(scraper_path)}
+    pending = list(report.local_imports)
+    while pending:
+        imported = pending.pop()
+        if imported in seen:
+            continue
+        seen.add(imported)
+        if reports is None:
+            imported_report = inspect_source(Path(imported), base_path)
+        else:
+            if imported not in reports:
+                reports[imported] = inspect_source(Path(imported), base_path)
+            imported_report = reports[imported]
+        rel = Path(imported).relative_to(base_path)
+        validation["side_effects"].extend(f"{rel} {effect}" for effect in imported_report.side_effects)
+        pending.extend(imported_report.local_imports)
+
+    # Script-style scrapers are only compiled on load, so their side effects are the scrape itself;
+    # for importable modules they would fire while loading, outside the timeout
+    if validation["entry_point"] != "<module body>":
+        for effect in validation["side_effects"]:
+            validation["errors"].append(f"Import-time side effect: {effect}")
+
+    return validation
+
+
+def validate_scrapers(configs: Dict[str, Any], base_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Validate every scraper without importing any of them.
+
+    Sequential on purpose: parsing holds the GIL, so threads would only add
+    their start-up cost. Each shared module is parsed once for all scrapers.
+    """
+    reports: Dict[str, SourceReport] = {}
+    return {name: validate_scraper(name, config, base_path, reports) for name, config in configs.items()}
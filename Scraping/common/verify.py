@@ -0,0 +1,282 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LINKS_PATH = Path(__file__).resolve().parents[1] / ".state" / "links.json"
+LINK_TTL = 24 * 3600  # seconds a link check is trusted before the link is checked again
+MAX_CHECKS = 500  # links re-checked per run, stalest first; the rest keep their last result
+CONCURRENCY = 32  # checks in flight across all hosts; the HostScheduler limits each host
+URL_KEYS = ("url", "download_url")  # record fields holding the link to check
+LINK_FIELD = "link"  # where the check result is attached to a record
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+PERMANENT_REDIRECTS = (301, 308)  # remembered across runs; temporary ones only within a run
+MAX_HOPS = 10
+HEAD_REFUSED = (403, 405, 501)  # servers that won't answer HEAD get a one-byte ranged GET
+
+_CONTENT_RANGE_RE = re.compile(r"/\s*(\d+)\s*$")
+
+
+@dataclass
+class LinkCheck:
+    """Outcome of checking one download link."""
+    url: str
+    status: Optional[int] = None  # of the final hop
+    final_url: Optional[str] = None
+    content_length: Optional[int] = None
+    last_modified: Optional[str] = None
+    content_type: Optional[str] = None
+    redirects: List[str] = field(default_factory=list)  # hops between url and final_url
+    checked_at: Optional[float] = None  # epoch seconds
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and self.status < 400
+
+    def summary(self) -> Dict[str, Any]:
+        """What gets attached to the record the link came from."""
+        return {"ok": self.ok, "status": self.status, "final_url": self.final_url,
+                "content_length": self.content_length, "last_modified": self.last_modified,
+                "checked_at": self.checked_at, "error": self.error}
+
+
+class LinkStore:
+    """Last check of every link seen, plus the permanent redirects met on the way."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_LINKS_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # one save at a time, so the newest snapshot is the one kept
+        self.checks: Dict[str, LinkCheck] = {}
+        self.redirects: Dict[str, str] = {}  # url -> Location of a 301/308
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.checks = {url: LinkCheck(**check) for url, check in data.get("checks", {}).items()}
+            self.redirects = dict(data.get("redirects", {}))
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def save(self, max_age: float = LINK_TTL) -> None:
+        """Write the store, dropping checks older than ``max_age`` and the redirects only they used."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._save_lock:
+            with self._lock:
+                self._expire(max_age)
+                data = {"checks": {url: asdict(check) for url, check in self.checks.items()},
+                        "redirects": self.redirects}
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f"{self.path.stem}.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data, indent=1))
+            os.replace(tmp, self.path)
+
+    def _expire(self, max_age: float) -> None:
+        cutoff = time.time() - max_age
+        self.checks = {url: check for url, check in self.checks.items()
+                       if check.checked_at and check.checked_at > cutoff}
+        hops = {hop for check in self.checks.values() for hop in check.redirects}
+        self.redirects = {url: target for url, target in self.redirects.items() if url in hops}
+
+    def get(self, url: str) -> Optional[LinkCheck]:
+        return self.checks.get(url)
+
+    def put(self, check: LinkCheck) -> None:
+        with self._lock:
+            self.checks[check.url] = check
+
+    def due(self, urls: Iterable[str], max_age: float = LINK_TTL, limit: int = MAX_CHECKS) -> List[str]:
+        """The links to check now: never-checked first, then the stalest, at most ``limit``."""
+        now = time.time()
+        stale = []
+        for url in dict.fromkeys(urls):
+            check = self.checks.get(url)
+            checked_at = check.checked_at if check is not None and check.checked_at else 0.0
+            if now - checked_at >= max_age:
+                stale.append((checked_at, url))
+        stale.sort()
+        return [url for _, url in stale[:limit]]
+
+
+def _is_link(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(("http://", "https://"))
+
+
+def _is_link_map(item: Dict[str, Any]) -> bool:
+    """A mapping of names to links, like {"windows": url, "mac": url}, rather than a record."""
+    return bool(item) and not any(key in URL_KEYS for key in item) and all(map(_is_link, item.values()))
+
+
+def iter_links(data: Any) -> Iterator[Tuple[Dict[str, Any], str, str]]:
+    """(holder, key, url) for every link in a scraper's output.
+
+    Records carry their link under URL_KEYS; a mapping whose values are all
+    links (Fiddler's ``platforms``) is reported with its own keys.
+    """
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(reversed(item))
+        elif isinstance(item, dict):
+            if _is_link_map(item):
+                for key, value in item.items():
+                    yield item, key, value
+                continue
+            for key, value in item.items():
+                if key in URL_KEYS and _is_link(value):
+                    yield item, key, value
+                elif isinstance(value, (dict, list)) and key != LINK_FIELD:
+                    stack.append(value)
+
+
+def attach(data: Any, checks: Dict[str, LinkCheck]) -> int:
+    """Attach check summaries to the records of ``data``; returns how many were attached.
+
+    A record gets ``record["link"]``; a mapping of links gets a sibling
+    ``"<name>_links"`` entry in its parent, keyed like the mapping.
+    """
+    attached = 0
+    parents = _parents(data)
+    for holder, key, url in list(iter_links(data)):
+        check = checks.get(url)
+        if check is None:
+            continue
+        if not _is_link_map(holder):
+            holder[LINK_FIELD] = check.summary()
+        else:
+            parent, name = parents.get(id(holder), (None, None))
+            if parent is None:
+                continue
+            parent.setdefault(f"{name}_links", {})[key] = check.summary()
+        attached += 1
+    return attached
+
+
+def _parents(data: Any) -> Dict[int, Tuple[Dict[str, Any], str]]:
+    parents: Dict[int, Tuple[Dict[str, Any], str]] = {}
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        children = item.items() if isinstance(item, dict) else enumerate(item) if isinstance(item, list) else ()
+        for key, value in children:
+            if isinstance(value, (dict, list)):
+                if isinstance(item, dict):
+                    parents[id(value)] = (item, key)
+                stack.append(value)
+    return parents
+
+
+def _content_length(headers, status: int) -> Optional[int]:
+    if status == 206:
+        match = _CONTENT_RANGE_RE.search(headers.get("content-range") or "")
+        return int(match.group(1)) if match else None
+    try:
+        return int(headers.get("content-length"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LinkVerifier:
+    """Checks download links concurrently through the async client, following redirects by hand.
+
+    Every hop goes through the client's scheduler, so per-host limits
+    apply. Redirect hops are cached: permanent ones in the store across
+    runs, temporary ones (``latest`` links) for the rest of this run only.
+    """
+
+    def __init__(self, client, store: Optional[LinkStore] = None, concurrency: int = CONCURRENCY,
+                 max_age: float = LINK_TTL, max_checks: int = MAX_CHECKS, timeout: float = 15):
+        self.client = client
+        self.store = store or LinkStore()
+        self.max_age = max_age
+        self.max_checks = max_checks
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(concurrency)
+        self._hops: Dict[str, str] = {}  # temporary redirects met this run
+        self._pending: Dict[str, "asyncio.Future[LinkCheck]"] = {}
+        self.checked = 0
+        self.reused = 0
+
+    async def _hop(self, url: str):
+        response = await self.client.request("HEAD", url, allow_redirects=False, timeout=self.timeout, route=False)
+        if response.status_code in HEAD_REFUSED:
+            # A server that ignores Range answers 200 with the whole file, so only the headers are read
+            ranged = await self.client.request("GET", url, headers={"Range": "bytes=0-0"}, allow_redirects=False,
+                                               timeout=self.timeout, route=False, headers_only=True)
+            if ranged.status_code < 400:
+                return ranged
+        return response
+
+    async def _check(self, url: str) -> LinkCheck:
+        check = LinkCheck(url)
+        current = url
+        try:
+            async with self._slots:
+                for _ in range(MAX_HOPS + 1):
+                    cached = self.store.redirects.get(current) or self._hops.get(current)
+                    if cached is not None:
+                        check.redirects.append(current)
+                        current = cached
+                        continue
+                    response = await self._hop(current)
+                    location = response.headers.get("location")
+                    if response.status_code in REDIRECT_STATUSES and location:
+                        target = urljoin(current, location)
+                        if response.status_code in PERMANENT_REDIRECTS:
+                            self.store.redirects[current] = target
+                        else:
+                            self._hops[current] = target
+                        check.redirects.append(current)
+                        current = target
+                        continue
+                    check.status = response.status_code
+                    check.content_length = _content_length(response.headers, response.status_code)
+                    check.last_modified = response.headers.get("last-modified")
+                    check.content_type = response.headers.get("content-type")
+                    break
+                else:
+                    check.error = f"More than {MAX_HOPS} redirects"
+        except Exception as e:
+            check.error = str(e) or type(e).__name__
+        check.final_url = current
+        check.checked_at = time.time()
+        self.checked += 1
+        self.store.put(check)
+        return check
+
+    async def check(self, url: str) -> LinkCheck:
+        """Check ``url`` now; concurrent calls for one URL share the check."""
+        future = self._pending.get(url)
+        if future is None:
+            future = self._pending[url] = asyncio.ensure_future(self._check(url))
+        return await future
+
+    async def verify(self, urls: Iterable[str]) -> Dict[str, LinkCheck]:
+        """Latest check of every URL: stale ones (stalest first, up to max_checks) are checked again."""
+        urls = list(dict.fromkeys(urls))
+        due = self.store.due(urls, self.max_age, self.max_checks)
+        fresh = await asyncio.gather(*(self.check(url) for url in due))
+        checks = {check.url: check for check in fresh}
+        for url in urls:
+            if url not in checks and self.store.get(url) is not None:
+                checks[url] = self.store.get(url)
+                self.reused += 1
+        return checks
+
+    async def enrich(self, outputs: Iterable[Any]) -> Dict[str, LinkCheck]:
+        """Check every link in ``outputs`` and attach the results to their records."""
+        outputs = list(outputs)
+        checks = await self.verify(url for output in outputs for _, _, url in iter_links(output))
+        for output in outputs:
+            attach(output, checks)
+        return checks
@@ -1,11 +1,19 @@
-import requests
-from bs4 import BeautifulSoup
+import logging
 import re
 import urllib3
 from urllib.parse import urljoin, urlparse
-import json
 import os
-from fontbase.version.main import version
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.http import get_client
+from common.parsing import parse_html
+from fontbase.version.main import latest_version
+
+logger = logging.getLogger(__name__)
+
 # Disable HTTPS warnings since verify=False is used
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -17,9 +25,9 @@ def fetch_files(url, file_extensions):
             "Chrome/122.0.0.0 Safari/537.36"
         )
     }
-    response = requests.get(url, headers=headers, timeout=10, verify=False)
+    response = get_client().get(url, headers=headers, timeout=10, verify=False)
     response.raise_for_status()
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = parse_html(response, only='a')
     links = soup.find_all('a')
 
     files = []
@@ -58,83 +66,33 @@ def extract_version(file_name):
     version_match = re.search(r'(\d+\.\d+(?:\.\d+)?)', file_name)
     return version_match.group(1) if version_match else "Unknown"
 
-def scrape_fontbase():
-    # Define sources: Windows, macOS and Linux
-    sources = [
-        {"url": "https://fontba.se/downloads/windows", "extensions": [".exe"]},
-        {"url": "https://fontba.se/downloads/mac", "extensions": [".dmg", ".pkg"]},
-        {"url": "https://fontba.se/downloads/linux", "extensions": [".deb", ".AppImage"]}
-    ]
-    
-    all_files = []
-    all_links = []
-    latest_version = None
-    
-    try:
-        print("\n=== Scraping FontBase ===")
-        
-        for source in sources:
-            print(f"\nScraping {source['url']}...")
-            fetched = fetch_files(source['url'], source['extensions'])
-            
-            if fetched:
-                print(f"Found {len(fetched)} files")
-                print("-" * 50)
-                
-                for file in fetched:
-                    version = extract_version(file['file_name'])
-                    if not latest_version:
-                        latest_version = version
-                    
-                    print(f"File: {file['file_name']}")
-                    print(f"URL: {file['download_url']}")
-                    print(f"OS: {file['os']}")
-                    print(f"Version: {version}")
-                    print("-" * 50)
-                    
-                    # Store all links
-                    all_links.append({
-                        "product": "fontbase",
-                        "version": version,
-                        "text": file['file_name'],
-                        "url": file['download_url'],
-                        "platform": file['os']
-                    })
-                    
-                    # Add version to file info
-                    file['version'] = version
-                    all_files.append(file)
-        
-        # Create the output structure
-        output = {
-            "name": "FontBase",
-            "latest_version": latest_version,
-            "files": all_files
-        }
-        
-        # Save all links to a separate JSON file
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            all_links_file = os.path.join(current_dir, "fontbase_all_links.json")
-            
-            with open(all_links_file, "w", encoding="utf-8") as f:
-                json.dump(all_links, f, indent=2, ensure_ascii=False)
-            
-            print(f"\nSaved {len(all_links)} total links to fontbase_all_links.json")
-        except Exception as e:
-            print(f"Error saving all links: {str(e)}")
-        
-        # Save download files to JSON
-        
-            
-    except Exception as e:
-        print(f"An error occurred: {str(e)}")
+class FontBaseScraper(BaseScraper):
+    """FontBase installers for Windows, macOS and Linux."""
+    product = "fontbase"
+
+    def scrape(self, ctx):
+        # Define sources: Windows, macOS and Linux
+        sources = [
+            {"url": "https://fontba.se/downloads/windows", "extensions": [".exe"]},
+            {"url": "https://fontba.se/downloads/mac", "extensions": [".dmg", ".pkg"]},
+            {"url": "https://fontba.se/downloads/linux", "extensions": [".deb", ".AppImage"]}
+        ]
+        fallback = None  # the updates page is only read if a file name carries no version
 
-def main():
-    try:
-        scrape_fontbase()
-    except Exception as e:
-        print(f"An error occurred: {str(e)}")
+        for source in sources:
+            logger.info(f"Scraping {source['url']}...")
+            for file in fetch_files(source['url'], source['extensions']):
+                version = extract_version(file['file_name'])
+                if version == "Unknown":
+                    fallback = fallback or latest_version() or version
+                    version = fallback
+                yield {
+                    "product": "fontbase",
+                    "version": version,
+                    "text": file['file_name'],
+                    "url": file['download_url'],
+                    "platform": file['os']
+                }
 
 if __name__ == "__main__":
-    main()
+    FontBaseScraper.main()
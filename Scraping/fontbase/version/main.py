@@ -1,29 +1,36 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
+import logging
 import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # make common/ importable for standalone runs
+from common.http import get_client
+from common.parsing import parse_html
+
+logger = logging.getLogger(__name__)
 
 url = "https://fontba.se/updates"
 
-response = requests.get(url)
-response.raise_for_status()
+def latest_version():
+    """Version of the "Latest" entry on the updates page, or None if it can't be read."""
+    response = get_client().get(url)
+    response.raise_for_status()
 
-soup = BeautifulSoup(response.text, 'html.parser')
+    soup = parse_html(response, only='a')
 
-for link in soup.find_all('a'):
-    text = link.get_text(strip=True)
-    href = link.get('href')
+    for link in soup.find_all('a'):
+        text = link.get_text(strip=True)
+        href = link.get('href')
 
-    if href and "Latest" in text:
-        # Convert relative URL to full URL
-        full_url = urljoin(url, href)
+        if href and "Latest" in text:
+            # Extract version from the href like /updates/2.22.4
+            version_match = re.search(r'/updates/([\d\.]+)', urljoin(url, href))
+            if version_match:
+                return version_match.group(1)
+            logger.warning(f'Could not extract version from href: {href}')
+            break  # Only the first "Latest" link counts
+    return None
 
-        # Extract version from the href like /updates/2.22.4
-        version_match = re.search(r'/updates/([\d\.]+)', href)
-        if version_match:
-            version = version_match.group(1)
-            print(f'Latest Version: {version}')
-        else:
-            print(f'Could not extract version from href: {href}')
-        
-        break  # Only print the first "Latest" link
+if __name__ == "__main__":
+    print(f'Latest Version: {latest_version()}')
@@ -1,9 +1,15 @@
-import requests
-from bs4 import BeautifulSoup
-import json
+import logging
 import urllib3
-import re
-import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.http import get_client
+from common.parsing import parse_html
+from common.streaming import search_text
+
+logger = logging.getLogger(__name__)
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -15,9 +21,9 @@ def fetch_files(url):
             "Chrome/122.0.0.0 Safari/537.36"
         )
     }
-    response = requests.get(url, headers=headers, timeout=10, verify=False)
+    response = get_client().get(url, headers=headers, timeout=10, verify=False)
     response.raise_for_status()
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = parse_html(response, only='a')
     links = soup.find_all('a')
 
     files = []
@@ -58,99 +64,35 @@ def extract_version_from_page(url):
             "Chrome/122.0.0.0 Safari/537.36"
         )
     }
-    response = requests.get(url, headers=headers, timeout=10, verify=False)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.text, 'html.parser')
-    text = soup.get_text()
-    match = re.search(r'FortiOS\s*([0-9]+\.[0-9]+(\.[0-9]+)?)', text)
-    return match.group(1) if match else "Unknown"
+    # Stop reading the (large) product page at the first mention of a version
+    result = search_text(url, r'FortiOS\s*([0-9]+\.[0-9]+(\.[0-9]+)?)', group=1,
+                         headers=headers, timeout=10, verify=False)
+    return result.found or "Unknown"
+
+class FortinetScraper(BaseScraper):
+    """FortiClient downloads, versioned from the FortiOS product page."""
+    product = "fortinet"
+
+    def scrape(self, ctx):
+        # URLs
+        base_url = 'https://www.fortinet.com/support/product-downloads'
+        version_url = 'https://www.fortinet.com/products/fortigate/fortios'
 
-def scrape_fortinet():
-    # URLs
-    base_url = 'https://www.fortinet.com/support/product-downloads'
-    version_url = 'https://www.fortinet.com/products/fortigate/fortios'
-    all_links = []
-    
-    try:
-        print("\n=== Scraping Fortinet ===")
         files = fetch_files(base_url)
         latest_version = extract_version_from_page(version_url)
-        print(f"[✔] Latest version found: {latest_version}")
-
-        output = {
-            "name": "FortiClient",
-            "latest_version": latest_version,
-            "files": []
-        }
+        logger.info(f"Latest Fortinet version found: {latest_version}")
 
-        print("\nAll files found:")
-        print("-" * 50)
-        
         for f in files:
             href = f['href']
             filename = href.split('/')[-1] if href.startswith("http") else "forticlient"
-            os_name = detect_os(f['text'])
             download_url = href if href.startswith("http") else f"https://www.fortinet.com{href}"
-            
-            print(f"File: {filename}")
-            print(f"URL: {download_url}")
-            print(f"OS: {os_name}")
-            print(f"Version: {latest_version}")
-            print("-" * 50)
-            
-            # Store all links
-            all_links.append({
+            yield {
                 "product": "fortinet",
                 "version": latest_version,
                 "text": filename,
                 "url": download_url,
-                "platform": os_name
-            })
-            
-            output['files'].append({
-                "file_name": filename,
-                "download_url": download_url,
-                "os": os_name,
-                "version": latest_version
-            })
-
-        # Save all links to a separate JSON file
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            all_links_file = os.path.join(current_dir, "fortinet_all_links.json")
-            
-            with open(all_links_file, "w", encoding="utf-8") as f:
-                json.dump(all_links, f, indent=2, ensure_ascii=False)
-            
-            print(f"\nSaved {len(all_links)} total links to fortinet_all_links.json")
-        except Exception as e:
-            print(f"Error saving all links: {str(e)}")
-
-        # Save download files to JSON
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            output_file = os.path.join(current_dir, "fortinet_info.json")
-            
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(output, f, indent=2, ensure_ascii=False)
-            
-            print(f"\nSuccessfully saved {len(output['files'])} download files to fortinet_info.json")
-            
-            # Print the download files
-            print("\n=== Fortinet Download Information ===")
-            print(json.dumps(output, indent=2, ensure_ascii=False))
-            
-        except Exception as e:
-            print(f"Error saving JSON file: {str(e)}")
-
-    except requests.exceptions.RequestException as e:
-        print(f"Request failed: {e}")
-
-def main():
-    try:
-        scrape_fortinet()
-    except Exception as e:
-        print(f"An error occurred: {str(e)}")
+                "platform": detect_os(f['text'])
+            }
 
 if __name__ == "__main__":
-    main()
+    FortinetScraper.main()
@@ -1,89 +1,69 @@
-import requests
-from bs4 import BeautifulSoup
-import os
-import json
+import logging
 from packaging.version import Version
 from pathlib import Path
+import sys
 
-def scrape_gimp():
-    """Scrape GIMP download information."""
-    print("🔍 Fetching GIMP download information...")
-    
-    # Configuration
-    base_url = "https://download.gimp.org/gimp/v3.0/"
-    platform_dirs = {
-        "Windows": "windows/",
-        "macOS": "macos/",
-        "Linux": "linux/"
-    }
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.crawler import MirrorCrawler
 
-    results = []
+logger = logging.getLogger(__name__)
 
-    try:
-        # Step 1: Loop through platform folders
-        for platform, subdir in platform_dirs.items():
-            url = base_url + subdir
-            res = requests.get(url, timeout=10)
-            res.raise_for_status()
-            soup = BeautifulSoup(res.text, 'html.parser')
-            
-            for link in soup.find_all('a'):
-                filename = link.get('href')
-                if not filename or not filename.lower().endswith(('.exe', '.dmg', '.appimage')):
-                    continue
+BASE_URL = "https://download.gimp.org/gimp/v3.0/"
+PLATFORM_DIRS = {
+    "Windows": "windows/",
+    "macOS": "macos/",
+    "Linux": "linux/"
+}
 
-                # Extract version from filename
-                parts = filename.replace('-', '.').replace('_', '.').split('.')
-                version_candidates = [p for p in parts if p.replace('v', '').replace('RC', '').isdigit()]
-                if version_candidates:
-                    version = None
-                    for i in range(len(parts)):
-                        try:
-                            # Try forming a version number from chunks
-                            version = Version(".".join(parts[i:i+3]).strip("-"))
-                            break
-                        except:
-                            continue
-                    if version:
-                        results.append({
-                            "product": "GIMP",
-                            "version": str(version),
-                            "text": filename,
-                            "url": url + filename,
-                            "platform": platform
-                        })
+def file_version(filename):
+    """Version in an installer's filename, e.g. gimp-3.0.4-setup.exe -> 3.0.4."""
+    parts = filename.replace('-', '.').replace('_', '.').split('.')
+    if not any(p.replace('v', '').replace('RC', '').isdigit() for p in parts):
+        return None
+    for i in range(len(parts)):
+        try:
+            # Try forming a version number from chunks
+            return Version(".".join(parts[i:i+3]).strip("-"))
+        except Exception:
+            continue
+    return None
 
-        # Step 2: Filter only latest version
-        if results:
-            all_versions = {r["version"] for r in results}
-            latest_version = max(all_versions, key=Version)
-            print(f"✅ Keeping only latest version: {latest_version}")
+class GimpScraper(BaseScraper):
+    """GIMP installers of the newest release, from the per-platform download folders."""
+    product = "GIMP"
 
-            results = [r for r in results if r["version"] == latest_version]
-        else:
-            print("⚠️ No results found.")
-            latest_version = "unknown"
+    async def scrape(self, ctx):
+        logger.info("Fetching GIMP download information...")
 
-        # Save to the expected location for the orchestrator
-        output_path = Path(__file__).parent.parent / "gimp_info.json"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        # Crawl all platform folders concurrently
+        roots = {BASE_URL + subdir: platform for platform, subdir in PLATFORM_DIRS.items()}
+        crawler = MirrorCrawler(
+            ctx, max_depth=0, timeout=10,
+            include_file=lambda item: item.name.lower().endswith(('.exe', '.dmg', '.appimage')),
+        )
+        found = []
+        for item in await crawler.collect(*roots):
+            version = file_version(item.entry.href)
+            if version:
+                found.append((version, item))
+        for url, err in crawler.errors.items():
+            logger.warning(f"Error reading {url}: {err}")
+        if not found:
+            logger.warning("No results found.")
+            return
 
-        print(f"✅ Saved GIMP {latest_version} download links to: {output_path}")
-        return results
-        
-    except Exception as e:
-        print(f"❌ Error fetching GIMP data: {e}")
-        return []
-
-def main():
-    """Main function for standalone execution."""
-    try:
-        scrape_gimp()
-    except Exception as e:
-        print(f"❌ Error: {e}")
+        # Keep only the latest version
+        latest_version = max(version for version, _ in found)
+        logger.info(f"Keeping only latest version: {latest_version}")
+        for version, item in found:
+            if version == latest_version:
+                yield {
+                    "version": str(version),
+                    "text": item.entry.href,
+                    "url": item.url,
+                    "platform": roots[item.root]
+                }
 
 if __name__ == "__main__":
-    main()
+    GimpScraper.main()
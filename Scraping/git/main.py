@@ -1,58 +1,39 @@
-import requests
-from bs4 import BeautifulSoup
-import json
-import os
+import logging
 from pathlib import Path
+import sys
 
-def scrape_git():
-    """Scrape Git for Windows download information."""
-    print("🔍 Fetching Git for Windows download information...")
-    
-    # ---- Configuration ----
-    BASE_URL = "https://github.com"
-    RELEASES_URL = "https://github.com/git-for-windows/git/releases"
-    HEADERS = {"User-Agent": "Mozilla/5.0"}
-    PRODUCT = "Git for Windows"
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.github import get_github
 
-    try:
-        # ---- Step 1: Get Latest Version URL ----
-        response = requests.get(RELEASES_URL, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
+logger = logging.getLogger(__name__)
 
-        latest_label = soup.find("span", string="Latest")
-        if not latest_label:
-            raise Exception("❌ Latest release label not found.")
+REPO = "git-for-windows/git"
+EXTENSIONS = (".exe", ".zip", ".7z.exe", ".tar.bz2", ".tar.gz", ".tar.xz")
 
-        parent = latest_label.find_parent("div")
-        release_link_tag = parent.find("a", href=True)
-        if not release_link_tag:
-            raise Exception("❌ Release link not found.")
+def probe():
+    """Tag of the latest Git for Windows release."""
+    return get_github().latest(REPO).tag
 
-        latest_version_href = release_link_tag["href"]
-        latest_version_text = release_link_tag.get_text(strip=True)
-        version = latest_version_href.split("/")[-1]
-        expanded_assets_url = f"{BASE_URL}/git-for-windows/git/releases/expanded_assets/{version}"
+class GitScraper(BaseScraper):
+    """Git for Windows release assets."""
+    product = "Git for Windows"
 
-        print(f"🔄 Latest Version: {version}")
-        print(f"🔗 URL: {expanded_assets_url}")
+    def scrape(self, ctx):
+        logger.info("Fetching Git for Windows download information...")
 
-        # ---- Step 2: Scrape Downloadable Assets ----
-        response = requests.get(expanded_assets_url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+        # Latest release and its assets, in one (ETag-revalidated) API call
+        release = get_github().latest(REPO)
+        version = release.tag
 
-        data = []
+        logger.info(f"Latest Version: {version}")
+        logger.info(f"URL: {release.html_url}")
 
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            text = a.text.strip()
-            
-            if not href.endswith((".exe", ".zip", ".7z.exe", ".tar.bz2", ".tar.gz", ".tar.xz")):
-                continue
+        for asset in release.assets:
+            file_name = asset.name
 
-            file_name = href.split("/")[-1]
-            full_url = BASE_URL + href if href.startswith("/") else href
+            if not file_name.endswith(EXTENSIONS):
+                continue
 
             if "64" in file_name or "x64" in file_name:
                 platform = "Windows 64-bit"
@@ -63,37 +44,13 @@ def scrape_git():
             else:
                 platform = "Unknown"
 
-            entry = {
-                "product": PRODUCT,
-                "file_name": file_name,
+            yield {
                 "version": version,
-                "text": text or "Download",
-                "url": full_url,
-                "platform": platform
+                "text": file_name,
+                "url": asset.url,
+                "platform": platform,
+                "file_name": file_name
             }
 
-            data.append(entry)
-
-        # Save to the expected location for the orchestrator
-        output_path = Path("/home/yash-gaudani/R%D/patch/Scraping/git/git_info.json")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-
-        print(f"✅ Download data saved to: {output_path}")
-        return data
-        
-    except Exception as e:
-        print(f"❌ Error fetching Git data: {e}")
-        return []
-
-def main():
-    """Main function for standalone execution."""
-    try:
-        scrape_git()
-    except Exception as e:
-        print(f"❌ Error: {e}")
-
 if __name__ == "__main__":
-    main()
+    GitScraper.main()
@@ -1,11 +1,22 @@
-import requests
-from bs4 import BeautifulSoup
-import os
-import json
 import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.autoindex import listing
+from common.base import BaseScraper
+from common.checksums import MANIFEST, aharvest, classify
+from common.probe import get_pointers, newest
+from common.url_probe import UrlTemplate, aprobe_successors, known_version
 
 BASE_URL = "https://nodejs.org/dist/"
-SAVE_PATH = "/home/yash-gaudani/R%D/Vlc/nodejs/nodejs.json"
+LATEST_URL = f"{BASE_URL}latest/"  # always points at the current release
+# Every release gets its own directory, so the next one can be found with a few HEADs
+RELEASE_DIR = UrlTemplate(f"{BASE_URL}v{{version}}/")
+
+async def probe(ctx):
+    """Current Node.js version, probed from the last known one; inconclusive probes fall back to the full scrape."""
+    return (await aprobe_successors(ctx, RELEASE_DIR, known_version("nodejs"))).version
 
 def detect_platform(filename):
     fname = filename.lower()
@@ -31,32 +42,23 @@ def extract_version(filename):
     match = re.search(r'node-v(\d+\.\d+\.\d+)', filename)
     return match.group(1) if match else "unknown"
 
-def get_latest_url():
-    response = requests.get(BASE_URL)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    for link in soup.find_all('a'):
-        href = link.get("href", "")
-        if href.strip("/") == "latest":
-            return BASE_URL + href
-    raise Exception("latest/ directory not found")
-
-def scrape_latest_nodejs_files(latest_url):
-    response = requests.get(latest_url)
+async def scrape_latest_nodejs_files(ctx, latest_url):
+    response = await ctx.fetch(latest_url)
     response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
 
     result = []
+    manifests = []  # SHASUMS256.txt: digests of every file in the release
     skip_exts = (".txt", ".asc", ".sig", ".json")
     
-    for link in soup.find_all("a"):
-        href = link.get("href", "")
-        if not href or href.endswith("/") or href.endswith(skip_exts):
+    for entry in listing(response, latest_url):
+        sidecar = None if entry.is_dir else classify(entry.url(latest_url))
+        if sidecar is not None and sidecar.kind == MANIFEST:
+            manifests.append(sidecar.url)
+        if entry.is_dir or entry.name.endswith(skip_exts):
             continue
 
-        filename = os.path.basename(href)
-        full_url = latest_url + filename
+        filename = entry.name
+        full_url = entry.url(latest_url)
         version = extract_version(filename)
         platform = detect_platform(filename)
 
@@ -68,16 +70,20 @@ def scrape_latest_nodejs_files(latest_url):
             "platform": platform
         })
 
-    return result
+    return await aharvest(ctx, result, extra=manifests)
+
+class NodeJsScraper(BaseScraper):
+    """Every file of the current Node.js release, with digests from SHASUMS256.txt."""
+    product = "Node.js"
 
-def save_json(data, path):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=4)
-    print(f"✅ Saved JSON to: {path}")
+    async def scrape(self, ctx):
+        data = await scrape_latest_nodejs_files(ctx, LATEST_URL)
+        latest = newest(item["version"] for item in data if item["version"] != "unknown")
+        if latest:
+            get_pointers().set("nodejs", latest)  # where the next probe starts from
+        for item in data:
+            yield item
 
 # Run
 if __name__ == "__main__":
-    latest_url = get_latest_url()
-    data = scrape_latest_nodejs_files(latest_url)
-    save_json(data, SAVE_PATH)
+    NodeJsScraper.main()
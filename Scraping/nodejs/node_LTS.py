@@ -1,13 +1,16 @@
-import requests
-from bs4 import BeautifulSoup
-import os
-import json
 import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.autoindex import listing
+from common.base import BaseScraper
+from common.checksums import MANIFEST, aharvest, classify
+from common.probe import get_pointers
 
 BASE_URL = "https://nodejs.org/dist/"
-TARGET_VERSION = "v22.16.0"  # ← Fixed version
-VERSION_URL = f"{BASE_URL}{TARGET_VERSION}/"
-SAVE_PATH = "/home/yash-gaudani/R%D/Vlc/nodejs/nodejs(LTS).json"
+INDEX_URL = f"{BASE_URL}index.json"
+FALLBACK_VERSION = "v22.16.0"  # only used if the LTS can't be resolved and none is cached
 
 def detect_platform(filename):
     fname = filename.lower()
@@ -32,21 +35,23 @@ def extract_version(filename):
     match = re.search(r'node-v(\d+\.\d+\.\d+)', filename)
     return match.group(1) if match else "unknown"
 
-def scrape_nodejs_files(version_url):
-    response = requests.get(version_url)
+async def scrape_nodejs_files(ctx, version_url):
+    response = await ctx.fetch(version_url)
     response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
 
     result = []
+    manifests = []  # SHASUMS256.txt: digests of every file in the release
     skip_exts = (".txt", ".asc", ".sig", ".json")
     
-    for link in soup.find_all("a"):
-        href = link.get("href", "")
-        if not href or href.endswith("/") or href.endswith(skip_exts):
+    for entry in listing(response, version_url):
+        sidecar = None if entry.is_dir else classify(entry.url(version_url))
+        if sidecar is not None and sidecar.kind == MANIFEST:
+            manifests.append(sidecar.url)
+        if entry.is_dir or entry.name.endswith(skip_exts):
             continue
 
-        filename = os.path.basename(href)
-        full_url = version_url + filename
+        filename = entry.name
+        full_url = entry.url(version_url)
         version = extract_version(filename)
         platform = detect_platform(filename)
 
@@ -58,15 +63,24 @@ def scrape_nodejs_files(version_url):
             "platform": platform
         })
 
-    return result
+    return await aharvest(ctx, result, extra=manifests)
+
+async def probe(ctx):
+    """Newest LTS release, from the release index (listed newest first)."""
+    response = await ctx.fetch(INDEX_URL)
+    response.raise_for_status()
+    return next(release["version"] for release in response.json() if release.get("lts"))
+
+class NodeJsLtsScraper(BaseScraper):
+    """Every file of the newest Node.js LTS release, with digests from SHASUMS256.txt."""
+    product = "Node.js"
 
-def save_json(data, path):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=4)
-    print(f"✅ Saved JSON to: {path}")
+    async def scrape(self, ctx):
+        version = await get_pointers().aresolve("nodejs_lts", lambda: probe(ctx), FALLBACK_VERSION)
+        data = await scrape_nodejs_files(ctx, f"{BASE_URL}{version}/")
+        for item in data:
+            yield item
 
 # Run
 if __name__ == "__main__":
-    data = scrape_nodejs_files(VERSION_URL)
-    save_json(data, SAVE_PATH)
+    NodeJsLtsScraper.main()
@@ -1,36 +1,9 @@
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-import json
+import sys
+from pathlib import Path
 
-# Step 1: GitHub latest release URL
-base_url = "https://github.com/obsproject/obs-studio/releases/latest"
-
-# Step 2: Follow redirect to get actual release URL
-latest_response = requests.get(base_url, allow_redirects=True)
-actual_release_url = latest_response.url
-version = actual_release_url.split("/")[-1]  # Get version like '31.0.3'
-
-# Step 3: Get HTML content of that page
-release_page = requests.get(actual_release_url).text
-soup = BeautifulSoup(release_page, "html.parser")
-
-# Step 4: Find the correct include-fragment for expanded assets
-fragment_tag = soup.find("include-fragment", {"src": lambda x: x and "expanded_assets" in x})
-if not fragment_tag:
-    print("[-] Could not find include-fragment with expanded_assets.")
-    exit()
-
-fragment_src = fragment_tag["src"]
-full_fragment_url = urljoin("https://github.com", fragment_src)
-
-# Step 5: Fetch expanded assets HTML
-assets_response = requests.get(full_fragment_url)
-assets_soup = BeautifulSoup(assets_response.text, "html.parser")
-
-# Step 6: Extract download links and format output
-links = assets_soup.find_all("a", href=True)
-download_data = []
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.github import get_github
 
 def guess_platform(text):
     text_lower = text.lower()
@@ -51,22 +24,21 @@ def guess_platform(text):
     else:
         return "Other"
 
-for link in links:
-    href = link['href']
-    if "/download/" in href:
-        full_url = urljoin("https://github.com", href)
-        text = link.get_text(strip=True)
-        platform = guess_platform(text)
-        download_data.append({
-            "product": "OBS Studio",
-            "version": version,
-            "text": text,
-            "url": full_url,
-            "platform": platform
-        })
-
-
-
-# Optional: Save to file
-with open("obs_downloads.json", "w", encoding="utf-8") as f:
-    json.dump(download_data, f, indent=4)
+class ObsStudioScraper(BaseScraper):
+    """OBS Studio release assets."""
+    product = "OBS Studio"
+
+    def scrape(self, ctx):
+        # Latest release and its assets, in one API call instead of the release page,
+        # its include-fragment and the expanded assets fragment
+        release = get_github().latest("obsproject/obs-studio")
+        for asset in release.assets:
+            yield {
+                "version": release.tag,  # e.g. '31.0.3'
+                "text": asset.name,
+                "url": asset.url,
+                "platform": guess_platform(asset.name)
+            }
+
+if __name__ == "__main__":
+    ObsStudioScraper.main()
@@ -1,17 +1,38 @@
 import os
 import json
-import importlib.util
 import sys
 import logging
 import asyncio
+import contextlib
+import contextvars
+import itertools
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable, Union
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Callable, Union, TYPE_CHECKING
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 import argparse
 
+from common.base import StreamSummary, is_streaming, read_lines, read_records, sidecar, stream_to
+from common.cadence import CadenceStore, fingerprint
+from common.cron import CronSchedule
+from common.github import GitHubReleases, set_github
+from common.loader import ScraperLoader
+from common.memo import PageMemo
+from common.planner import DurationHistory, RunPlan, plan_run
+from common.probe import VersionPointers, set_pointers
+from common.scheduler import HostScheduler, independent_groups
+from common.validation import validate_scrapers
+from common.mirrors import MirrorRouter
+from common.verify import LinkStore
+
+if TYPE_CHECKING:
+    # requests and the HTTP clients are imported on first use, so menu/CLI startup stays fast
+    from common.downloader import Download
+    from common.fetch import AsyncHttpClient
+    from common.http import HttpClient, RequestCounters
+
 # Configure logging with more detailed format
 logging.basicConfig(
     level=logging.INFO,
@@ -24,6 +45,15 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on scrapers running at once when their hosts don't overlap
+MAX_PARALLEL_SCRAPERS = 16
+PROBE_TIMEOUT = 30  # seconds for a scraper's cheap version check
+
+# Exit codes of the batch subcommands
+EXIT_OK = 0
+EXIT_FAILED = 1  # a scraper failed, or validation found errors
+EXIT_USAGE = 2  # bad arguments or unknown scraper name (argparse uses 2 as well)
+
 @dataclass
 class ScraperConfig:
     path: str
@@ -34,6 +64,32 @@ class ScraperConfig:
     timeout: int = 300  # seconds
     enabled: bool = True
     priority: int = 1  # 1 = high, 2 = medium, 3 = low
+    isolation: str = "thread"  # "thread" or "process" (killable worker with resource limits)
+    memory_limit_mb: Optional[int] = None  # address-space cap for process isolation
+    cpu_limit: Optional[int] = None  # CPU seconds for process isolation
+    hosts: List[str] = field(default_factory=list)  # sites the scraper fetches from, for scheduling
+    repos: List[str] = field(default_factory=list)  # GitHub owner/name whose latest release the scraper reads
+    interval: Optional[int] = None  # seconds between runs in daemon mode
+    cron: Optional[str] = None  # five-field cron expression for daemon mode; overrides interval
+
+class StoredProducts:
+    """The products combine_results wrote, read back from the scrapers' outputs one product at a time."""
+
+    def __init__(self, orchestrator: "ScraperOrchestrator", names: List[str], count: int):
+        self._orchestrator = orchestrator
+        self.names = names
+        self._count = count
+
+    def __iter__(self) -> Iterator[Any]:
+        for name in self.names:
+            yield from self._orchestrator.products_of(name)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
 
 @dataclass
 class ScraperStats:
@@ -45,6 +101,20 @@ class ScraperStats:
     success: bool = False
     error_message: Optional[str] = None
     data_size: Optional[int] = None
+    records: Optional[int] = None  # records a streaming scraper yielded
+    requests_made: int = 0
+    connections_opened: int = 0
+    connection_reuse_ratio: Optional[float] = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_revalidated: int = 0
+    memo_hits: int = 0  # pages another scraper had already fetched this run
+    coalesced: int = 0  # requests that joined an identical one in flight
+    bytes_saved: int = 0  # response bytes streaming searches didn't need to read
+    links: int = 0  # download links in the output, checked after the run
+    broken_links: int = 0  # of those, links that didn't answer with a success
+    probed_version: Optional[str] = None  # current version reported by the scraper's probe()
+    unchanged: bool = False  # probe matched the last full scrape, so it was skipped
 
 class ScraperOrchestrator:
     def __init__(self, base_path: Optional[str] = None, config_file: Optional[str] = None):
@@ -52,42 +122,101 @@ class ScraperOrchestrator:
         self.results: Dict[str, Any] = {}
         self.stats: Dict[str, ScraperStats] = {}
         self.config_file = config_file
+        # Durations of past runs, used to start the slowest scrapers first
+        self.history = DurationHistory(self.base_path / ".state" / "durations.json")
+        self.last_plan: Optional[RunPlan] = None
+        # Release cadence per product, used to skip scrapers that are not due for a check
+        self.cadence = CadenceStore(self.base_path / ".state" / "cadence.json")
+        self.cadence_decisions: Dict[str, Dict[str, Any]] = {}
+        # Current version per product, shared with the scrapers in place of pinned versions
+        self.versions = VersionPointers(self.base_path / ".state" / "versions.json")
+        set_pointers(self.versions)
+        # GitHub release metadata, batched across the scrapers due in a run
+        self.github = GitHubReleases()
+        set_github(self.github)
+        # Last check of every emitted download link, re-checked stalest first after each run
+        self.links = LinkStore(self.base_path / ".state" / "links.json")
+        self.check_links = True
+        self.link_stats: Dict[str, int] = {}
+        # Records of streaming scrapers, one JSON Lines file per scraper
+        self.output_dir = self.base_path / "output"
         self.scrapers: Dict[str, ScraperConfig] = self._load_scraper_config()
-        self.executor = ThreadPoolExecutor(max_workers=5)
+        self.executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_SCRAPERS)
+        # Compiled scrapers, reused across retries and runs until their source changes
+        self.loader = ScraperLoader()
+        # One pooled client for the whole run; scrapers pick it up via common.http.get_client().
+        # The conditional-GET cache lives next to the scrapers so standalone runs share it.
+        self.cache_path = self.base_path / ".cache" / "http_cache.sqlite"
+        # Both clients admit requests through one scheduler, so each site gets a single adaptive budget
+        self.scheduler = HostScheduler()
+        # ...and one page memo, so scrapers reading the same URL in a run share a single fetch and parse
+        self.memo = PageMemo()
+        # ...and one mirror router, so mirror-network hosts are fetched from their fastest healthy mirror
+        self.mirrors = MirrorRouter(self.base_path / ".state" / "mirrors.json")
+        self.use_mirrors = True
+        self.stats_path = self.base_path / ".state" / "last_run.json"
+        self._http: Optional["HttpClient"] = None
+        self._aio: Optional["AsyncHttpClient"] = None
+
+    @property
+    def http(self) -> "HttpClient":
+        """The shared pooled client, created when the first scraper runs."""
+        if self._http is None:
+            from common.cache import HttpCache
+            from common.http import HttpClient, set_client
+            self._http = HttpClient(cache=HttpCache(self.cache_path), scheduler=self.scheduler, memo=self.memo,
+                                    mirrors=self.mirrors if self.use_mirrors else None)
+            set_client(self._http)
+        return self._http
+
+    @property
+    def aio(self) -> "AsyncHttpClient":
+        """Coroutine scrapers fetch on the event loop itself and share the same cache and counters."""
+        if self._aio is None:
+            from common.fetch import AsyncHttpClient
+            self._aio = AsyncHttpClient(cache=self.http.cache, recorder=self.http.recorder, scheduler=self.scheduler,
+                                        memo=self.memo, mirrors=self.http.mirrors)
+        return self._aio
         
     def _load_scraper_config(self) -> Dict[str, ScraperConfig]:
         """Load scraper configurations with retry settings."""
         default_config = {
             # Core scrapers with specific function names
-            '7-zip': ScraperConfig('7-zip/main.py', 'scraper_7zip', 'scrape_7zip'),
-            'anydesk': ScraperConfig('anydesk/main.py', 'scraper_anydesk', 'scrape_and_store_html'),
-            'docker': ScraperConfig('docker/main.py', 'docker_scraper', 'scrape_docker'),
-            'fontbase': ScraperConfig('fontbase/main.py', 'scraper_fontbase', 'scrape_fontbase'),
-            'fortinet': ScraperConfig('fortinet/main.py', 'scraper_fortinet', 'scrape_fortinet'),
-            'Foxit_PDF': ScraperConfig('Foxit_PDF/main.py', 'scraper_foxit_pdf', 'scrape_foxit_pdf'),
-            'git': ScraperConfig('git/main.py', 'scraper_git', 'scrape_git'),
-            'LibreOffice': ScraperConfig('LibreOffice/main.py', 'scraper_libreoffice', 'scrape_libreoffice'),
-            'postman': ScraperConfig('postman/main.py', 'scraper_postman', 'scrape_postman'),
-            'slack': ScraperConfig('slack/main.py', 'scraper_slack', 'scrape_slack'),
-            'teamviwer': ScraperConfig('teamviwer/main.py', 'scraper_teamviwer', 'scrape_teamviwer'),
-            'utraviews': ScraperConfig('utraviews/main.py', 'scraper_utraviews', 'scrape_utraviews'),
-            'vlc_main': ScraperConfig('vlc_main/main.py', 'scraper_vlc_main', 'scrape_vlc'),
-            'vscode': ScraperConfig('vscode/main.py', 'scraper_vscode', 'scrape_vscode'),
-            'winscp': ScraperConfig('winscp/main.py', 'scraper_winscp', 'scrape_winscp'),
-            'Zoom': ScraperConfig('Zoom/main.py', 'scraper_zoom', 'scrape_zoom'),
+            '7-zip': ScraperConfig('7-zip/main.py', 'scraper_7zip', 'SevenZipScraper', hosts=['www.7-zip.org']),
+            'anydesk': ScraperConfig('anydesk/main.py', 'scraper_anydesk', 'AnyDeskScraper', hosts=['download.anydesk.com']),
+            'docker': ScraperConfig('docker/main.py', 'docker_scraper', 'DockerScraper', hosts=['docs.docker.com']),
+            'fontbase': ScraperConfig('fontbase/main.py', 'scraper_fontbase', 'FontBaseScraper', hosts=['fontba.se']),
+            'fortinet': ScraperConfig('fortinet/main.py', 'scraper_fortinet', 'FortinetScraper', hosts=['www.fortinet.com']),
+            'Foxit_PDF': ScraperConfig('Foxit_PDF/main.py', 'scraper_foxit_pdf', 'FoxitPdfScraper', hosts=['cdn01.foxitsoftware.com', 'www.foxit.com']),
+            'git': ScraperConfig('git/main.py', 'scraper_git', 'GitScraper', hosts=['api.github.com'],
+                                repos=['git-for-windows/git']),
+            'LibreOffice': ScraperConfig('LibreOffice/main.py', 'scraper_libreoffice', 'LibreOfficeScraper', hosts=['download.documentfoundation.org']),
+            'postman': ScraperConfig('postman/main.py', 'scraper_postman', 'PostmanScraper', hosts=['www.postman.com']),
+            'slack': ScraperConfig('slack/main.py', 'scraper_slack', 'SlackScraper', hosts=['slack.com']),
+            'teamviwer': ScraperConfig('teamviwer/main.py', 'scraper_teamviwer', 'TeamViewerScraper', hosts=['www.teamviewer.com']),
+            'utraviews': ScraperConfig('utraviews/main.py', 'scraper_utraviews', 'UltraViewerScraper', hosts=['www.ultraviewer.net']),
+            'vlc_main': ScraperConfig('vlc_main/main.py', 'scraper_vlc_main', 'VlcScraper', hosts=['download.videolan.org']),
+            'vscode': ScraperConfig('vscode/main.py', 'scraper_vscode', 'VSCodeScraper', hosts=['code.visualstudio.com']),
+            'winscp': ScraperConfig('winscp/main.py', 'scraper_winscp', 'WinSCPScraper', hosts=['sourceforge.net']),
+            'Zoom': ScraperConfig('Zoom/main.py', 'scraper_zoom', 'ZoomScraper', hosts=['support.zoom.com', 'zoom.us']),
             
             # Node.js scrapers (multiple files)
-            'nodejs': ScraperConfig('nodejs/latest.py', 'scraper_nodejs', 'scrape_nodejs'),
-            'nodejs_lts': ScraperConfig('nodejs/node_LTS.py', 'scraper_nodejs_lts', 'scrape_nodejs_files'),
+            'nodejs': ScraperConfig('nodejs/latest.py', 'scraper_nodejs', 'NodeJsScraper', hosts=['nodejs.org']),
+            'nodejs_lts': ScraperConfig('nodejs/node_LTS.py', 'scraper_nodejs_lts', 'NodeJsLtsScraper', hosts=['nodejs.org']),
             
             # Additional scrapers found in folders - updated with correct function names
-            'Fiddler': ScraperConfig('Fiddler/main.py', 'scraper_fiddler', 'scrape_fiddler'),
-            'wireshark': ScraperConfig('wireshark/main.py', 'scraper_wireshark', 'scrape_wireshark'),
-            'MobaXterm': ScraperConfig('MobaXterm/main.py', 'scraper_mobaxterm', 'scrape_mobaxterm'),
-            'thunderbird': ScraperConfig('thunderbird/main.py', 'scraper_thunderbird', 'scrape_thunderbird'),
-            'gimp': ScraperConfig('gimp/main.py', 'scraper_gimp', 'scrape_gimp'),
-            'peazip': ScraperConfig('peazip/main.py', 'scraper_peazip', 'scrape_peazip'),
-            'putty': ScraperConfig('putty/main.py', 'scraper_putty', 'scrape_putty')
+            'Fiddler': ScraperConfig('Fiddler/main.py', 'scraper_fiddler', 'FiddlerScraper', hosts=['api.github.com']),
+            'wireshark': ScraperConfig('wireshark/main.py', 'scraper_wireshark', 'WiresharkScraper', hosts=['2.na.dl.wireshark.org']),
+            'MobaXterm': ScraperConfig('MobaXterm/main.py', 'scraper_mobaxterm', 'MobaXtermScraper', hosts=['mobaxterm.mobatek.net']),
+            'thunderbird': ScraperConfig('thunderbird/main.py', 'scraper_thunderbird', 'ThunderbirdScraper', hosts=['download-installer.cdn.mozilla.net', 'download.mozilla.org']),
+            'gimp': ScraperConfig('gimp/main.py', 'scraper_gimp', 'GimpScraper', hosts=['download.gimp.org']),
+            'peazip': ScraperConfig('peazip/main.py', 'scraper_peazip', 'PeaZipScraper', hosts=['api.github.com'],
+                                   repos=['peazip/PeaZip']),
+            'putty': ScraperConfig('putty/main.py', 'scraper_putty', 'PuttyScraper', hosts=['www.chiark.greenend.org.uk']),
+            'obs_studio': ScraperConfig('obs_studio/main.py', 'scraper_obs_studio', 'ObsStudioScraper', hosts=['api.github.com'],
+                                        repos=['obsproject/obs-studio']),
+            'openvpn': ScraperConfig('openvpn/main.py', 'scraper_openvpn', 'OpenVPNScraper', hosts=['openvpn.net']),
+            'Balsamiq': ScraperConfig('Balsamiq/main.py', 'scraper_balsamiq', 'BalsamiqScraper', hosts=['builds.balsamiq.com'])
         }
         
         # Load custom config if provided
@@ -100,7 +229,16 @@ class ScraperOrchestrator:
                         default_config[name] = ScraperConfig(**config_data)
             except Exception as e:
                 logger.warning(f"Failed to load custom config: {e}")
-                
+
+        # A bad cron expression would otherwise only surface when the daemon schedules the next run
+        for name, config in default_config.items():
+            if config.cron and config.enabled:
+                try:
+                    CronSchedule(config.cron).next_after(datetime.now())
+                except ValueError as e:
+                    logger.error(f"Disabling scraper '{name}': invalid cron schedule: {e}")
+                    config.enabled = False
+
         return default_config
 
     async def load_scraper(self, scraper_name: str) -> Optional[Dict[str, Any]]:
@@ -117,53 +255,24 @@ class ScraperOrchestrator:
             return None
 
         try:
-            spec = importlib.util.spec_from_file_location(config.module, str(scraper_path))
-            if spec is None or spec.loader is None:
-                logger.error(f"Failed to create module spec for {scraper_name}")
-                return None
-                
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[config.module] = module
-            spec.loader.exec_module(module)
-            
-            # Try to find the scraping function
-            scrape_func = None
-            
-            # First try the configured function name
-            if hasattr(module, config.function):
-                scrape_func = getattr(module, config.function)
-            else:
-                # Try common function name patterns
-                possible_functions = [
-                    config.function,
-                    f"scrape_{scraper_name.lower().replace('-', '_').replace('_main', '')}",
-                    f"scrape_{scraper_name.lower().replace('-', '_')}",
-                    "main",
-                    "scrape",
-                    "run"
-                ]
-                
-                for func_name in possible_functions:
-                    if hasattr(module, func_name):
-                        func = getattr(module, func_name)
-                        if callable(func):
-                            scrape_func = func
-                            break
-            
-            if not scrape_func:
-                logger.error(f"Scraping function not found in {scraper_name}. Tried: {config.function}")
-                return None
-                
+            loaded = self.loader.load(scraper_name, scraper_path, config.module, config.function)
             return {
-                'module': module,
-                'function': scrape_func
+                'module': loaded.module,
+                'function': loaded.function,
+                'is_script': loaded.is_script
             }
         except Exception as e:
             logger.exception(f"Error loading scraper '{scraper_name}': {str(e)}")
             return None
 
-    async def run_scraper(self, scraper_name: str) -> bool:
-        """Run a specific scraper with retry mechanism and timeout."""
+    async def run_scraper(self, scraper_name: str, force: bool = False) -> bool:
+        """Run a specific scraper with retry mechanism and timeout.
+
+        Scrapers with a ``probe()`` hook are first asked for the current version;
+        if it matches the last successful full scrape the scrape is skipped,
+        unless ``force`` is set (the probe still runs, so the scrape reads a
+        fresh version pointer).
+        """
         logger.info(f"Starting scraper: {scraper_name}")
         
         config = self.scrapers.get(scraper_name)
@@ -176,35 +285,58 @@ class ScraperOrchestrator:
         stats = self.stats[scraper_name]
         stats.start_time = datetime.now()
 
+        from common.fetch import FetchContext, accepts_context
+        from common.http import RequestCounters, current_counters, set_client
+
+        # Scrapers reach the shared client through get_client(); make sure it is this run's
+        set_client(self.http)
+
+        # Attribute HTTP traffic issued by this scraper to its own stats
+        counters = RequestCounters()
+        current_counters.set(counters)
+
+        # Even a forced run probes: it refreshes the version pointer the scrape resolves from.
+        # Isolated scrapers are probed here too, so an unchanged version never starts a worker
+        stats.probed_version = await self._probe(scraper_name)
+        pointer = self.versions.get(scraper_name)
+        if (not force and stats.probed_version is not None and pointer is not None
+                and pointer.scraped == stats.probed_version):
+            logger.info(f"{scraper_name} still at {stats.probed_version}, skipping the full scrape")
+            stats.unchanged = True
+            self._finish_success(scraper_name, stats, counters)
+            return True
+
         for attempt in range(config.max_retries):
             stats.attempts += 1
             try:
-                scraper = await self.load_scraper(scraper_name)
-                if not scraper:
-                    return False
-
-                # Run with timeout
-                if asyncio.iscoroutinefunction(scraper['function']):
-                    await asyncio.wait_for(scraper['function'](), timeout=config.timeout)
+                if config.isolation == "process":
+                    result = await self._run_isolated(scraper_name, config, counters)
                 else:
-                    # Run sync function in thread pool
-                    loop = asyncio.get_event_loop()
-                    await asyncio.wait_for(
-                        loop.run_in_executor(self.executor, scraper['function']),
-                        timeout=config.timeout
-                    )
-                    
-                stats.success = True
-                stats.end_time = datetime.now()
-                stats.duration = (stats.end_time - stats.start_time).total_seconds()
-                
-                # Calculate data size
-                info_file = Path(self.base_path) / f"{scraper_name}_info.json"
-                if info_file.exists():
-                    stats.data_size = info_file.stat().st_size
-                
-                logger.info(f"Successfully completed {scraper_name} scraper in {stats.duration:.2f}s")
-                return True
+                    scraper = await self.load_scraper(scraper_name)
+                    if not scraper:
+                        return False
+
+                    # Run with timeout
+                    if is_streaming(scraper['function']):
+                        # Records are written to the scraper's output file as they are yielded
+                        result = await asyncio.wait_for(
+                            stream_to(self.output_path(scraper_name), scraper['function'],
+                                      FetchContext(self.aio, scraper_name), self.executor),
+                            timeout=config.timeout
+                        )
+                    elif asyncio.iscoroutinefunction(scraper['function']):
+                        func = scraper['function']
+                        coro = func(FetchContext(self.aio, scraper_name)) if accepts_context(func) else func()
+                        result = await asyncio.wait_for(coro, timeout=config.timeout)
+                    else:
+                        # Run sync function in thread pool
+                        loop = asyncio.get_event_loop()
+                        context = contextvars.copy_context()
+                        result = await asyncio.wait_for(
+                            loop.run_in_executor(self.executor, context.run, scraper['function']),
+                            timeout=config.timeout
+                        )
+                break
                 
             except asyncio.TimeoutError:
                 error_msg = f"Timeout after {config.timeout}s"
@@ -217,10 +349,232 @@ class ScraperOrchestrator:
                 
             if attempt < config.max_retries - 1:
                 await asyncio.sleep(config.retry_delay)
-        
+        else:
+            stats.end_time = datetime.now()
+            stats.duration = (stats.end_time - stats.start_time).total_seconds()
+            self._record_http_stats(stats, counters)
+            self.history.record(scraper_name, stats.duration, success=False)
+            return False
+
+        # Outside the retry loop: a bookkeeping failure must not run the scraper again
+        self._finish_success(scraper_name, stats, counters, result)
+        return True
+
+    def _finish_success(self, scraper_name: str, stats: ScraperStats, counters: "RequestCounters",
+                        result: Any = None) -> None:
+        stats.success = True
+        self.results[scraper_name] = result
         stats.end_time = datetime.now()
         stats.duration = (stats.end_time - stats.start_time).total_seconds()
-        return False
+        self._record_http_stats(stats, counters)
+        if not stats.unchanged:
+            # Probe-only runs would drag the expected duration of a full scrape down
+            self.history.record(scraper_name, stats.duration, success=True)
+        if stats.probed_version is not None and not stats.unchanged:
+            self.versions.mark_scraped(scraper_name, stats.probed_version)
+        if isinstance(result, StreamSummary):
+            # Fingerprinted while the records were written; nothing to read back
+            self.cadence.observe(scraper_name, result.fingerprint)
+            stats.data_size, stats.records = result.bytes, result.records
+        else:
+            self.cadence.observe(scraper_name,
+                                 fingerprint(self._scraper_outputs(scraper_name, result, stats.start_time)))
+            # Calculate data size
+            info_file = Path(self.base_path) / f"{scraper_name}_info.json"
+            if info_file.exists():
+                stats.data_size = info_file.stat().st_size
+
+        logger.info(f"Successfully completed {scraper_name} scraper in {stats.duration:.2f}s")
+
+    async def _run_isolated(self, scraper_name: str, config: ScraperConfig, counters: "RequestCounters") -> Any:
+        """Run a scraper in a worker process that is killed when it times out."""
+        from common.isolation import WorkerFailed, run_in_process, worker_spec_for
+
+        spec = worker_spec_for(scraper_name, self.base_path, config, self.cache_path, self.output_path(scraper_name))
+        try:
+            outcome = await run_in_process(spec, timeout=config.timeout)
+        except WorkerFailed as e:
+            self._merge_counters(counters, e.counters)
+            raise
+        self._merge_counters(counters, outcome["counters"])
+        return outcome["result"]
+
+    async def _probe(self, scraper_name: str) -> Optional[str]:
+        """Run the scraper's optional probe(); None if it has none or the probe fails."""
+        from common.fetch import FetchContext, accepts_context
+
+        scraper = await self.load_scraper(scraper_name)
+        probe = getattr(scraper['module'], 'probe', None) if scraper and not scraper['is_script'] else None
+        if not callable(probe):
+            return None
+        try:
+            if asyncio.iscoroutinefunction(probe):
+                coro = probe(FetchContext(self.aio, scraper_name)) if accepts_context(probe) else probe()
+                version = await asyncio.wait_for(coro, timeout=PROBE_TIMEOUT)
+            else:
+                loop = asyncio.get_event_loop()
+                context = contextvars.copy_context()
+                version = await asyncio.wait_for(loop.run_in_executor(self.executor, context.run, probe),
+                                                 timeout=PROBE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Probe failed for {scraper_name}, running the full scrape: {e}")
+            return None
+        if not version:
+            return None
+        version = str(version)
+        # The scraper resolves its version pointer during the scrape; a fresh one saves it a request
+        self.versions.set(scraper_name, version)
+        return version
+
+    def _written_files(self, scraper_name: str, since: datetime) -> List[tuple]:
+        """(path, data) of the JSON files a scraper wrote next to itself since ``since``."""
+        written = []
+        folder = (self.base_path / self.scrapers[scraper_name].path).parent
+        candidates = sorted(folder.glob("*.json")) + [self.base_path / f"{scraper_name}_info.json"]
+        for path in dict.fromkeys(candidates):
+            try:
+                if path.stat().st_mtime >= since.timestamp():
+                    written.append((path, json.loads(path.read_text(encoding='utf-8'))))
+            except (OSError, ValueError):
+                continue
+        return written
+
+    def _scraper_outputs(self, scraper_name: str, result: Any, since: datetime) -> List[Any]:
+        """What a run produced: its return value plus the JSON files it wrote next to itself."""
+        return [result] + [data for _, data in self._written_files(scraper_name, since)]
+
+    def output_path(self, scraper_name: str) -> Path:
+        """Where a streaming scraper's records are written."""
+        return self.output_dir / f"{scraper_name}.jsonl"
+
+    def links_path(self, scraper_name: str) -> Path:
+        """Where the link checks of a streaming scraper's records are written, keyed by URL."""
+        return self.output_dir / f"{scraper_name}.links.json"
+
+    def stored_outputs(self, scraper_name: str) -> Iterable[Any]:
+        """What a scraper's runs left: its streamed records, read one at a time, or the JSON files next to it."""
+        if self.output_path(scraper_name).exists():
+            return read_records(self.output_path(scraper_name))
+        return [data for _, data in self._written_files(scraper_name, datetime.fromtimestamp(0))]
+
+    async def download_artifacts(self, names: List[str], store: Optional[str] = None,
+                                 platform: Optional[str] = None, **settings) -> List["Download"]:
+        """Download the files the given scrapers last found into the content-addressed artifact store.
+
+        ``platform`` keeps only files whose platform contains it (case-insensitive);
+        ``settings`` go to the Downloader (connections, per_host, bandwidth, ...).
+        """
+        from common.downloader import ArtifactStore, Downloader, artifacts_in
+
+        artifacts = artifacts_in(output for name in names for output in self.stored_outputs(name))
+        if platform:
+            artifacts = [a for a in artifacts if platform.lower() in (a.platform or "").lower()]
+        downloader = Downloader(ArtifactStore(store) if store else None, self.http, **settings)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, downloader.download_all, artifacts)
+
+    async def verify_links(self, names: List[str]) -> Dict[str, int]:
+        """Check the download links the given scrapers just emitted and attach the results to their records.
+
+        Each record with a link gets a ``link`` entry (status, final URL after
+        redirects, content length, last modified) and its JSON file is rewritten
+        in place. Streamed outputs are left as written: their links are read
+        from the ``.urls`` sidecar written while streaming, and their checks go
+        to ``output/<name>.links.json``, keyed by URL. Links checked within LINK_TTL keep their last result, the
+        rest are re-checked stalest first. Runs after the cadence fingerprint,
+        so check times never look like a product change.
+        """
+        from common.verify import LinkVerifier, attach, iter_links
+
+        documents = []  # (scraper, path or None for the return value, data)
+        streamed = []  # (scraper, .urls sidecar written while streaming)
+        for name in names:
+            stats = self.stats.get(name)
+            if stats is None or not stats.success or stats.unchanged:
+                continue
+            result = self.results.get(name)
+            if isinstance(result, StreamSummary):
+                streamed.append((name, result.urls))
+                continue
+            documents.append((name, None, result))
+            documents.extend((name, path, data) for path, data in self._written_files(name, stats.start_time))
+        if not self.check_links or not (documents or streamed):
+            return {}
+
+        verifier = LinkVerifier(self.aio, self.links)
+        checks = await verifier.verify(itertools.chain(
+            (url for _, _, data in documents for _, _, url in iter_links(data)),
+            (url for _, urls in streamed for url in read_lines(urls))
+        ))
+        emitted: Dict[str, set] = {}
+        for name, urls in streamed:
+            emitted[name] = set(read_lines(urls))
+            path = self.links_path(name)
+            try:
+                tmp = path.with_suffix(f".{os.getpid()}.tmp")
+                tmp.write_text(json.dumps({url: checks[url].summary() for url in emitted[name] if url in checks},
+                                          indent=1, ensure_ascii=False), encoding='utf-8')
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.warning(f"Failed to write link checks to {path}: {e}")
+        for name, path, data in documents:
+            emitted.setdefault(name, set()).update(url for _, _, url in iter_links(data))
+            if attach(data, checks) and path is not None:
+                try:
+                    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+                    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+                    os.replace(tmp, path)
+                except OSError as e:
+                    logger.warning(f"Failed to write link checks to {path}: {e}")
+        for name, urls in emitted.items():
+            broken = sorted(url for url in urls if url in checks and not checks[url].ok)
+            self.stats[name].links, self.stats[name].broken_links = len(urls), len(broken)
+            if broken:
+                logger.warning(f"{name}: {len(broken)} download links failed: {', '.join(broken[:5])}")
+        self.links.save()
+
+        self.link_stats = {"links": len(checks), "checked": verifier.checked, "reused": verifier.reused,
+                           "broken": sum(1 for check in checks.values() if not check.ok)}
+        logger.info(f"Verified {len(checks)} download links ({verifier.checked} checked, "
+                    f"{verifier.reused} still fresh, {self.link_stats['broken']} broken)")
+        return self.link_stats
+
+    def _due_scrapers(self, names: List[str], force: bool) -> List[str]:
+        """Drop scrapers whose product is not due for a check according to its release cadence."""
+        self.cadence_decisions = {}
+        due = []
+        for name in names:
+            decision = self.cadence.decide(name, force)
+            self.cadence_decisions[name] = {
+                "run": decision.run,
+                "reason": decision.reason,
+                "next_check": datetime.fromtimestamp(decision.next_check).isoformat() if decision.next_check else None
+            }
+            if decision.run:
+                due.append(name)
+        if len(due) < len(names):
+            logger.info(f"Skipping {len(names) - len(due)} scrapers not due for a check (use --force to run them)")
+        return due
+
+    def _merge_counters(self, counters: "RequestCounters", worker_counters: Dict[str, int]) -> None:
+        """Fold a worker process's traffic into this scraper's and the run-wide counters."""
+        for name, value in worker_counters.items():
+            setattr(counters, name, getattr(counters, name) + value)
+            totals = self.http.recorder.totals
+            setattr(totals, name, getattr(totals, name) + value)
+
+    @staticmethod
+    def _record_http_stats(stats: ScraperStats, counters: "RequestCounters") -> None:
+        """Copy per-scraper HTTP counters into its stats."""
+        stats.requests_made = counters.requests
+        stats.connections_opened = counters.connections
+        stats.connection_reuse_ratio = counters.reuse_ratio
+        stats.cache_hits = counters.cache_hits
+        stats.cache_misses = counters.cache_misses
+        stats.cache_revalidated = counters.cache_revalidated
+        stats.memo_hits = counters.memo_hits
+        stats.coalesced = counters.coalesced
+        stats.bytes_saved = counters.bytes_saved
 
     def list_available_scrapers(self) -> List[str]:
         """List all available scrapers."""
@@ -242,6 +596,7 @@ class ScraperOrchestrator:
             "file_path": str(scraper_path),
             "max_retries": config.max_retries,
             "timeout": config.timeout,
+            "isolation": config.isolation,
             "function_name": config.function
         }
         
@@ -251,21 +606,82 @@ class ScraperOrchestrator:
             
         return status
 
-    async def run_all_scrapers(self, max_concurrent: int = 3) -> Dict[str, bool]:
-        """Run all available scrapers with controlled concurrency."""
-        enabled_scrapers = [name for name, config in self.scrapers.items() if config.enabled]
-        
-        # Sort by priority
-        enabled_scrapers.sort(key=lambda x: self.scrapers[x].priority)
+    def group_slots(self, names: List[str], max_concurrent: int):
+        """Semaphores limiting scrapers that share a site to ``max_concurrent`` at a time.
+
+        Returns (slot per scraper, group id per scraper, lanes per group, overall parallelism).
+        """
+        group_slots: Dict[str, asyncio.Semaphore] = {}
+        group_of: Dict[str, str] = {}
+        group_lanes: Dict[str, int] = {}
+        for group in independent_groups({name: self.scrapers[name].hosts for name in names}):
+            lanes = min(len(group), max_concurrent)
+            slot = asyncio.Semaphore(lanes)
+            group_lanes[group[0]] = lanes
+            group_slots.update({name: slot for name in group})
+            group_of.update({name: group[0] for name in group})
+        parallelism = min(MAX_PARALLEL_SCRAPERS, sum(group_lanes.values()) or 1)
+        return group_slots, group_of, group_lanes, parallelism
+
+    def reload_config(self) -> List[str]:
+        """Re-read the config file; returns the scrapers whose configuration changed."""
+        scrapers = self._load_scraper_config()
+        changed = [name for name in scrapers.keys() | self.scrapers.keys()
+                   if scrapers.get(name) != self.scrapers.get(name)]
+        for name in changed:
+            self.loader.invalidate(name)  # path or function may have moved
+        self.scrapers = scrapers
+        return changed
+
+    async def close(self) -> None:
+        """Release pooled connections, the cache and worker threads."""
+        if self._aio is not None:
+            await self._aio.aclose()
+        if self._http is not None:
+            self._http.close()
+        self.executor.shutdown(wait=False)
+
+    async def run_all_scrapers(self, max_concurrent: int = 3, time_budget: Optional[float] = None,
+                               names: Optional[List[str]] = None, force: bool = False) -> Dict[str, bool]:
+        """Run all available scrapers, in parallel across independent hosts.
+
+        Scrapers that share a site (directly or through another scraper) form a
+        group limited to ``max_concurrent`` at a time; separate groups run side by
+        side up to MAX_PARALLEL_SCRAPERS. Request pacing within a site is left to
+        the HostScheduler. Within each priority tier the scrapers expected to take
+        longest start first; with ``time_budget`` (seconds) only the scrapers
+        expected to finish inside it are run. ``names`` restricts the run to those
+        scrapers, enabled or not. Without ``names``, products not due for a check
+        by their learned release cadence are skipped unless ``force`` is set.
+        """
+        if names:
+            enabled_scrapers = names
+            self.cadence_decisions = {}
+        else:
+            enabled_scrapers = self._due_scrapers(
+                [name for name, config in self.scrapers.items() if config.enabled], force
+            )
+
+        group_slots, group_of, group_lanes, parallelism = self.group_slots(enabled_scrapers, max_concurrent)
+
+        plan = plan_run(enabled_scrapers, {name: self.scrapers[name].priority for name in enabled_scrapers},
+                        self.history, group_of, group_lanes, parallelism, time_budget)
+        self.last_plan = plan
+        enabled_scrapers = plan.order
+        if plan.skipped:
+            logger.info(f"Skipping {len(plan.skipped)} scrapers to fit the {time_budget:.0f}s budget: "
+                        f"{', '.join(plan.skipped)}")
         
-        logger.info(f"Running {len(enabled_scrapers)} scrapers with max {max_concurrent} concurrent")
+        logger.info(f"Running {len(enabled_scrapers)} scrapers in {len(group_lanes)} host groups "
+                    f"({parallelism} parallel, max {max_concurrent} per group, "
+                    f"expected makespan {plan.makespan:.1f}s)")
         
-        # Use semaphore to limit concurrency
-        semaphore = asyncio.Semaphore(max_concurrent)
+        await self._prefetch_releases(enabled_scrapers)
+        semaphore = asyncio.Semaphore(parallelism)
         
         async def run_with_semaphore(scraper_name: str) -> tuple[str, bool]:
-            async with semaphore:
-                success = await self.run_scraper(scraper_name)
+            async with group_slots[scraper_name], semaphore:
+                success = await self.run_scraper(scraper_name, force)
                 return scraper_name, success
         
         tasks = [run_with_semaphore(name) for name in enabled_scrapers]
@@ -279,67 +695,136 @@ class ScraperOrchestrator:
                 continue
             scraper_name, success = result
             final_results[scraper_name] = success
-            
+
+        await self.verify_links(list(final_results))
+        self.save_statistics()
+        # Pages are only shared within a run; the next one revalidates against the disk cache
+        self.memo.clear()
+        self.github.clear()
         return final_results
 
+    async def _prefetch_releases(self, names: List[str]) -> None:
+        """Resolve the GitHub releases the due scrapers read in one batched query."""
+        repos = [repo for name in names for repo in self.scrapers[name].repos]
+        if not repos or not self.github.token:
+            return
+        from common.http import set_client
+        set_client(self.http)
+        loop = asyncio.get_running_loop()
+        try:
+            resolved = await loop.run_in_executor(self.executor, self.github.prefetch, repos)
+            logger.info(f"Resolved {resolved} of {len(set(repos))} GitHub releases in one batch")
+        except Exception as e:
+            logger.warning(f"GitHub release prefetch failed: {e}")
+
     async def combine_results(self) -> Dict[str, Any]:
-        """Combine results from all scrapers into a single JSON file with enhanced metadata."""
-        combined_data = {
-            "products": [],
-            "metadata": {
-                "timestamp": datetime.now().isoformat(),
-                "total_scrapers": len(self.scrapers),
-                "enabled_scrapers": len([s for s in self.scrapers.values() if s.enabled]),
-                "successful_scrapers": 0,
-                "failed_scrapers": 0,
-                "total_duration": 0,
-                "total_data_size": 0,
-                "scraper_stats": {}
-            }
+        """Combine results from all scrapers into a single JSON file with enhanced metadata.
+
+        Streamed records are copied into the file line by line as they were
+        serialized, so the products never sit in memory; scrapers that still
+        write their own files contribute ``{name}_info.json``, or else the JSON
+        files next to them. ``products`` in the returned dict is a StoredProducts
+        view that reads them back one product at a time when iterated.
+        """
+        metadata = {
+            "timestamp": datetime.now().isoformat(),
+            "total_scrapers": len(self.scrapers),
+            "enabled_scrapers": len([s for s in self.scrapers.values() if s.enabled]),
+            "successful_scrapers": 0,
+            "failed_scrapers": 0,
+            "total_records": 0,
+            "total_duration": 0,
+            "total_data_size": 0,
+            "scraper_stats": {}
         }
 
-        for scraper_name in self.scrapers:
-            info_file = Path(self.base_path) / f"{scraper_name}_info.json"
-            
-            try:
-                if info_file.exists():
-                    data = json.loads(info_file.read_text(encoding='utf-8'))
-                    combined_data["products"].append(data)
-                    combined_data["metadata"]["successful_scrapers"] += 1
-                    
+        output_path = Path(self.base_path) / "combined_results.json"
+        tmp = output_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as out:
+                out.write('{\n  "products": [')
+                products = 0
+                combined = []  # scrapers that contributed products, in file order
+                for scraper_name in self.scrapers:
+                    try:
+                        written = self._write_products(out, scraper_name, first=products == 0)
+                    except Exception as e:
+                        logger.error(f"Error processing {scraper_name} results: {str(e)}")
+                        metadata["failed_scrapers"] += 1
+                        continue
+                    if written is None:
+                        logger.warning(f"No results file found for {scraper_name}")
+                        metadata["failed_scrapers"] += 1
+                        continue
+                    combined.append(scraper_name)
+                    products += written[0]
+                    metadata["successful_scrapers"] += 1
+                    metadata["total_records"] += written[1]
+
                     # Add stats if available
                     if scraper_name in self.stats:
                         stats = self.stats[scraper_name]
-                        combined_data["metadata"]["scraper_stats"][scraper_name] = asdict(stats)
+                        metadata["scraper_stats"][scraper_name] = asdict(stats)
                         if stats.duration:
-                            combined_data["metadata"]["total_duration"] += stats.duration
+                            metadata["total_duration"] += stats.duration
                         if stats.data_size:
-                            combined_data["metadata"]["total_data_size"] += stats.data_size
-                else:
-                    logger.warning(f"No results file found for {scraper_name}")
-                    combined_data["metadata"]["failed_scrapers"] += 1
-                    
-            except Exception as e:
-                logger.error(f"Error processing {scraper_name} results: {str(e)}")
-                combined_data["metadata"]["failed_scrapers"] += 1
-
-        # Save combined results
-        output_path = Path(self.base_path) / "combined_results.json"
-        try:
-            output_path.write_text(
-                json.dumps(combined_data, indent=2, ensure_ascii=False),
-                encoding='utf-8'
-            )
+                            metadata["total_data_size"] += stats.data_size
+                out.write('\n  ],\n  "metadata": ')
+                out.write(json.dumps(metadata, indent=2, ensure_ascii=False, default=str).replace("\n", "\n  "))
+                out.write("\n}\n")
+            os.replace(tmp, output_path)
             logger.info(f"Combined results saved to {output_path}")
         except Exception as e:
             logger.error(f"Error saving combined results: {str(e)}")
+            with contextlib.suppress(OSError):
+                tmp.unlink()
+
+        return {"products": StoredProducts(self, combined, products), "metadata": metadata}
 
-        return combined_data
+    def _write_products(self, out, scraper_name: str, first: bool) -> Optional[tuple]:
+        """Append a scraper's output to the products array; returns (products, records), None without output."""
+        separator = "\n    " if first else ",\n    "
+        stream = self.output_path(scraper_name)
+        if stream.exists():
+            # A streamed scraper is one product: the array of its records, each line copied as is
+            out.write(f"{separator}[")
+            count = 0
+            with open(stream, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        out.write(f"{',' if count else ''}\n      {line}")
+                        count += 1
+            out.write("\n    ]")
+            return 1, count
+
+        outputs = self._file_products(scraper_name)
+        if not outputs:
+            return None
+        for data in outputs:
+            out.write(separator + json.dumps(data, ensure_ascii=False, default=str))
+            separator = ",\n    "
+        return len(outputs), sum(len(data) if isinstance(data, list) else 1 for data in outputs)
+
+    def _file_products(self, scraper_name: str) -> List[Any]:
+        """The products of a scraper that writes its own files: ``{name}_info.json``, else the JSON next to it."""
+        info_file = Path(self.base_path) / f"{scraper_name}_info.json"
+        if info_file.exists():
+            return [json.loads(info_file.read_text(encoding='utf-8'))]
+        return [data for _, data in self._written_files(scraper_name, datetime.fromtimestamp(0))]
+
+    def products_of(self, scraper_name: str) -> Iterator[Any]:
+        """A scraper's products as combine_results writes them: a streamed output is one list of records."""
+        stream = self.output_path(scraper_name)
+        if stream.exists():
+            yield list(read_records(stream))
+        else:
+            yield from self._file_products(scraper_name)
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get detailed statistics about scraper runs."""
         if not self.stats:
-            return {"message": "No scraper runs recorded yet"}
+            return {"message": "No scraper runs recorded yet", "cadence": self.cadence_decisions}
             
         total_runs = len(self.stats)
         successful_runs = sum(1 for stats in self.stats.values() if stats.success)
@@ -358,80 +843,213 @@ class ScraperOrchestrator:
             "total_duration": total_duration,
             "average_duration": avg_duration,
             "total_data_size": total_data_size,
+            "http": self._http.stats() if self._http is not None else None,
+            "hosts": self.scheduler.stats(),
+            "rate_limits": self.scheduler.budgets(),
+            "memo": self.memo.stats(),
+            "links": self.link_stats,
+            "mirrors": self.mirrors.stats() if self.use_mirrors else None,
+            "plan": asdict(self.last_plan) if self.last_plan else None,
+            "cadence": self.cadence_decisions,
             "scraper_details": {
                 name: asdict(stats) for name, stats in self.stats.items()
             }
         }
 
+    def save_statistics(self) -> None:
+        """Persist the statistics of this run so a later process can report them."""
+        try:
+            self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+            self.stats_path.write_text(json.dumps(self.get_statistics(), indent=2, default=str), encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"Failed to save run statistics: {e}")
+
+    def load_statistics(self) -> Dict[str, Any]:
+        """Statistics of this process's runs, falling back to the last saved run."""
+        if self.stats or not self.stats_path.exists():
+            return self.get_statistics()
+        try:
+            return json.loads(self.stats_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read saved statistics: {e}")
+            return self.get_statistics()
+
     async def cleanup_old_files(self, days: int = 7) -> int:
-        """Clean up old JSON files older than specified days."""
+        """Clean up old result files (``{name}_info.json``, streamed outputs and their sidecars) older than specified days."""
         cutoff_date = datetime.now() - timedelta(days=days)
         cleaned_count = 0
         
         for scraper_name in self.scrapers:
-            info_file = Path(self.base_path) / f"{scraper_name}_info.json"
-            if info_file.exists():
-                file_time = datetime.fromtimestamp(info_file.stat().st_mtime)
+            stream = self.output_path(scraper_name)
+            for path in (Path(self.base_path) / f"{scraper_name}_info.json", stream, sidecar(stream, "urls"),
+                         sidecar(stream, "versions"), self.links_path(scraper_name)):
+                if not path.exists():
+                    continue
+                file_time = datetime.fromtimestamp(path.stat().st_mtime)
                 if file_time < cutoff_date:
                     try:
-                        info_file.unlink()
+                        path.unlink()
                         cleaned_count += 1
-                        logger.info(f"Cleaned up old file: {info_file}")
+                        logger.info(f"Cleaned up old file: {path}")
                     except Exception as e:
-                        logger.error(f"Failed to clean up {info_file}: {e}")
+                        logger.error(f"Failed to clean up {path}: {e}")
                         
         return cleaned_count
 
     def validate_scrapers(self) -> Dict[str, Dict[str, Any]]:
-        """Validate all scraper configurations and files."""
-        validation_results = {}
-        
-        for scraper_name, config in self.scrapers.items():
-            validation = {
-                "name": scraper_name,
-                "enabled": config.enabled,
-                "file_exists": False,
-                "function_found": False,
-                "errors": []
-            }
-            
-            # Check if file exists
-            scraper_path = self.base_path / config.path
-            if scraper_path.exists():
-                validation["file_exists"] = True
-                
-                # Try to load the module and check for function
-                try:
-                    spec = importlib.util.spec_from_file_location(config.module, str(scraper_path))
-                    if spec and spec.loader:
-                        module = importlib.util.module_from_spec(spec)
-                        spec.loader.exec_module(module)
-                        
-                        # Check for function
-                        if hasattr(module, config.function):
-                            validation["function_found"] = True
-                        else:
-                            validation["errors"].append(f"Function '{config.function}' not found")
-                    else:
-                        validation["errors"].append("Failed to create module spec")
-                except Exception as e:
-                    validation["errors"].append(f"Module loading error: {str(e)}")
-            else:
-                validation["errors"].append(f"File not found: {scraper_path}")
-                
-            validation_results[scraper_name] = validation
-            
-        return validation_results
+        """Validate all scraper configurations and files by static inspection (no imports, no network)."""
+        return validate_scrapers(self.scrapers, self.base_path)
 
-async def main():
-    parser = argparse.ArgumentParser(description='Product Scraper Orchestrator')
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description='Product Scraper Orchestrator',
+        epilog='Without a command, starts the interactive menu.'
+    )
     parser.add_argument('--config', help='Path to configuration file')
-    parser.add_argument('--max-concurrent', type=int, default=3, help='Maximum concurrent scrapers')
+    parser.add_argument('--max-concurrent', type=int, default=3, help='Maximum concurrent scrapers sharing a host')
+    parser.add_argument('--time-budget', type=float, help='Only run the scrapers expected to finish within N seconds')
+    parser.add_argument('--force', action='store_true', help='Run all scrapers even if their product is not due')
     parser.add_argument('--cleanup-days', type=int, default=7, help='Clean up files older than N days')
-    parser.add_argument('--validate', action='store_true', help='Validate all scraper configurations')
-    args = parser.parse_args()
+    parser.add_argument('--validate', action='store_true', help='Validate all scraper configurations and exit')
+    parser.add_argument('--no-link-check', action='store_true',
+                        help="Don't check the emitted download links after a run")
+    parser.add_argument('--no-mirrors', action='store_true',
+                        help='Fetch mirror-network hosts from their origin instead of the fastest mirror')
+
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    run = commands.add_parser('run', help='Run scrapers, exit 1 if any fails')
+    run.add_argument('names', nargs='*', help='Scrapers to run')
+    run.add_argument('--all', action='store_true', help='Run every enabled scraper')
+    run.add_argument('--json', action='store_true', help='Print a JSON summary')
+    run.add_argument('--force', action='store_true', default=argparse.SUPPRESS,
+                     help='Run scrapers even if their product is not due for a check')
+    for name, help_text in (('combine', 'Combine scraper results into combined_results.json'),
+                            ('stats', 'Show statistics of the last run'),
+                            ('validate', 'Validate scrapers without running them, exit 1 on errors')):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('--json', action='store_true', help='Print JSON')
+    download = commands.add_parser('download', help='Download the files scrapers found into the artifact store, '
+                                                     'exit 1 if any fails')
+    download.add_argument('names', nargs='+', help='Scrapers whose last output to download')
+    download.add_argument('--store', help='Artifact store directory (default: .cache/artifacts)')
+    download.add_argument('--platform', help='Only files whose platform contains this text')
+    download.add_argument('--connections', type=int, default=8, help='Transfers in flight (default: 8)')
+    download.add_argument('--per-host', type=int, default=4, help='Transfers in flight per host (default: 4)')
+    download.add_argument('--bandwidth', type=float, help='Total rate cap in MB/s')
+    download.add_argument('--host-bandwidth', type=float, help='Rate cap per host in MB/s')
+    download.add_argument('--json', action='store_true', help='Print a JSON report')
+    daemon = commands.add_parser('daemon', help='Stay resident and run each scraper on its interval/cron schedule')
+    daemon.add_argument('--default-interval', type=int, default=6 * 3600,
+                        help='Seconds between runs for scrapers without interval or cron (default: 6h)')
+    return parser
+
+
+def _print_json(data: Any) -> None:
+    print(json.dumps(data, indent=2, default=str))
+
+
+async def run_command(orchestrator: 'ScraperOrchestrator', args: argparse.Namespace) -> int:
+    """Run one batch subcommand; returns the process exit code. Logs go to stderr, summaries to stdout."""
+    if args.command == 'run':
+        if args.all == bool(args.names):
+            print("run: give scraper names or --all", file=sys.stderr)
+            return EXIT_USAGE
+        unknown = [name for name in args.names if name not in orchestrator.scrapers]
+        if unknown:
+            print(f"run: unknown scrapers: {', '.join(unknown)}", file=sys.stderr)
+            return EXIT_USAGE
+
+        start_time = time.time()
+        # Scrapers print progress; keep stdout for the summary
+        with contextlib.redirect_stdout(sys.stderr):
+            results = await orchestrator.run_all_scrapers(args.max_concurrent, args.time_budget, args.names or None,
+                                                          args.force)
+        summary = {
+            "success": all(results.values()),
+            "duration": round(time.time() - start_time, 2),
+            "results": results,
+            "skipped": orchestrator.last_plan.skipped,
+            "not_due": [name for name, d in orchestrator.cadence_decisions.items() if not d["run"]],
+        }
+        if args.json:
+            _print_json(summary)
+        else:
+            for scraper, success in results.items():
+                print(f"{scraper}\t{'ok' if success else 'failed'}")
+            for scraper in summary["skipped"]:
+                print(f"{scraper}\tskipped")
+            for scraper in summary["not_due"]:
+                print(f"{scraper}\tnot due")
+        return EXIT_OK if summary["success"] else EXIT_FAILED
+
+    if args.command == 'combine':
+        metadata = (await orchestrator.combine_results())['metadata']
+        if args.json:
+            _print_json({key: value for key, value in metadata.items() if key != 'scraper_stats'})
+        else:
+            print(f"successful\t{metadata['successful_scrapers']}")
+            print(f"failed\t{metadata['failed_scrapers']}")
+        return EXIT_OK
+
+    if args.command == 'stats':
+        stats = orchestrator.load_statistics()
+        if args.json:
+            _print_json(stats)
+        elif "message" in stats:
+            print(stats["message"])
+        else:
+            for key in ("total_runs", "successful_runs", "failed_runs", "success_rate", "total_duration"):
+                print(f"{key}\t{stats[key]}")
+        return EXIT_OK
+
+    if args.command == 'validate':
+        results = orchestrator.validate_scrapers()
+        if args.json:
+            _print_json(results)
+        else:
+            for scraper_name, validation in results.items():
+                print(f"{scraper_name}\t{'invalid' if validation['errors'] else 'valid'}")
+                for error in validation["errors"]:
+                    print(f"  {error}")
+                for note in validation["notes"]:
+                    print(f"  note: {note}")
+        return EXIT_FAILED if any(v["errors"] for v in results.values()) else EXIT_OK
+
+    if args.command == 'download':
+        from common.downloader import FAILED, download_report, summary
+        unknown = [name for name in args.names if name not in orchestrator.scrapers]
+        if unknown:
+            print(f"download: unknown scrapers: {', '.join(unknown)}", file=sys.stderr)
+            return EXIT_USAGE
+        megabytes = lambda rate: rate * 1024 * 1024 if rate else None
+        results = await orchestrator.download_artifacts(
+            args.names, args.store, args.platform, connections=args.connections, per_host=args.per_host,
+            bandwidth=megabytes(args.bandwidth), host_bandwidth=megabytes(args.host_bandwidth))
+        if args.json:
+            _print_json({"summary": summary(results), "files": [download_report(r) for r in results]})
+        else:
+            for result in results:
+                print(f"{result.artifact.url}\t{result.status}\t{result.sha256 or result.error}")
+        return EXIT_FAILED if any(result.status == FAILED for result in results) else EXIT_OK
+
+    if args.command == 'daemon':
+        from common.daemon import ScraperDaemon
+        await ScraperDaemon(orchestrator, args.max_concurrent, args.default_interval).run()
+        return EXIT_OK
+
+    return EXIT_USAGE
+
+
+async def main() -> int:
+    args = build_parser().parse_args()
+    if args.validate and not args.command:
+        args.command, args.json = 'validate', False
     
     orchestrator = ScraperOrchestrator(config_file=args.config)
+    orchestrator.check_links = not args.no_link_check
+    orchestrator.use_mirrors = not args.no_mirrors
+    if args.command:
+        return await run_command(orchestrator, args)
     
     while True:
         print("\n=== Product Scraper Orchestrator ===")
@@ -470,15 +1088,20 @@ async def main():
                     logger.error("Invalid scraper number")
                     
             elif choice == '3':
-                print(f"\nRunning all scrapers (max {args.max_concurrent} concurrent)...")
+                print(f"\nRunning all scrapers (max {args.max_concurrent} concurrent per host)...")
                 start_time = time.time()
-                results = await orchestrator.run_all_scrapers(args.max_concurrent)
+                results = await orchestrator.run_all_scrapers(args.max_concurrent, args.time_budget, force=args.force)
                 end_time = time.time()
                 
                 print(f"\nResults (completed in {end_time - start_time:.2f}s):")
                 for scraper, success in results.items():
                     status = "✅ Success" if success else "❌ Failed"
                     print(f"{scraper}: {status}")
+                for scraper in orchestrator.last_plan.skipped:
+                    print(f"{scraper}: ⏭ Skipped (over time budget)")
+                for scraper, decision in orchestrator.cadence_decisions.items():
+                    if not decision["run"]:
+                        print(f"{scraper}: ⏭ Not due until {decision['next_check']} ({decision['reason']})")
                     
             elif choice == '4':
                 print("\nCombining results from all scrapers...")
@@ -491,7 +1114,7 @@ async def main():
                 print(f"- Total data size: {metadata['total_data_size']} bytes")
                 
             elif choice == '5':
-                stats = orchestrator.get_statistics()
+                stats = orchestrator.load_statistics()
                 if "message" in stats:
                     print(f"\n{stats['message']}")
                 else:
@@ -503,6 +1126,18 @@ async def main():
                     print(f"- Total duration: {stats['total_duration']:.2f}s")
                     print(f"- Average duration: {stats['average_duration']:.2f}s")
                     print(f"- Total data size: {stats['total_data_size']} bytes")
+                    http_stats = stats['http']
+                    if http_stats and http_stats['reuse_ratio'] is not None:
+                        print(f"- HTTP requests: {http_stats['requests']} over {http_stats['connections']} connections "
+                              f"(reuse ratio: {http_stats['reuse_ratio']:.1%})")
+                        print(f"- HTTP cache: {http_stats['cache_hits']} hits, {http_stats['cache_revalidated']} "
+                              f"not modified (304), {http_stats['cache_misses']} misses")
+                        if http_stats.get('bytes_saved'):
+                            print(f"- Streaming searches stopped early, leaving {http_stats['bytes_saved']} bytes unread")
+                    throttled = {site: host for site, host in stats['hosts'].items() if host['throttled'] or host['errors']}
+                    for site, host in throttled.items():
+                        print(f"- {site}: {host['errors']} errors, {host['throttled']} throttled, "
+                              f"concurrency limit now {host['limit']}")
                 
             elif choice == '6':
                 days = int(input(f"Clean up files older than how many days? (default: {args.cleanup_days}): ") or args.cleanup_days)
@@ -515,15 +1150,20 @@ async def main():
                 
                 print("\nValidation Results:")
                 for scraper_name, validation in validation_results.items():
-                    status = "✅ Valid" if validation["file_exists"] and validation["function_found"] else "❌ Invalid"
+                    status = "✅ Valid" if validation["file_exists"] and not validation["errors"] else "❌ Invalid"
                     print(f"{scraper_name}: {status}")
                     if validation["errors"]:
                         for error in validation["errors"]:
                             print(f"  - {error}")
+                    elif validation["entry_point"] == "<module body>":
+                        print(f"  - Runs as a script ({len(validation['side_effects'])} top-level side effects)")
+                    elif validation["notes"]:
+                        for note in validation["notes"]:
+                            print(f"  - {note}")
                 
             elif choice == '8':
                 print("\nGoodbye!")
-                break
+                return EXIT_OK
                 
             else:
                 logger.warning("Invalid choice. Please try again.")
@@ -534,4 +1174,4 @@ async def main():
             logger.exception(f"Unexpected error: {str(e)}")
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    sys.exit(asyncio.run(main())) 
\ No newline at end of file
@@ -1,77 +1,58 @@
-import requests
-import json
-import os
+import logging
 import re
 from pathlib import Path
+import sys
 
-def scrape_peazip():
-    """Scrape PeaZip download information."""
-    print("🔍 Fetching PeaZip download information...")
-    
-    # Config
-    target_tag = "10.5.0"  # You can make this dynamic if needed
-    api_url = f"https://api.github.com/repos/peazip/PeaZip/releases/tags/{target_tag}"
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.github import get_github
+from common.probe import get_pointers, latest_github_tag
 
-    # Platform matchers
-    platform_keywords = {
-        "DARWIN.aarch64.dmg": "macOS (aarch64)",
-        "DARWIN.x86_64.dmg": "macOS (Intel)",
-        "WIN64.exe": "Windows x64",
-        "WINDOWS.exe": "Windows x86",
-        "LINUX.GTK2.x86_64.tar.gz": "Linux (x86_64 portable)",
-        "LINUX.GTK2.aarch64.tar.gz": "Linux (aarch64 portable)"
-    }
+logger = logging.getLogger(__name__)
 
-    try:
-        # Fetch from GitHub API
-        headers = {"Accept": "application/vnd.github.v3+json"}
-        res = requests.get(api_url, headers=headers, timeout=10)
-        if res.status_code != 200:
-            raise Exception(f"❌ GitHub API Error: {res.status_code} - {res.text}")
-        release_data = res.json()
+FALLBACK_TAG = "10.5.0"  # only used if the release can't be resolved and none is cached
 
-        # Parse assets
-        results = []
-        for asset in release_data.get("assets", []):
-            filename = asset.get("name", "")
-            download_url = asset.get("browser_download_url", "")
+# Platform matchers
+PLATFORM_KEYWORDS = {
+    "DARWIN.aarch64.dmg": "macOS (aarch64)",
+    "DARWIN.x86_64.dmg": "macOS (Intel)",
+    "WIN64.exe": "Windows x64",
+    "WINDOWS.exe": "Windows x86",
+    "LINUX.GTK2.x86_64.tar.gz": "Linux (x86_64 portable)",
+    "LINUX.GTK2.aarch64.tar.gz": "Linux (aarch64 portable)"
+}
+
+def probe():
+    """Tag of the latest PeaZip release on GitHub."""
+    return latest_github_tag("peazip/PeaZip")
+
+class PeaZipScraper(BaseScraper):
+    """PeaZip release assets, one per supported platform."""
+    product = "PeaZip"
+
+    def scrape(self, ctx):
+        logger.info("Fetching PeaZip download information...")
+        target_tag = get_pointers().resolve("peazip", probe, FALLBACK_TAG)
+
+        # Fetch from GitHub API (answered from the run's batch when the tag is the latest)
+        release = get_github().release("peazip/PeaZip", target_tag)
+
+        for asset in release.assets:
+            filename = asset.name
 
             # Extract version from filename
             version_match = re.search(r'(\d+\.\d+\.\d+)', filename)
             if not version_match:
                 continue
-            version = version_match.group(1)
 
-            for key, platform in platform_keywords.items():
+            for key, platform in PLATFORM_KEYWORDS.items():
                 if key in filename:
-                    results.append({
-                        "product": "PeaZip",
-                        "version": version,
+                    yield {
+                        "version": version_match.group(1),
                         "text": filename,
-                        "url": download_url,
+                        "url": asset.url,
                         "platform": platform
-                    })
-
-        # Save to the expected location for the orchestrator
-        output_path = Path(__file__).parent.parent / "peazip_info.json"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-
-        print(f"✅ Saved PeaZip versioned download links to: {output_path}")
-        return results
-        
-    except Exception as e:
-        print(f"❌ Error fetching PeaZip data: {e}")
-        return []
-
-def main():
-    """Main function for standalone execution."""
-    try:
-        scrape_peazip()
-    except Exception as e:
-        print(f"❌ Error: {e}")
+                    }
 
 if __name__ == "__main__":
-    main()
+    PeaZipScraper.main()
@@ -1,8 +1,12 @@
 
-import requests
-from bs4 import BeautifulSoup
 import re
-import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.http import get_client
+from common.parsing import parse_html
 
 def extract_version(text):
     match = re.search(r'(\d+\.\d+\.\d+)', text)
@@ -21,10 +25,10 @@ def detect_platform(rss_url):
 def get_slack_release_info(rss_url):
     platform, extensions = detect_platform(rss_url)
 
-    response = requests.get(rss_url)
+    response = get_client().get(rss_url)
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.content, "xml")
+    soup = parse_html(response, features="xml")
     latest_item = soup.find("item")
     title = latest_item.find("title").text.strip()
     content_encoded = latest_item.find("content:encoded").text.strip()
@@ -50,20 +54,16 @@ def get_slack_release_info(rss_url):
 
     return results
 
-def main():
-    # rss_url = "https://slack.com/intl/en-in/release-notes/linux/rss"
-    # rss_url = "https://slack.com/intl/en-in/release-notes/mac/rss"
-    rss_url = "https://slack.com/intl/en-in/release-notes/windows/rss"
-
+class SlackScraper(BaseScraper):
+    """Slack installers linked from the newest release note."""
+    product = "slack"
 
-    result = get_slack_release_info(rss_url)
+    def scrape(self, ctx):
+        # rss_url = "https://slack.com/intl/en-in/release-notes/linux/rss"
+        # rss_url = "https://slack.com/intl/en-in/release-notes/mac/rss"
+        rss_url = "https://slack.com/intl/en-in/release-notes/windows/rss"
 
-    print(json.dumps(result, indent=2))
-
-    with open("slack_dynamic_release.json", "w", encoding="utf-8") as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
-        print("\n✅ Saved to slack_dynamic_release.json")
+        yield from get_slack_release_info(rss_url)
 
 if __name__ == "__main__":
-    main()
-
+    SlackScraper.main()
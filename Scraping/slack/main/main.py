@@ -1,10 +1,16 @@
-import requests
 import xml.etree.ElementTree as ET
+import logging
 import re
-import json
-import os
 from datetime import datetime
 from typing import Dict, Optional
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.http import get_client
+
+logger = logging.getLogger(__name__)
 
 def extract_version(title: str) -> str:
     patterns = [
@@ -21,7 +27,7 @@ def extract_version(title: str) -> str:
 def fetch_latest_slack_update(platform: str = "macos") -> Optional[Dict]:
     try:
         url = f"https://slack.com/intl/en-in/release-notes/{platform}/rss"
-        response = requests.get(url)
+        response = get_client().get(url)
         response.raise_for_status()
 
         root = ET.fromstring(response.content)
@@ -55,30 +61,21 @@ def fetch_latest_slack_update(platform: str = "macos") -> Optional[Dict]:
         return latest_item
 
     except Exception as e:
-        print(f"❌ Error for {platform}: {str(e)}")
+        logger.error(f"Error for {platform}: {str(e)}")
         return None
 
-def save_to_file(data: Dict, platform: str) -> bool:
-    try:
-        output_dir = "/home/yash-gaudani/R%D/Vlc/slack/main"
-        os.makedirs(output_dir, exist_ok=True)
-        file_path = os.path.join(output_dir, f"slack_updates_{platform}.json")
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"✅ Saved to {file_path}")
-        return True
-    except Exception as e:
-        print(f"❌ Error saving for {platform}: {str(e)}")
-        return False
+class SlackUpdatesScraper(BaseScraper):
+    """The newest Slack release note for each platform, with the links it mentions."""
+    product = "Slack"
 
-def main():
-    for platform in ["mac", "windows", "linux"]:
-        print(f"\n🔍 Fetching latest update for: {platform}")
-        latest = fetch_latest_slack_update(platform)
-        if latest:
-            save_to_file(latest, platform)
-        else:
-            print(f"⚠️ No update found for {platform}")
+    def scrape(self, ctx):
+        for platform in ["mac", "windows", "linux"]:
+            logger.info(f"Fetching latest update for: {platform}")
+            latest = fetch_latest_slack_update(platform)
+            if latest:
+                yield latest
+            else:
+                logger.warning(f"No update found for {platform}")
 
 if __name__ == "__main__":
-    main()
+    SlackUpdatesScraper.main()
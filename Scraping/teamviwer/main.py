@@ -1,9 +1,14 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-import json
+import sys
+from pathlib import Path
 
-# Ask user for the TeamViewer download page URL
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.http import get_client
+from common.introspect import fill_versions, version_in
+from common.parsing import parse_html
+
+# TeamViewer download page
 url = "https://www.teamviewer.com/en-in/download/portal/windows/"
 # url = "https://www.teamviewer.com/en-in/download/portal/macos/"
 # url = "https://www.teamviewer.com/en-in/download/portal/linux/"
@@ -22,46 +27,48 @@ else:
     platform = "Unknown"
     valid_ext = []
 
-# Send GET request
-response = requests.get(url)
-response.raise_for_status()
+# Extract version from filename; TeamViewer_Setup_x64.exe has none, so the installer is asked below
+def extract_version_from_url(href):
+    filename = urlparse(href).path.split("/")[-1]
+    return version_in(filename) or "latest"
 
-# Parse the HTML
-soup = BeautifulSoup(response.text, "html.parser")
-links = soup.find_all("a", href=True)
+class TeamViewerScraper(BaseScraper):
+    """TeamViewer installers linked from the download portal."""
+    product = "TeamViewer"
+    platform = platform
 
-# Collect valid download links
-target_links = []
-for link in links:
-    text = link.get_text(strip=True)
-    href = urljoin(url, link["href"])
-    if any(href.endswith(ext) for ext in valid_ext):
-        target_links.append((text, href))
+    def scrape(self, ctx):
+        # Send GET request
+        response = get_client().get(url)
+        response.raise_for_status()
 
-# Extract version from filename
-def extract_version_from_url(href):
-    filename = urlparse(href).path.split("/")[-1]
-    for part in filename.replace("-", "_").split("_"):
-        if any(char.isdigit() for char in part):
-            return part
-    return "latest"
+        # Parse the HTML
+        soup = parse_html(response, only="a")
+        links = soup.find_all("a", href=True)
 
-# Build JSON result
-result = []
-for text, href in target_links:
-    filename = urlparse(href).path.split("/")[-1]
-    version = extract_version_from_url(href)
-    result.append({
-        "product": "TeamViewer",
-        "version": version,
-        "text": filename,
-        "url": href,
-        "platform": platform
-    })
+        # Collect valid download links
+        target_links = []
+        for link in links:
+            text = link.get_text(strip=True)
+            href = urljoin(url, link["href"])
+            if any(href.endswith(ext) for ext in valid_ext):
+                target_links.append((text, href))
+
+        # Build the records
+        result = []
+        for text, href in target_links:
+            filename = urlparse(href).path.split("/")[-1]
+            version = extract_version_from_url(href)
+            result.append({
+                "version": version,
+                "text": filename,
+                "url": href
+            })
+
+        # Read the version from the installers' version resource / MSI Property table
+        fill_versions(result)
 
-# Save output
-output_file = f"/home/yash-gaudani/R%D/Vlc/teamviwer/teamviewer_downloads_{platform.lower()}.json"
-with open(output_file, "w", encoding="utf-8") as f:
-    json.dump(result, f, indent=4, ensure_ascii=False)
+        yield from result
 
-print(f"✅ TeamViewer {platform} download links saved to '{output_file}'")
+if __name__ == "__main__":
+    TeamViewerScraper.main()
@@ -1,72 +1,70 @@
-import requests
-from bs4 import BeautifulSoup
-import json
+import logging
 import urllib.parse
-import os
+import re
 from pathlib import Path
+import sys
 
-def scrape_thunderbird():
-    """Scrape Thunderbird download information."""
-    print("🔍 Fetching Thunderbird download information...")
-    
-    BASE_HOST = "https://download-installer.cdn.mozilla.net"
-    BASE_PATH = "/pub/thunderbird/releases/"
-    VERSION = "139.0.2"
-    LANGUAGE = "uk"
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.crawler import MirrorCrawler
+from common.probe import get_pointers
+from common.url_probe import UrlTemplate, aprobe_successors, known_version, short_dotted
 
-    PLATFORMS = {
-        "win64": "Windows 64-bit",
-        "win32": "Windows 32-bit",
-        "mac": "macOS",
-        "linux-x86_64": "Linux 64-bit"
-    }
+logger = logging.getLogger(__name__)
 
-    results = []
+LATEST_URL = "https://download.mozilla.org/?product=thunderbird-latest&os=win64&lang=en-US"
+FALLBACK_VERSION = "139.0.2"  # only used if the version can't be resolved and none is cached
+RELEASE_DIR = UrlTemplate("https://download-installer.cdn.mozilla.net/pub/thunderbird/releases/{version}/",
+                          format=short_dotted)
+BASE_HOST = "https://download-installer.cdn.mozilla.net"
+BASE_PATH = "/pub/thunderbird/releases/"
+LANGUAGE = "uk"
+PLATFORMS = {
+    "win64": "Windows 64-bit",
+    "win32": "Windows 32-bit",
+    "mac": "macOS",
+    "linux-x86_64": "Linux 64-bit"
+}
 
-    for folder, platform_name in PLATFORMS.items():
-        relative_path = f"{BASE_PATH}{VERSION}/{folder}/{LANGUAGE}/"
-        full_url_path = urllib.parse.urljoin(BASE_HOST, relative_path)
+async def probe(ctx):
+    """Current Thunderbird version, read from where the "latest" download redirect lands.
 
-        try:
-            response = requests.get(full_url_path, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            for link in soup.find_all("a"):
-                href = link.get("href")
-                if href and not href.startswith("?") and not href.endswith("/"):
-                    # ✅ Get only the file name (not the path)
-                    file_name = os.path.basename(href.strip())
-                    download_url = urllib.parse.urljoin(full_url_path, file_name)
-
-                    results.append({
-                        "product": "Thunderbird",
-                        "version": VERSION,
-                        "file_name": file_name,
-                        "text": file_name,
-                        "url": download_url,
-                        "platform": platform_name
-                    })
-
-        except Exception as e:
-            print(f"❌ Error accessing {full_url_path}: {e}")
+    If the redirect doesn't name a version, the release directories after
+    the known version are probed instead.
+    """
+    try:
+        response = await ctx.head(LATEST_URL)
+        match = re.search(r"/releases/(\d+(?:\.\d+)*(?:esr)?)/", response.url)
+        if not match:
+            raise LookupError(f"No version in {response.url}")
+        return match.group(1)
+    except Exception:
+        return (await aprobe_successors(ctx, RELEASE_DIR, known_version("thunderbird"))).version
 
-    # Save to the expected location for the orchestrator
-    output_path = Path(__file__).parent.parent / "thunderbird_info.json"
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+class ThunderbirdScraper(BaseScraper):
+    """Thunderbird builds of the current release, one language, every platform folder."""
+    product = "Thunderbird"
 
-    print(f"✅ {len(results)} Thunderbird files saved to: {output_path}")
-    return results
+    async def scrape(self, ctx):
+        logger.info("Fetching Thunderbird download information...")
+        version = await get_pointers().aresolve("thunderbird", lambda: probe(ctx), FALLBACK_VERSION)
 
-def main():
-    """Main function for standalone execution."""
-    try:
-        scrape_thunderbird()
-    except Exception as e:
-        print(f"❌ Error: {e}")
+        # One crawl over all platform folders, yielding files as each listing arrives
+        roots = {
+            urllib.parse.urljoin(BASE_HOST, f"{BASE_PATH}{version}/{folder}/{LANGUAGE}/"): platform_name
+            for folder, platform_name in PLATFORMS.items()
+        }
+        crawler = MirrorCrawler(ctx, max_depth=0, timeout=10)
+        async for item in crawler.walk(*roots):
+            yield {
+                "version": version,
+                "text": item.name,
+                "url": item.url,
+                "platform": roots[item.root],
+                "file_name": item.name
+            }
+        for full_url_path, e in crawler.errors.items():
+            logger.error(f"Error accessing {full_url_path}: {e}")
 
 if __name__ == "__main__":
-    main()
+    ThunderbirdScraper.main()
@@ -1,47 +1,52 @@
-import requests
-from bs4 import BeautifulSoup
+import logging
 import re
-import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.streaming import find_element
+
+logger = logging.getLogger(__name__)
 
 # Target URL
 url = 'https://www.ultraviewer.net/changelogs.html'
 
-# Fetch page content
-response = requests.get(url)
-response.raise_for_status()
-
-# Parse HTML
-soup = BeautifulSoup(response.text, 'html.parser')
-
-# Initialize result
-data = None
-
-# Find all <a> tags
-for link in soup.find_all('a', href=True):
-    text = link.get_text(strip=True)
-    href = link['href'].strip()
-    
-    # Match the specific "Download here" link with version in URL
-    if text == "Download here" and "UltraViewer_setup" in href:
-        full_url = href if href.startswith("http") else f"https://www.ultraviewer.net/{href}"
-        version_match = re.search(r'UltraViewer_setup_([\d.]+)_en\.exe', full_url)
-        if version_match:
-            version = version_match.group(1)
-            filename = f"UltraViewer_setup_{version}_en.exe"
-            data = {
-                "product": "UltraViewer",
-                "version": version,
-                "text": filename,
-                "url": full_url,
-                "platform": "Windows"
-            }
-            break  # Stop after finding the first match
-
-# Save to JSON file if found
-if data:
-    with open('ultraviewer_download.json', 'w') as f:
-        json.dump(data, f, indent=4)
-    print("✅ Data saved to ultraviewer_download.json")
-    print(json.dumps(data, indent=4))
-else:
-    print("❌ No matching download link found.")
+
+def download_link(tag):
+    """Release data for the specific "Download here" link with version in URL."""
+    if tag.tag != 'a' or tag.text.strip() != "Download here":
+        return None
+    href = tag.get('href', '').strip()
+    if "UltraViewer_setup" not in href:
+        return None
+    full_url = href if href.startswith("http") else f"https://www.ultraviewer.net/{href}"
+    version_match = re.search(r'UltraViewer_setup_([\d.]+)_en\.exe', full_url)
+    if version_match:
+        version = version_match.group(1)
+        filename = f"UltraViewer_setup_{version}_en.exe"
+        return {
+            "product": "UltraViewer",
+            "version": version,
+            "text": filename,
+            "url": full_url,
+            "platform": "Windows"
+        }
+
+
+class UltraViewerScraper(BaseScraper):
+    """The newest UltraViewer installer, from the changelog."""
+    product = "UltraViewer"
+    platform = "Windows"
+
+    def scrape(self, ctx):
+        # The newest release is listed first: stop reading the changelog at its link
+        data = find_element(url, download_link).found
+        if data:
+            yield data
+        else:
+            logger.error("No matching download link found.")
+
+
+if __name__ == "__main__":
+    UltraViewerScraper.main()
@@ -1,30 +1,30 @@
-import requests
-from bs4 import BeautifulSoup
-import json
+import logging
 import re
-import urllib3
-import os
+import sys
+from pathlib import Path
 
-# Disable HTTPS warnings since verify=False is used
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.autoindex import listing
+from common.base import BaseScraper
+from common.checksums import aharvest
+from common.crawler import MirrorCrawler
+from common.probe import get_pointers
 
-def fetch_files(url):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) "
-                      "Chrome/122.0.0.0 Safari/537.36"
-    }
-    response = requests.get(url, headers=headers, timeout=10, verify=False)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.text, 'html.parser')
-    links = soup.find_all('a')
+logger = logging.getLogger(__name__)
+
+BASE_URL = 'https://download.videolan.org/'
+VLC_URL = BASE_URL + 'vlc/'
 
-    files = []
-    for link in links:
-        href = link.get('href')
-        if href and href != '../':
-            files.append(href.strip('/'))
-    return files
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/122.0.0.0 Safari/537.36"
+}
+
+async def fetch_files(ctx, url):
+    response = await ctx.fetch(url, headers=HEADERS, timeout=10, verify=False)
+    response.raise_for_status()
+    return [entry.name for entry in listing(response, url)]
 
 def get_latest_version(versions):
     version_pattern = re.compile(r'^\d+\.\d+(\.\d+)?$')
@@ -34,6 +34,13 @@ def get_latest_version(versions):
     version_list.sort(key=lambda s: tuple(map(int, s.split('.'))))
     return version_list[-1]
 
+async def probe(ctx):
+    """Newest VLC version, from a single listing of vlc/."""
+    latest_version = get_latest_version(await fetch_files(ctx, VLC_URL))
+    if latest_version is None:
+        raise LookupError(f"No version folders in {VLC_URL}")
+    return latest_version
+
 def detect_os(folder_name):
     folder_name = folder_name.lower()
     if 'win32' in folder_name:
@@ -50,144 +57,41 @@ def detect_os(folder_name):
     else:
         return 'Other'
 
-def scrape_vlc():
-    # Base URL
-    base_url = 'https://download.videolan.org/'
-    all_links = []
-    
-    try:
-        print("\n=== Scraping VLC ===")
-        top_level = fetch_files(base_url)
-        
-        if 'vlc' in top_level:
-            print("[✔] 'vlc/' folder found.")
-            vlc_url = base_url + 'vlc/'
-            name = 'vlc'
-            versions = fetch_files(vlc_url)
-            latest_version = get_latest_version(versions)
-
-            if latest_version:
-                latest_url = f"{vlc_url}{latest_version}/"
-                print(f"[✔] Latest version found: {latest_version}")
-                print(f"➡️ Latest VLC URL: {latest_url}")
-
-                vlc_data = {
-                    "name": name,
-                    "latest_version": latest_version,
-                    "files": []
-                }
-
-                subentries = fetch_files(latest_url)
-                file_count = 0
-                
-                print("\nAll files found:")
-                print("-" * 50)
-                
-                for entry in subentries:
-                    if '.' not in entry:
-                        folder_url = f"{latest_url}{entry}/"
-                        os_name = detect_os(entry)
-                        try:
-                            subfiles = fetch_files(folder_url)
-                            for file in subfiles:
-                                file_url = f"{folder_url}{file}"
-                                print(f"File: {file}")
-                                print(f"URL: {file_url}")
-                                print(f"OS: {os_name}")
-                                print(f"Version: {latest_version}")
-                                print("-" * 50)
-                                
-                                # Store all links
-                                all_links.append({
-                                    "product": "vlc",
-                                    "version": latest_version,
-                                    "text": file,
-                                    "url": file_url,
-                                    "platform": os_name
-                                })
-                                
-                                vlc_data["files"].append({
-                                    "file_name": file,
-                                    "download_url": file_url,
-                                    "os": os_name,
-                                    "version": latest_version
-                                })
-                                file_count += 1
-                        except Exception as err:
-                            print(f"⚠️ Error reading folder {folder_url}: {err}")
-                    else:
-                        # It's a file directly under latest version folder
-                        file_url = f"{latest_url}{entry}"
-                        os_name = detect_os(entry)
-                        
-                        print(f"File: {entry}")
-                        print(f"URL: {file_url}")
-                        print(f"OS: {os_name}")
-                        print(f"Version: {latest_version}")
-                        print("-" * 50)
-                        
-                        # Store all links
-                        all_links.append({
-                            "product": "vlc",
-                            "version": latest_version,
-                            "text": entry,
-                            "url": file_url,
-                            "platform": os_name
-                        })
-                        
-                        vlc_data["files"].append({
-                            "file_name": entry,
-                            "download_url": file_url,
-                            "os": os_name,
-                            "version": latest_version
-                        })
-                        file_count += 1
+class VlcScraper(BaseScraper):
+    """Every file of the newest VLC release, with the digests published next to them."""
+    product = "vlc"
 
-                # Save all links to a separate JSON file
-                try:
-                    current_dir = os.path.dirname(os.path.abspath(__file__))
-                    all_links_file = os.path.join(current_dir, "vlc_all_links.json")
-                    
-                    with open(all_links_file, "w", encoding="utf-8") as f:
-                        json.dump(all_links, f, indent=2, ensure_ascii=False)
-                    
-                    print(f"\nSaved {len(all_links)} total links to vlc_all_links.json")
-                except Exception as e:
-                    print(f"Error saving all links: {str(e)}")
+    async def scrape(self, ctx):
+        # Cached version pointer instead of walking base → vlc/ on every run
+        latest_version = await get_pointers().aresolve("vlc_main", lambda: probe(ctx))
+        if not latest_version:
+            logger.warning("No valid versions found.")
+            return
+        latest_url = f"{VLC_URL}{latest_version}/"
+        logger.info(f"Latest VLC version {latest_version}: {latest_url}")
 
-                # Save download files to JSON
-                try:
-                    current_dir = os.path.dirname(os.path.abspath(__file__))
-                    output_file = os.path.join(current_dir, "vlc_info.json")
-                    
-                    with open(output_file, "w", encoding="utf-8") as f:
-                        json.dump(vlc_data, f, indent=2, ensure_ascii=False)
-                    
-                    print(f"\nSuccessfully saved {len(vlc_data['files'])} download files to vlc_info.json")
-                    
-                    # Print the download files
-                    print("\n=== VLC Download Information ===")
-                    print(json.dumps(vlc_data, indent=2, ensure_ascii=False))
-                    
-                except Exception as e:
-                    print(f"Error saving JSON file: {str(e)}")
+        # Platform folders are listed concurrently as soon as the version folder arrives
+        crawler = MirrorCrawler(ctx, max_depth=1, headers=HEADERS, timeout=10, verify=False)
+        found = await crawler.collect(latest_url)
+        for folder_url, err in crawler.errors.items():
+            logger.warning(f"Error reading folder {folder_url}: {err}")
 
-                if file_count > 0:
-                    print("Successfully fetched data")
-                else:
-                    print("No files found to fetch.")
-            else:
-                print("No valid versions found.")
-        else:
-            print("'vlc/' folder not found.")
-    except requests.exceptions.RequestException as e:
-        print(f"Request failed: {e}")
+        all_links = []
+        for item in found:
+            # Files in a platform folder take its OS; files directly under the version folder go by name
+            all_links.append({
+                "product": "vlc",
+                "version": latest_version,
+                "text": item.name,
+                "url": item.url,
+                "platform": detect_os(item.path[0] if item.path else item.name)
+            })
+        if not all_links:
+            logger.warning("No files found to fetch.")
 
-def main():
-    try:
-        scrape_vlc()
-    except Exception as e:
-        print(f"An error occurred: {str(e)}")
+        # .md5/.sha1/.sha256/.asc files become digests on the installer they describe
+        for link in await aharvest(ctx, all_links, headers=HEADERS, timeout=10, verify=False):
+            yield link
 
 if __name__ == "__main__":
-    main()
+    VlcScraper.main()
@@ -1,15 +1,17 @@
-import requests
 import xml.etree.ElementTree as ET
-import os
-import json
+import logging
 import re
 from datetime import datetime
+import sys
+from pathlib import Path
 
-url = "https://sourceforge.net/p/winscp/activity/feed.rss"
-response = requests.get(url)
-response.raise_for_status()
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # make common/ importable for standalone runs
+from common.base import BaseScraper
+from common.http import get_client
+
+logger = logging.getLogger(__name__)
 
-root = ET.fromstring(response.text)
+url = "https://sourceforge.net/p/winscp/activity/feed.rss"
 
 # Helper to parse date string and return date only (YYYY-MM-DD)
 def extract_date(date_str):
@@ -20,53 +22,52 @@ def extract_date(date_str):
     except Exception as e:
         return None
 
-# Step 1: Get lastBuildDate and extract date only
-last_build_date_tag = root.find("./channel/lastBuildDate")
-if last_build_date_tag is None:
-    print("❌ lastBuildDate tag not found")
-    exit()
-
-last_build_date = extract_date(last_build_date_tag.text)
-if last_build_date is None:
-    print("❌ Could not parse lastBuildDate")
-    exit()
+class WinSCPScraper(BaseScraper):
+    """WinSCP files published on the day of the project feed's last build."""
+    product = "WinSCP"
+    platform = "Windows"
 
-# Step 2: Filter <item> by pubDate date only matching lastBuildDate date
-items = root.findall(".//item")
-filtered = []
+    def scrape(self, ctx):
+        response = get_client().get(url)
+        response.raise_for_status()
 
-for item in items:
-    pub_date_str = item.findtext("pubDate", "").strip()
-    pub_date = extract_date(pub_date_str)
+        root = ET.fromstring(response.text)
 
-    # Only continue if pub_date date matches last_build_date
-    if pub_date != last_build_date:
-        continue
+        # Step 1: Get lastBuildDate and extract date only
+        last_build_date_tag = root.find("./channel/lastBuildDate")
+        if last_build_date_tag is None:
+            logger.error("lastBuildDate tag not found")
+            return
 
-    title = item.findtext("title", "").strip()
-    link = item.findtext("link", "").strip()
-    filename = title.split("/")[-1].strip()
+        last_build_date = extract_date(last_build_date_tag.text)
+        if last_build_date is None:
+            logger.error("Could not parse lastBuildDate")
+            return
 
-    # Extract version number (e.g. 6.5.1)
-    match = re.search(r"(\d+\.\d+(?:\.\d+)?)", title)
-    version = match.group(1) if match else "N/A"
+        # Step 2: Keep the <item>s whose pubDate falls on the lastBuildDate
+        for item in root.findall(".//item"):
+            pub_date_str = item.findtext("pubDate", "").strip()
+            pub_date = extract_date(pub_date_str)
 
-    filtered.append({
-        "product": "WinSCP",
-        "version": version,
-        "text": filename,
-        "url": link,
-        "platform": "Windows"
-    })
+            # Only continue if pub_date date matches last_build_date
+            if pub_date != last_build_date:
+                continue
 
-# Step 3: Print and save
-for entry in filtered:
-    print(entry)
+            title = item.findtext("title", "").strip()
+            link = item.findtext("link", "").strip()
+            filename = title.split("/")[-1].strip()
 
-file_path = "/home/yash-gaudani/R%D/Vlc/winscp/winscp_patch_data.json"
-os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            # Extract version number (e.g. 6.5.1)
+            match = re.search(r"(\d+\.\d+(?:\.\d+)?)", title)
+            version = match.group(1) if match else "N/A"
 
-with open(file_path, "w", encoding="utf-8") as f:
-    json.dump(filtered, f, indent=4)
+            yield {
+                "product": "WinSCP",
+                "version": version,
+                "text": filename,
+                "url": link,
+                "platform": "Windows"
+            }
 
-print(f"✅ JSON saved to: {file_path}")
+if __name__ == "__main__":
+    WinSCPScraper.main()